@@ -0,0 +1,48 @@
+"""drop payroll totals from payroll_run_reconciliation
+
+Revision ID: 06a0c0f85c51
+Revises: 89608181709a
+Create Date: 2026-10-18 09:12:44.208315
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '06a0c0f85c51'
+down_revision: Union[str, Sequence[str], None] = '89608181709a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Reconciliation sums payroll_items live; only the ledger side is kept.
+    op.drop_column("payroll_run_reconciliation", "payroll_item_count")
+    op.drop_column("payroll_run_reconciliation", "payroll_total_cents")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.add_column("payroll_run_reconciliation", sa.Column("payroll_total_cents", sa.BigInteger(), nullable=True))
+    op.add_column("payroll_run_reconciliation", sa.Column("payroll_item_count", sa.Integer(), nullable=True))
+    op.execute(
+        """
+        UPDATE payroll_run_reconciliation r
+        SET payroll_total_cents = COALESCE(p.total, 0),
+            payroll_item_count = COALESCE(p.n, 0)
+        FROM payroll_run_reconciliation r2
+        LEFT JOIN (
+            SELECT company_id, payroll_run_id, SUM(gross_pay_cents) AS total, COUNT(*) AS n
+            FROM payroll_items
+            GROUP BY company_id, payroll_run_id
+        ) p
+          ON p.payroll_run_id = r2.payroll_run_id AND p.company_id = r2.company_id
+        WHERE r2.payroll_run_id = r.payroll_run_id
+        """
+    )
+    op.alter_column("payroll_run_reconciliation", "payroll_total_cents", nullable=False)
+    op.alter_column("payroll_run_reconciliation", "payroll_item_count", nullable=False)
@@ -0,0 +1,109 @@
+"""add job_cost_daily_rollup
+
+Revision ID: 072aa034ff1f
+Revises: c275f345bbc7
+Create Date: 2026-10-17 22:52:28.042137
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '072aa034ff1f'
+down_revision: Union[str, Sequence[str], None] = 'c275f345bbc7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Daily totals per (company, day, job, scope, employee, category, source).
+    # job_cost_ledger is append-only, so an AFTER INSERT trigger is enough to
+    # keep this exact.
+    op.create_table(
+        "job_cost_daily_rollup",
+        sa.Column("id", sa.Integer(), primary_key=True, nullable=False),
+        sa.Column("company_id", sa.Integer(), nullable=False),
+        sa.Column("posting_day", sa.Date(), nullable=False),
+        sa.Column("job_id", sa.Integer(), nullable=False),
+        sa.Column("scope_id", sa.Integer(), nullable=True),
+        sa.Column("employee_id", sa.Integer(), nullable=True),
+        sa.Column("cost_category", sa.String(), nullable=False),
+        sa.Column("source_type", sa.String(), nullable=False),
+        sa.Column("row_count", sa.BigInteger(), nullable=False),
+        sa.Column("total_cost_cents", sa.BigInteger(), nullable=False),
+    )
+
+    # Expression index (rather than NULLS NOT DISTINCT) so NULL scope/employee
+    # still collapse into one row on Postgres < 15.
+    op.execute(
+        """
+        CREATE UNIQUE INDEX uq_job_cost_daily_rollup_key
+        ON job_cost_daily_rollup (
+            company_id, posting_day, job_id,
+            (COALESCE(scope_id, -1)), (COALESCE(employee_id, -1)),
+            cost_category, source_type
+        );
+        """
+    )
+
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION job_cost_ledger_rollup_insert()
+        RETURNS trigger AS $$
+        BEGIN
+            INSERT INTO job_cost_daily_rollup (
+                company_id, posting_day, job_id, scope_id, employee_id,
+                cost_category, source_type, row_count, total_cost_cents
+            )
+            SELECT company_id, posting_date::date, job_id, scope_id, employee_id,
+                   cost_category, source_type, COUNT(*), SUM(total_cost_cents)
+            FROM new_rows
+            GROUP BY company_id, posting_date::date, job_id, scope_id, employee_id,
+                     cost_category, source_type
+            -- Stable lock order across concurrent postings.
+            ORDER BY 1, 2, 3, 4, 5, 6, 7
+            ON CONFLICT (
+                company_id, posting_day, job_id,
+                (COALESCE(scope_id, -1)), (COALESCE(employee_id, -1)),
+                cost_category, source_type
+            )
+            DO UPDATE SET
+                row_count = job_cost_daily_rollup.row_count + EXCLUDED.row_count,
+                total_cost_cents = job_cost_daily_rollup.total_cost_cents + EXCLUDED.total_cost_cents;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+
+        DROP TRIGGER IF EXISTS trg_job_cost_ledger_rollup ON job_cost_ledger;
+        CREATE TRIGGER trg_job_cost_ledger_rollup
+        AFTER INSERT ON job_cost_ledger
+        REFERENCING NEW TABLE AS new_rows
+        FOR EACH STATEMENT
+        EXECUTE FUNCTION job_cost_ledger_rollup_insert();
+
+        INSERT INTO job_cost_daily_rollup (
+            company_id, posting_day, job_id, scope_id, employee_id,
+            cost_category, source_type, row_count, total_cost_cents
+        )
+        SELECT company_id, posting_date::date, job_id, scope_id, employee_id,
+               cost_category, source_type, COUNT(*), SUM(total_cost_cents)
+        FROM job_cost_ledger
+        GROUP BY company_id, posting_date::date, job_id, scope_id, employee_id,
+                 cost_category, source_type;
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute(
+        """
+        DROP TRIGGER IF EXISTS trg_job_cost_ledger_rollup ON job_cost_ledger;
+        DROP FUNCTION IF EXISTS job_cost_ledger_rollup_insert();
+        """
+    )
+    op.drop_table("job_cost_daily_rollup")
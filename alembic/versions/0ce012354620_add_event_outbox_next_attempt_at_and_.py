@@ -0,0 +1,87 @@
+"""add event_outbox next_attempt_at and due index
+
+Revision ID: 0ce012354620
+Revises: faa45650cc4f
+Create Date: 2026-10-17 22:38:01.245790
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0ce012354620'
+down_revision: Union[str, Sequence[str], None] = 'faa45650cc4f'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Same contract as outbox_processor._retry_wait:
+#   retry_count <= 0 -> 0s, else min(60, 2^retry_count) seconds after created_at.
+_NEXT_ATTEMPT_AT_EXPR = """
+    {row}created_at + (
+        CASE
+            WHEN {row}retry_count <= 0 THEN 0
+            WHEN {row}retry_count >= 6 THEN 60
+            ELSE power(2, {row}retry_count)
+        END
+    ) * interval '1 second'
+"""
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "event_outbox",
+        sa.Column(
+            "next_attempt_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+    )
+
+    op.execute(
+        f"UPDATE event_outbox SET next_attempt_at = {_NEXT_ATTEMPT_AT_EXPR.format(row='')}"
+    )
+
+    op.execute(
+        f"""
+        CREATE OR REPLACE FUNCTION event_outbox_set_next_attempt_at()
+        RETURNS trigger AS $$
+        BEGIN
+            NEW.next_attempt_at := {_NEXT_ATTEMPT_AT_EXPR.format(row='NEW.')};
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql;
+
+        DROP TRIGGER IF EXISTS trg_event_outbox_next_attempt_at ON event_outbox;
+        CREATE TRIGGER trg_event_outbox_next_attempt_at
+        BEFORE INSERT OR UPDATE OF created_at, retry_count ON event_outbox
+        FOR EACH ROW
+        EXECUTE FUNCTION event_outbox_set_next_attempt_at();
+        """
+    )
+
+    # Claim query: WHERE processed = false AND next_attempt_at <= now
+    # ORDER BY next_attempt_at, id LIMIT n -- walks only the due prefix.
+    op.create_index(
+        "ix_event_outbox_due",
+        "event_outbox",
+        ["next_attempt_at", "id"],
+        postgresql_where=sa.text("processed = false"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_event_outbox_due", table_name="event_outbox")
+    op.execute(
+        """
+        DROP TRIGGER IF EXISTS trg_event_outbox_next_attempt_at ON event_outbox;
+        DROP FUNCTION IF EXISTS event_outbox_set_next_attempt_at();
+        """
+    )
+    op.drop_column("event_outbox", "next_attempt_at")
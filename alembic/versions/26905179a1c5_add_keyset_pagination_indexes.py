@@ -0,0 +1,52 @@
+"""add keyset pagination indexes
+
+Revision ID: 26905179a1c5
+Revises: 072aa034ff1f
+Create Date: 2026-10-17 22:54:17.616269
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '26905179a1c5'
+down_revision: Union[str, Sequence[str], None] = '072aa034ff1f'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # One index per list endpoint, matching its ORDER BY so keyset pages are
+    # an index range scan.
+    op.create_index(
+        "ix_time_entries_company_started_id",
+        "time_entries",
+        ["company_id", sa.text("started_at DESC"), sa.text("time_entry_id DESC")],
+    )
+    op.create_index(
+        "ix_jcl_company_job_posting_id",
+        "job_cost_ledger",
+        ["company_id", "job_id", "posting_date", "id"],
+    )
+    op.create_index(
+        "ix_payroll_run_company_posted_id",
+        "payroll_run",
+        ["company_id", sa.text("posted_at DESC NULLS LAST"), "payroll_run_id"],
+    )
+    op.create_index(
+        "ix_event_outbox_company_id_id",
+        "event_outbox",
+        ["company_id", "id"],
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_event_outbox_company_id_id", table_name="event_outbox")
+    op.drop_index("ix_payroll_run_company_posted_id", table_name="payroll_run")
+    op.drop_index("ix_jcl_company_job_posting_id", table_name="job_cost_ledger")
+    op.drop_index("ix_time_entries_company_started_id", table_name="time_entries")
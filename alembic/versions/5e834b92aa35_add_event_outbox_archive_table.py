@@ -0,0 +1,90 @@
+"""add event_outbox_archive table
+
+Revision ID: 5e834b92aa35
+Revises: 0ce012354620
+Create Date: 2026-10-17 22:39:49.468882
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5e834b92aa35'
+down_revision: Union[str, Sequence[str], None] = '0ce012354620'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Compact cold storage for processed events: no processed flag, no
+    # scheduling columns, and only the indexes needed for lookups.
+    op.create_table(
+        "event_outbox_archive",
+        sa.Column("id", sa.Integer(), primary_key=True, autoincrement=False, nullable=False),
+        sa.Column("company_id", sa.Integer(), nullable=False),
+        sa.Column("event_type", sa.String(), nullable=False),
+        sa.Column("idempotency_key", sa.String(), nullable=False),
+        sa.Column("payload", postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+        sa.Column("retry_count", sa.Integer(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("processed_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("archived_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.UniqueConstraint(
+            "company_id",
+            "event_type",
+            "idempotency_key",
+            name="uq_event_outbox_archive_idempotency",
+        ),
+    )
+    op.create_index(
+        "ix_event_outbox_archive_company_created",
+        "event_outbox_archive",
+        ["company_id", "created_at"],
+    )
+
+    # Idempotency keys stay unique across hot + archived rows.
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION event_outbox_block_archived_key()
+        RETURNS trigger AS $$
+        BEGIN
+            IF EXISTS (
+                SELECT 1
+                FROM event_outbox_archive a
+                WHERE a.company_id = NEW.company_id
+                  AND a.event_type = NEW.event_type
+                  AND a.idempotency_key = NEW.idempotency_key
+            ) THEN
+                RAISE EXCEPTION 'duplicate key value violates unique constraint "uq_event_outbox_idempotency"'
+                    USING ERRCODE = 'unique_violation',
+                          CONSTRAINT = 'uq_event_outbox_idempotency',
+                          DETAIL = 'idempotency_key already archived';
+            END IF;
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql;
+
+        DROP TRIGGER IF EXISTS trg_event_outbox_block_archived_key ON event_outbox;
+        CREATE TRIGGER trg_event_outbox_block_archived_key
+        BEFORE INSERT ON event_outbox
+        FOR EACH ROW
+        EXECUTE FUNCTION event_outbox_block_archived_key();
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute(
+        """
+        DROP TRIGGER IF EXISTS trg_event_outbox_block_archived_key ON event_outbox;
+        DROP FUNCTION IF EXISTS event_outbox_block_archived_key();
+        """
+    )
+    op.drop_index("ix_event_outbox_archive_company_created", table_name="event_outbox_archive")
+    op.drop_table("event_outbox_archive")
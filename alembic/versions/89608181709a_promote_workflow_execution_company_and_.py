@@ -0,0 +1,77 @@
+"""promote workflow execution company and employee columns
+
+Revision ID: 89608181709a
+Revises: 26905179a1c5
+Create Date: 2026-10-17 23:02:01.614133
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '89608181709a'
+down_revision: Union[str, Sequence[str], None] = '26905179a1c5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column("workflow_executions", sa.Column("company_id", sa.Integer(), nullable=True))
+    op.add_column("workflow_executions", sa.Column("employee_id", sa.Integer(), nullable=True))
+
+    # Backfill from the JSON context; values that are not plain integers stay
+    # NULL (such rows were never matched by the old context scan either).
+    op.execute(
+        """
+        UPDATE workflow_executions
+        SET company_id = CASE WHEN context->>'company_id' ~ '^-?[0-9]+$'
+                              THEN (context->>'company_id')::integer END,
+            employee_id = CASE WHEN context->>'employee_id' ~ '^-?[0-9]+$'
+                               THEN (context->>'employee_id')::integer END
+        """
+    )
+
+    # The old check could miss matches beyond its scan window, so duplicates
+    # may exist. Keep one row per employee and cancel the rest, as
+    # /preview/reset does. Which row survives is arbitrary: execution_id is a
+    # uuid4 and the table has no timestamp, so highest execution_id is only a
+    # deterministic tie-break, not the most recent execution.
+    op.execute(
+        """
+        UPDATE workflow_executions w
+        SET status = 'cancelled',
+            current_step_id = NULL
+        FROM (
+            SELECT execution_id,
+                   row_number() OVER (
+                       PARTITION BY company_id, employee_id
+                       ORDER BY execution_id DESC
+                   ) AS rn
+            FROM workflow_executions
+            WHERE status = 'in_progress'
+              AND company_id IS NOT NULL
+              AND employee_id IS NOT NULL
+        ) d
+        WHERE w.execution_id = d.execution_id
+          AND d.rn > 1
+        """
+    )
+
+    op.create_index(
+        "uq_workflow_executions_active",
+        "workflow_executions",
+        ["company_id", "employee_id"],
+        unique=True,
+        postgresql_where=sa.text("status = 'in_progress'"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("uq_workflow_executions_active", table_name="workflow_executions")
+    op.drop_column("workflow_executions", "employee_id")
+    op.drop_column("workflow_executions", "company_id")
@@ -0,0 +1,53 @@
+"""add event_outbox_dead_letter table
+
+Revision ID: 99072b5e8ebc
+Revises: 5e834b92aa35
+Create Date: 2026-10-17 22:45:32.230965
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '99072b5e8ebc'
+down_revision: Union[str, Sequence[str], None] = '5e834b92aa35'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # One row per outbox event that exhausted max_retries. The event itself
+    # stays in event_outbox (processed = true, so it leaves the claim index);
+    # replay resets it and deletes this row.
+    op.create_table(
+        "event_outbox_dead_letter",
+        sa.Column("id", sa.Integer(), primary_key=True, nullable=False),
+        sa.Column(
+            "event_outbox_id",
+            sa.Integer(),
+            sa.ForeignKey("event_outbox.id", name="fk_event_outbox_dead_letter_event_outbox_id"),
+            nullable=False,
+        ),
+        sa.Column("company_id", sa.Integer(), nullable=False),
+        sa.Column("event_type", sa.String(), nullable=False),
+        sa.Column("retry_count", sa.Integer(), nullable=False),
+        sa.Column("last_error", sa.Text(), nullable=False),
+        sa.Column("traceback", sa.Text(), nullable=True),
+        sa.Column("dead_lettered_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.UniqueConstraint("event_outbox_id", name="uq_event_outbox_dead_letter_event_outbox_id"),
+    )
+    op.create_index(
+        "ix_event_outbox_dead_letter_company_event",
+        "event_outbox_dead_letter",
+        ["company_id", "event_type", "event_outbox_id"],
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_event_outbox_dead_letter_company_event", table_name="event_outbox_dead_letter")
+    op.drop_table("event_outbox_dead_letter")
@@ -0,0 +1,100 @@
+"""add payroll_run_id to job_cost_ledger and payroll_run_reconciliation
+
+Revision ID: c275f345bbc7
+Revises: 99072b5e8ebc
+Create Date: 2026-10-17 22:50:59.726516
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c275f345bbc7'
+down_revision: Union[str, Sequence[str], None] = '99072b5e8ebc'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column("job_cost_ledger", sa.Column("payroll_run_id", sa.String(), nullable=True))
+
+    # One-off structural backfill of existing payroll postings
+    # (source_reference_id = '<payroll_run_id>:<payroll_item_id>'). The ledger
+    # is append-only, so the immutability trigger is suspended only for this
+    # statement, inside the migration transaction.
+    op.execute(
+        """
+        ALTER TABLE job_cost_ledger DISABLE TRIGGER trg_job_cost_ledger_block_update;
+
+        UPDATE job_cost_ledger
+        SET payroll_run_id = left(source_reference_id, length(source_reference_id) - strpos(reverse(source_reference_id), ':'))
+        WHERE source_type = 'payroll_run_labor'
+          AND strpos(source_reference_id, ':') > 0;
+
+        ALTER TABLE job_cost_ledger ENABLE TRIGGER trg_job_cost_ledger_block_update;
+        """
+    )
+
+    op.create_index(
+        "ix_job_cost_ledger_company_payroll_run",
+        "job_cost_ledger",
+        ["company_id", "payroll_run_id"],
+        postgresql_where=sa.text("payroll_run_id IS NOT NULL"),
+    )
+
+    # Per-run totals maintained by costing_service.post_labor_costs so
+    # reconciliation is a primary-key lookup instead of two SUMs.
+    op.create_table(
+        "payroll_run_reconciliation",
+        sa.Column(
+            "payroll_run_id",
+            sa.String(),
+            sa.ForeignKey("payroll_run.payroll_run_id", ondelete="RESTRICT"),
+            primary_key=True,
+            nullable=False,
+        ),
+        sa.Column("company_id", sa.Integer(), nullable=False),
+        sa.Column("payroll_total_cents", sa.BigInteger(), nullable=False),
+        sa.Column("payroll_item_count", sa.Integer(), nullable=False),
+        sa.Column("ledger_total_cents", sa.BigInteger(), nullable=False),
+        sa.Column("ledger_entry_count", sa.Integer(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+    )
+
+    op.execute(
+        """
+        INSERT INTO payroll_run_reconciliation (
+            payroll_run_id, company_id,
+            payroll_total_cents, payroll_item_count,
+            ledger_total_cents, ledger_entry_count
+        )
+        SELECT l.payroll_run_id, l.company_id,
+               COALESCE(p.total, 0), COALESCE(p.n, 0),
+               l.total, l.n
+        FROM (
+            SELECT company_id, payroll_run_id, SUM(total_cost_cents) AS total, COUNT(*) AS n
+            FROM job_cost_ledger
+            WHERE source_type = 'payroll_run_labor' AND payroll_run_id IS NOT NULL
+            GROUP BY company_id, payroll_run_id
+        ) l
+        JOIN payroll_run r
+          ON r.payroll_run_id = l.payroll_run_id AND r.company_id = l.company_id
+        LEFT JOIN (
+            SELECT company_id, payroll_run_id, SUM(gross_pay_cents) AS total, COUNT(*) AS n
+            FROM payroll_items
+            GROUP BY company_id, payroll_run_id
+        ) p
+          ON p.payroll_run_id = l.payroll_run_id AND p.company_id = l.company_id
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("payroll_run_reconciliation")
+    op.drop_index("ix_job_cost_ledger_company_payroll_run", table_name="job_cost_ledger")
+    op.drop_column("job_cost_ledger", "payroll_run_id")
@@ -0,0 +1,52 @@
+"""add event_outbox notify trigger
+
+Revision ID: faa45650cc4f
+Revises: ff118af48e9d
+Create Date: 2026-10-17 22:33:27.271270
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'faa45650cc4f'
+down_revision: Union[str, Sequence[str], None] = 'ff118af48e9d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Wake LISTENing outbox workers when an event row commits. NOTIFY is
+    # transactional: nothing is delivered if the inserting transaction rolls
+    # back, and identical payloads within one transaction are collapsed.
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION event_outbox_notify()
+        RETURNS trigger AS $$
+        BEGIN
+            PERFORM pg_notify('event_outbox', NEW.company_id::text);
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+
+        DROP TRIGGER IF EXISTS trg_event_outbox_notify ON event_outbox;
+        CREATE TRIGGER trg_event_outbox_notify
+        AFTER INSERT ON event_outbox
+        FOR EACH ROW
+        EXECUTE FUNCTION event_outbox_notify();
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute(
+        """
+        DROP TRIGGER IF EXISTS trg_event_outbox_notify ON event_outbox;
+        DROP FUNCTION IF EXISTS event_outbox_notify();
+        """
+    )
@@ -0,0 +1,64 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Any, Optional, Sequence, Union
+
+from fastapi import HTTPException
+
+# Opaque keyset cursors: urlsafe base64 of a JSON array holding the ordering
+# key of the last row on a page. Datetimes are tagged so they round-trip.
+
+_DT_TAG = "$dt"
+
+CursorType = Union[type, tuple[type, ...]]
+
+
+def _encode_value(v: Any) -> Any:
+    if isinstance(v, datetime):
+        return {_DT_TAG: v.isoformat()}
+    return v
+
+
+def _decode_value(v: Any) -> Any:
+    if isinstance(v, dict) and set(v) == {_DT_TAG}:
+        return datetime.fromisoformat(v[_DT_TAG])
+    return v
+
+
+def encode_cursor(key: Sequence[Any]) -> str:
+    raw = json.dumps([_encode_value(v) for v in key], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def _check_type(v: Any, expected: CursorType) -> Any:
+    # bool is an int subclass; a cursor never legitimately carries one.
+    if isinstance(v, bool) or not isinstance(v, expected):
+        raise TypeError("cursor value has the wrong type")
+    return v
+
+
+def decode_cursor(cursor: str, *, types: Sequence[CursorType]) -> list[Any]:
+    """
+    Decode a cursor into one key value per entry of `types`, each checked with
+    isinstance (pass a tuple such as (datetime, type(None)) for a nullable
+    key); 400 if it is malformed or was tampered with.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")).decode("utf-8"))
+        if not isinstance(values, list) or len(values) != len(types):
+            raise ValueError("cursor has the wrong shape")
+        return [_check_type(_decode_value(v), t) for v, t in zip(values, types)]
+    except (ValueError, TypeError, UnicodeError, binascii.Error) as exc:
+        raise HTTPException(status_code=400, detail="Invalid cursor") from exc
+
+
+def reject_cursor_with_offset(cursor: Optional[str], offset: int) -> None:
+    if cursor is not None and int(offset) != 0:
+        raise HTTPException(status_code=400, detail="cursor and offset are mutually exclusive")
+
+
+def page_rows(rows: list, limit: int) -> tuple[list, bool]:
+    """Split a limit + 1 fetch into (page, has_more)."""
+    return rows[: int(limit)], len(rows) > int(limit)
@@ -0,0 +1,12 @@
+from datetime import datetime, timezone
+
+# Timestamp columns are `timestamp without time zone` holding UTC. psycopg2
+# would bind aware values anyway, but asyncpg refuses them, so every caller
+# normalizes through here.
+
+
+def as_naive_utc(value: datetime) -> datetime:
+    """Aware datetimes are converted to UTC and stripped; naive ones are taken as UTC."""
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
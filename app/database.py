@@ -1,7 +1,12 @@
+import asyncio
 import os
+from typing import Optional
 
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import declarative_base, sessionmaker
+from sqlalchemy.pool import NullPool
 
 SessionLocal = sessionmaker(
     autocommit=False,
@@ -9,17 +14,53 @@ SessionLocal = sessionmaker(
     expire_on_commit=False,
 )
 
+# Async sessions (asyncpg) for the hot request paths. Bound per call by
+# async_session(), because asyncpg connections belong to one event loop.
+AsyncSessionLocal = async_sessionmaker(
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False,
+)
+
 Base = declarative_base()
 
 DATABASE_URL = ""
 engine = None
 _configured_database_url = None
 
+# One async engine per event loop: asyncpg connections cannot be shared
+# across loops. Only the serving loop (registered by init_async_engine() in
+# the app lifespan, and disposed there) gets a connection pool; any other loop
+# (asyncio.run in scripts, a TestClient request outside the lifespan) gets a
+# NullPool engine, which holds no idle connections once a session closes, so
+# dropping it when its loop is gone leaks nothing.
+_async_engines: dict[asyncio.AbstractEventLoop, AsyncEngine] = {}
+_serving_loop: Optional[asyncio.AbstractEventLoop] = None
 
 def _get_database_url() -> str:
     return os.getenv("DATABASE_URL", "postgresql://ArthurS@localhost/baseline_workforce")
 
 
+def _async_database_url(database_url: str) -> str:
+    url = make_url(database_url)
+    if url.drivername in ("postgresql", "postgresql+psycopg2"):
+        url = url.set(drivername="postgresql+asyncpg")
+        query = dict(url.query)
+        if "sslmode" in query:
+            # asyncpg spells libpq's sslmode as ssl.
+            query["ssl"] = query.pop("sslmode")
+            url = url.set(query=query)
+    return url.render_as_string(hide_password=False)
+
+
+def _discard_async_engine(loop: asyncio.AbstractEventLoop, async_engine: AsyncEngine) -> None:
+    if loop.is_closed():
+        # Nothing can run on a closed loop; just release the pool.
+        async_engine.sync_engine.dispose(close=False)
+    else:
+        asyncio.run_coroutine_threadsafe(async_engine.dispose(), loop)
+
+
 def configure_database() -> None:
     global DATABASE_URL, engine, _configured_database_url
 
@@ -32,7 +73,53 @@ def configure_database() -> None:
     SessionLocal.configure(bind=engine)
     DATABASE_URL = database_url
     _configured_database_url = database_url
+    while _async_engines:
+        _discard_async_engine(*_async_engines.popitem())
+
+
+def get_async_engine() -> AsyncEngine:
+    configure_database()
+    loop = asyncio.get_running_loop()
+    for stale in [lp for lp in _async_engines if lp.is_closed()]:
+        _discard_async_engine(stale, _async_engines.pop(stale))
 
+    async_engine = _async_engines.get(loop)
+    if async_engine is None:
+        if loop is _serving_loop:
+            async_engine = create_async_engine(_async_database_url(DATABASE_URL))
+        else:
+            async_engine = create_async_engine(_async_database_url(DATABASE_URL), poolclass=NullPool)
+        _async_engines[loop] = async_engine
+    return async_engine
+
+
+def async_session() -> AsyncSession:
+    """New AsyncSession on the current event loop's engine; use as `async with`."""
+    return AsyncSessionLocal(bind=get_async_engine())
+
+
+async def init_async_engine() -> None:
+    """Make the running loop the serving loop, whose async engine is pooled."""
+    global _serving_loop
+
+    _serving_loop = asyncio.get_running_loop()
+    async_engine = _async_engines.pop(_serving_loop, None)
+    if async_engine is not None:
+        await async_engine.dispose()
+
+
+async def dispose_async_engine() -> None:
+    global _serving_loop
+
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        return
+    if loop is _serving_loop:
+        _serving_loop = None
+    async_engine = _async_engines.pop(loop, None)
+    if async_engine is not None:
+        await async_engine.dispose()
 
 configure_database()
 
@@ -6,12 +6,14 @@ from fastapi import FastAPI, Request
 from fastapi.responses import JSONResponse
 
 from app.core.logging import configure_logging
+from app.database import dispose_async_engine, init_async_engine
 from app.services.outbox_worker import start_outbox_worker_task
 from app.models import employee, job, job_cost_ledger, scope, time_entry, workflow_execution  # noqa: F401
 from app.routers.auth import router as auth_router
 from app.routers.costing import router as costing_router
 from app.routers.employees import router as employees_router
 from app.routers.jobs import router as jobs_router
+from app.routers.metrics import router as metrics_router
 from app.routers.scopes import router as scopes_router
 from app.routers.time_entries import router as time_entries_router
 from app.routers.payroll import router as payroll_router
@@ -24,6 +26,7 @@ logger = logging.getLogger(__name__)
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     configure_logging()
+    await init_async_engine()
 
     task = start_outbox_worker_task()
     try:
@@ -38,6 +41,7 @@ async def lifespan(app: FastAPI):
             except Exception:
                 # worker crash during shutdown; already logged.
                 pass
+        await dispose_async_engine()
 
 
 app = FastAPI(
@@ -64,6 +68,7 @@ app.include_router(costing_router)
 app.include_router(employees_router)
 app.include_router(jobs_router)
 app.include_router(scopes_router)
+app.include_router(metrics_router)
 
 
 @app.get("/")
@@ -20,3 +20,7 @@ __all__ = [
     "WorkflowExecution",
 ]
 from app.models.event_outbox import EventOutbox
+from app.models.event_outbox_archive import EventOutboxArchive
+from app.models.event_outbox_dead_letter import EventOutboxDeadLetter
+from app.models.payroll_run_reconciliation import PayrollRunReconciliation
+from app.models.job_cost_daily_rollup import JobCostDailyRollup
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from sqlalchemy import Boolean, Column, DateTime, Integer, String, Text, func
+from sqlalchemy import Boolean, Column, DateTime, FetchedValue, Integer, String, Text, func, text
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.schema import Index, UniqueConstraint
 
@@ -26,6 +26,14 @@ class EventOutbox(Base):
 
     created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
 
+    # Maintained by trg_event_outbox_next_attempt_at from created_at + retry backoff.
+    next_attempt_at = Column(
+        DateTime(timezone=True),
+        nullable=False,
+        server_default=func.now(),
+        server_onupdate=FetchedValue(),
+    )
+
     __table_args__ = (
         UniqueConstraint(
             "company_id",
@@ -35,4 +43,10 @@ class EventOutbox(Base):
         ),
         Index("ix_event_outbox_company_event", "company_id", "event_type"),
         Index("ix_event_outbox_processed", "processed", "created_at"),
+        Index(
+            "ix_event_outbox_due",
+            "next_attempt_at",
+            "id",
+            postgresql_where=text("processed = false"),
+        ),
     )
@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+from sqlalchemy import Column, DateTime, Integer, String, func
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.schema import Index, UniqueConstraint
+
+from app.database import Base
+
+
+class EventOutboxArchive(Base):
+    """Processed event_outbox rows moved out of the hot table by outbox_retention."""
+
+    __tablename__ = "event_outbox_archive"
+
+    id = Column(Integer, primary_key=True, autoincrement=False)
+
+    company_id = Column(Integer, nullable=False)
+    event_type = Column(String, nullable=False)
+    idempotency_key = Column(String, nullable=False)
+
+    payload = Column(JSONB, nullable=False)
+
+    retry_count = Column(Integer, nullable=False)
+
+    created_at = Column(DateTime(timezone=True), nullable=False)
+    processed_at = Column(DateTime(timezone=True), nullable=True)
+    archived_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+
+    __table_args__ = (
+        UniqueConstraint(
+            "company_id",
+            "event_type",
+            "idempotency_key",
+            name="uq_event_outbox_archive_idempotency",
+        ),
+        Index("ix_event_outbox_archive_company_created", "company_id", "created_at"),
+    )
@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+from sqlalchemy import Column, DateTime, ForeignKey, Integer, String, Text, func
+from sqlalchemy.schema import Index, UniqueConstraint
+
+from app.database import Base
+
+
+class EventOutboxDeadLetter(Base):
+    """An event_outbox row that exhausted max_retries, with its last failure."""
+
+    __tablename__ = "event_outbox_dead_letter"
+
+    id = Column(Integer, primary_key=True)
+
+    event_outbox_id = Column(
+        Integer,
+        ForeignKey("event_outbox.id", name="fk_event_outbox_dead_letter_event_outbox_id"),
+        nullable=False,
+    )
+
+    company_id = Column(Integer, nullable=False)
+    event_type = Column(String, nullable=False)
+
+    retry_count = Column(Integer, nullable=False)
+
+    last_error = Column(Text, nullable=False)
+    traceback = Column(Text, nullable=True)
+
+    dead_lettered_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+
+    __table_args__ = (
+        UniqueConstraint("event_outbox_id", name="uq_event_outbox_dead_letter_event_outbox_id"),
+        Index(
+            "ix_event_outbox_dead_letter_company_event",
+            "company_id",
+            "event_type",
+            "event_outbox_id",
+        ),
+    )
@@ -0,0 +1,42 @@
+from sqlalchemy import BigInteger, Column, Date, Integer, String, func
+from sqlalchemy.schema import Index
+
+from app.database import Base
+
+
+class JobCostDailyRollup(Base):
+    """
+    Per-day job_cost_ledger totals, maintained by the trg_job_cost_ledger_rollup
+    statement trigger. Read-only from the application.
+    """
+
+    __tablename__ = "job_cost_daily_rollup"
+
+    id = Column(Integer, primary_key=True)
+
+    company_id = Column(Integer, nullable=False)
+    posting_day = Column(Date, nullable=False)
+
+    job_id = Column(Integer, nullable=False)
+    scope_id = Column(Integer, nullable=True)
+    employee_id = Column(Integer, nullable=True)
+
+    cost_category = Column(String, nullable=False)
+    source_type = Column(String, nullable=False)
+
+    row_count = Column(BigInteger, nullable=False)
+    total_cost_cents = Column(BigInteger, nullable=False)
+
+    __table_args__ = (
+        Index(
+            "uq_job_cost_daily_rollup_key",
+            "company_id",
+            "posting_day",
+            "job_id",
+            func.coalesce(scope_id, -1),
+            func.coalesce(employee_id, -1),
+            "cost_category",
+            "source_type",
+            unique=True,
+        ),
+    )
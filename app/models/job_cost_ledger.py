@@ -1,6 +1,6 @@
 from datetime import datetime
 
-from sqlalchemy import Boolean, Column, DateTime, Integer, Numeric, String, UniqueConstraint
+from sqlalchemy import Boolean, Column, DateTime, Index, Integer, Numeric, String, UniqueConstraint, text
 
 from app.database import Base
 
@@ -16,6 +16,12 @@ class JobCostLedger(Base):
             "cost_category",
             name="uq_job_cost_ledger_posting_key",
         ),
+        Index(
+            "ix_job_cost_ledger_company_payroll_run",
+            "company_id",
+            "payroll_run_id",
+            postgresql_where=text("payroll_run_id IS NOT NULL"),
+        ),
     )
 
     id = Column(Integer, primary_key=True, index=True)
@@ -29,6 +35,9 @@ class JobCostLedger(Base):
     source_reference_id = Column(String, index=True, nullable=False)
     cost_category = Column(String, index=True, nullable=False)
 
+    # Set for payroll_run_labor postings (source_reference_id = "<run>:<item>").
+    payroll_run_id = Column(String, nullable=True)
+
     quantity = Column(Numeric, nullable=True)
     unit_cost_cents = Column(Integer, nullable=True)
     total_cost_cents = Column(Integer, nullable=False)
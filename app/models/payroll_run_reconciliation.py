@@ -0,0 +1,21 @@
+from sqlalchemy import BigInteger, Column, DateTime, ForeignKey, Integer, String, func
+
+from app.database import Base
+
+
+class PayrollRunReconciliation(Base):
+    """Per-run payroll_run_labor ledger totals, maintained by costing_service.post_labor_costs."""
+
+    __tablename__ = "payroll_run_reconciliation"
+
+    payroll_run_id = Column(
+        String,
+        ForeignKey("payroll_run.payroll_run_id", ondelete="RESTRICT"),
+        primary_key=True,
+    )
+    company_id = Column(Integer, nullable=False)
+
+    ledger_total_cents = Column(BigInteger, nullable=False)
+    ledger_entry_count = Column(Integer, nullable=False)
+
+    updated_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, JSON
+from sqlalchemy import Column, Index, Integer, String, JSON, text
 from sqlalchemy.ext.mutable import MutableList
 
 from app.database import Base
@@ -11,7 +11,21 @@ class WorkflowExecution(Base):
     flow_name = Column(String, nullable=False)
     context = Column(JSON, nullable=False)
 
+    # Promoted from context so the one-active-execution check is an index probe.
+    company_id = Column(Integer, nullable=True)
+    employee_id = Column(Integer, nullable=True)
+
     status = Column(String, default="in_progress", nullable=False)
     current_step_id = Column(String, nullable=True)
 
     completed_steps = Column(MutableList.as_mutable(JSON), default=list, nullable=False)
+
+    __table_args__ = (
+        Index(
+            "uq_workflow_executions_active",
+            "company_id",
+            "employee_id",
+            unique=True,
+            postgresql_where=text("status = 'in_progress'"),
+        ),
+    )
@@ -1,13 +1,23 @@
 from datetime import datetime
-from typing import Optional, Any
+from typing import Iterator, Literal, Optional, Any
 from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
+from sqlalchemy import select, tuple_
 from sqlalchemy.orm import Session
+from starlette.background import BackgroundTask
 
 from app.core.authorization import Role, require_role
-from app.database import SessionLocal
+from app.core.pagination import decode_cursor, encode_cursor, page_rows, reject_cursor_with_offset
+from app.database import SessionLocal, async_session
 from app.models.job_cost_ledger import JobCostLedger
 from app.services import costing_service
+from app.services.ledger_export_service import (
+    gzip_stream,
+    iter_ledger_export_chunks,
+    render_csv,
+    render_ndjson,
+)
 from app.services.ledger_reporting_service import job_cost_totals
 
 router = APIRouter(prefix="/costing", tags=["Costing"])
@@ -37,6 +47,7 @@ class LedgerResponse(BaseModel):
     limit: int
     offset: int
     rows: list[LedgerRow]
+    next_cursor: Optional[str] = None
 
 
 # ---------- Totals Models ----------
@@ -79,57 +90,70 @@ def post_labor_for_run(
 
 
 @router.get("/job/{job_id}/ledger", response_model=LedgerResponse)
-def get_job_ledger(
+async def get_job_ledger(
     job_id: int,
     request: Request,
     scope_id: Optional[int] = None,
     limit: int = Query(100, ge=1, le=500),
     offset: int = Query(0, ge=0, le=1_000_000),
+    cursor: Optional[str] = None,
     _role=Depends(require_role(Role.MANAGER)),
 ):
-    db = SessionLocal()
-    try:
-        q = db.query(JobCostLedger).filter(
-            JobCostLedger.company_id == int(request.state.company_id),
-            JobCostLedger.job_id == int(job_id),
-        )
-
-        if scope_id is not None:
-            q = q.filter(JobCostLedger.scope_id == int(scope_id))
-
-        rows = (
-            q.order_by(JobCostLedger.posting_date.asc(), JobCostLedger.id.asc())
-            .limit(int(limit))
-            .offset(int(offset))
-            .all()
+    """
+    Ordered by (posting_date, id). Pass the previous page's next_cursor as
+    `cursor` for keyset pagination (O(page) at any depth); offset is kept
+    for compatibility.
+    """
+    reject_cursor_with_offset(cursor, offset)
+
+    stmt = select(JobCostLedger).where(
+        JobCostLedger.company_id == int(request.state.company_id),
+        JobCostLedger.job_id == int(job_id),
+    )
+
+    if scope_id is not None:
+        stmt = stmt.where(JobCostLedger.scope_id == int(scope_id))
+
+    if cursor is not None:
+        after_date, after_id = decode_cursor(cursor, types=(datetime, int))
+        stmt = stmt.where(
+            tuple_(JobCostLedger.posting_date, JobCostLedger.id) > tuple_(after_date, int(after_id))
         )
 
-        return {
-            "job_id": int(job_id),
-            "scope_id": scope_id,
-            "limit": int(limit),
-            "offset": int(offset),
-            "rows": [
-                {
-                    "id": r.id,
-                    "company_id": r.company_id,
-                    "job_id": r.job_id,
-                    "scope_id": r.scope_id,
-                    "employee_id": r.employee_id,
-                    "source_type": r.source_type,
-                    "source_reference_id": r.source_reference_id,
-                    "cost_category": r.cost_category,
-                    "quantity": None if r.quantity is None else str(r.quantity),
-                    "unit_cost_cents": r.unit_cost_cents,
-                    "total_cost_cents": r.total_cost_cents,
-                    "posting_date": r.posting_date.isoformat(),
-                    "created_at": r.created_at.isoformat(),
-                }
-                for r in rows
-            ],
-        }
-    finally:
-        db.close()
+    stmt = (
+        stmt.order_by(JobCostLedger.posting_date.asc(), JobCostLedger.id.asc())
+        .limit(int(limit) + 1)
+        .offset(int(offset))
+    )
+
+    async with async_session() as db:
+        rows, has_more = page_rows(list(await db.scalars(stmt)), limit)
+
+    return {
+        "job_id": int(job_id),
+        "scope_id": scope_id,
+        "limit": int(limit),
+        "offset": int(offset),
+        "next_cursor": encode_cursor([rows[-1].posting_date, rows[-1].id]) if has_more else None,
+        "rows": [
+            {
+                "id": r.id,
+                "company_id": r.company_id,
+                "job_id": r.job_id,
+                "scope_id": r.scope_id,
+                "employee_id": r.employee_id,
+                "source_type": r.source_type,
+                "source_reference_id": r.source_reference_id,
+                "cost_category": r.cost_category,
+                "quantity": None if r.quantity is None else str(r.quantity),
+                "unit_cost_cents": r.unit_cost_cents,
+                "total_cost_cents": r.total_cost_cents,
+                "posting_date": r.posting_date.isoformat(),
+                "created_at": r.created_at.isoformat(),
+            }
+            for r in rows
+        ],
+    }
 
 
 @router.get("/ledger/totals", response_model=LedgerTotalsResponse)
@@ -159,3 +183,55 @@ def get_ledger_totals(
         )
     finally:
         db.close()
+
+
+def _closing(parts: Iterator[bytes], db: Session) -> Iterator[bytes]:
+    try:
+        yield from parts
+    finally:
+        db.close()
+
+
+@router.get("/ledger/export")
+def export_ledger(
+    request: Request,
+    fmt: Literal["ndjson", "csv"] = Query("ndjson", alias="format"),
+    date_start: Optional[datetime] = None,
+    date_end: Optional[datetime] = None,
+    job_id: Optional[int] = None,
+    gzip: bool = False,
+    _role=Depends(require_role(Role.MANAGER)),
+):
+    """
+    Stream the company's ledger rows (ordered by posting_date, id) as NDJSON
+    or CSV, optionally gzip-compressed, from a server-side cursor with
+    constant memory.
+    """
+    db = SessionLocal()
+
+    chunks = iter_ledger_export_chunks(
+        db,
+        company_id=int(request.state.company_id),
+        date_start=date_start,
+        date_end=date_end,
+        job_id=job_id,
+    )
+    body = render_ndjson(chunks) if fmt == "ndjson" else render_csv(chunks)
+    media_type = "application/x-ndjson" if fmt == "ndjson" else "text/csv"
+    filename = f"job_cost_ledger.{fmt}"
+
+    headers = {}
+    if gzip:
+        body = gzip_stream(body)
+        headers["Content-Encoding"] = "gzip"
+
+    headers["Content-Disposition"] = f'attachment; filename="{filename}"'
+
+    # The generator closes db when the body is done; the background task covers
+    # a client that disconnects before the first chunk.
+    return StreamingResponse(
+        _closing(body, db),
+        media_type=media_type,
+        headers=headers,
+        background=BackgroundTask(db.close),
+    )
@@ -0,0 +1,27 @@
+import logging
+
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+from sqlalchemy.orm import Session
+
+from app.core.metrics import CONTENT_TYPE, REGISTRY
+from app.database import SessionLocal
+from app.services.outbox_metrics import refresh_outbox_queue_metrics
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(tags=["Metrics"])
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+def metrics():
+    db: Session = SessionLocal()
+    try:
+        refresh_outbox_queue_metrics(db)
+    except Exception:
+        # Still expose in-process metrics when the DB is unreachable.
+        logger.exception("Failed to sample outbox queue metrics")
+    finally:
+        db.close()
+
+    return PlainTextResponse(REGISTRY.render(), media_type=CONTENT_TYPE)
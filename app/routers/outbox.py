@@ -1,11 +1,13 @@
 from typing import Optional, Literal
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from fastapi import APIRouter, Depends, Query, Request
 from sqlalchemy.orm import Session
 
 from app.core.authorization import Role, require_role
+from app.core.pagination import decode_cursor, encode_cursor, page_rows, reject_cursor_with_offset
 from app.database import SessionLocal
 from app.models.event_outbox import EventOutbox
+from app.services.outbox_dead_letters import list_dead_letters, replay_dead_letters
 
 router = APIRouter(prefix="/outbox", tags=["Outbox"])
 
@@ -24,6 +26,7 @@ class OutboxListResponse(BaseModel):
     limit: int
     offset: int
     rows: list[OutboxRow]
+    next_cursor: Optional[str] = None
 
 
 @router.get("", response_model=OutboxListResponse)
@@ -32,8 +35,11 @@ def list_outbox(
     processed: Optional[bool] = None,
     limit: int = Query(50, ge=1, le=200),
     offset: int = Query(0, ge=0, le=1_000_000),
+    cursor: Optional[str] = None,
     _role=Depends(require_role(Role.MANAGER)),
 ):
+    reject_cursor_with_offset(cursor, offset)
+
     db: Session = SessionLocal()
     try:
         q = db.query(EventOutbox).filter(
@@ -43,16 +49,22 @@ def list_outbox(
         if processed is not None:
             q = q.filter(EventOutbox.processed == bool(processed))
 
-        rows = (
+        if cursor is not None:
+            (after_id,) = decode_cursor(cursor, types=(int,))
+            q = q.filter(EventOutbox.id > int(after_id))
+
+        rows, has_more = page_rows(
             q.order_by(EventOutbox.id.asc())
-            .limit(int(limit))
+            .limit(int(limit) + 1)
             .offset(int(offset))
-            .all()
+            .all(),
+            limit,
         )
 
         return {
             "limit": int(limit),
             "offset": int(offset),
+            "next_cursor": encode_cursor([rows[-1].id]) if has_more else None,
             "rows": [
                 {
                     "id": r.id,
@@ -68,3 +80,87 @@ def list_outbox(
         }
     finally:
         db.close()
+
+
+class DeadLetterRow(BaseModel):
+    event_outbox_id: int
+    company_id: int
+    event_type: str
+    retry_count: int
+    last_error: str
+    traceback: Optional[str]
+    dead_lettered_at: str
+
+
+class DeadLetterListResponse(BaseModel):
+    limit: int
+    rows: list[DeadLetterRow]
+
+
+class DeadLetterReplayRequest(BaseModel):
+    event_type: Optional[str] = None
+    id_from: Optional[int] = None
+    id_to: Optional[int] = None
+    batch_size: int = Field(500, ge=1, le=5000)
+    max_batches: int = Field(20, ge=1, le=1000)
+
+
+class DeadLetterReplayResponse(BaseModel):
+    replayed: int
+    batches: int
+
+
+@router.get("/dead_letters", response_model=DeadLetterListResponse)
+def get_dead_letters(
+    request: Request,
+    event_type: Optional[str] = None,
+    id_from: Optional[int] = Query(None, ge=1),
+    id_to: Optional[int] = Query(None, ge=1),
+    limit: int = Query(50, ge=1, le=200),
+    _role=Depends(require_role(Role.MANAGER)),
+):
+    db: Session = SessionLocal()
+    try:
+        rows = list_dead_letters(
+            db,
+            company_id=int(request.state.company_id),
+            event_type=event_type,
+            id_from=id_from,
+            id_to=id_to,
+            limit=limit,
+        )
+
+        return {
+            "limit": int(limit),
+            "rows": [
+                {
+                    "event_outbox_id": r.event_outbox_id,
+                    "company_id": r.company_id,
+                    "event_type": r.event_type,
+                    "retry_count": r.retry_count,
+                    "last_error": r.last_error,
+                    "traceback": r.traceback,
+                    "dead_lettered_at": r.dead_lettered_at.isoformat(),
+                }
+                for r in rows
+            ],
+        }
+    finally:
+        db.close()
+
+
+@router.post("/dead_letters/replay", response_model=DeadLetterReplayResponse)
+def post_replay_dead_letters(
+    request: Request,
+    body: DeadLetterReplayRequest,
+    _role=Depends(require_role(Role.MANAGER)),
+):
+    result = replay_dead_letters(
+        company_id=int(request.state.company_id),
+        event_type=body.event_type,
+        id_from=body.id_from,
+        id_to=body.id_to,
+        batch_size=body.batch_size,
+        max_batches=body.max_batches,
+    )
+    return {"replayed": result.replayed, "batches": result.batches}
@@ -1,14 +1,20 @@
-from typing import Any, Optional, Union, Literal
+from datetime import datetime
+import json
+from typing import Any, Iterator, Optional, Union, Literal
 
 from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+from starlette.background import BackgroundTask
 from pydantic import BaseModel
-from sqlalchemy import func
+from sqlalchemy import and_, func, or_
 from sqlalchemy.orm import Session
 
 from app.core.authorization import Role, require_role
+from app.core.pagination import decode_cursor, encode_cursor, page_rows, reject_cursor_with_offset
 from app.database import SessionLocal
 from app.models.payroll_item import PayrollItem
 from app.models.payroll_run import PayrollRun
+from app.services.payroll_item_service import iter_payroll_item_chunks
 
 router = APIRouter(prefix="/payroll", tags=["Payroll"])
 
@@ -26,6 +32,7 @@ class PayrollRunsResponse(BaseModel):
     limit: int
     offset: int
     rows: list[PayrollRunRow]
+    next_cursor: Optional[str] = None
 
 
 class PayrollRunDetail(BaseModel):
@@ -77,8 +84,11 @@ def list_payroll_runs(
     pay_period_id: Optional[str] = None,
     limit: int = Query(50, ge=1, le=200),
     offset: int = Query(0, ge=0, le=1_000_000),
+    cursor: Optional[str] = None,
     _role=Depends(require_role(Role.MANAGER)),
 ):
+    reject_cursor_with_offset(cursor, offset)
+
     db: Session = SessionLocal()
     try:
         q = db.query(PayrollRun).filter(PayrollRun.company_id == int(request.state.company_id))
@@ -89,16 +99,34 @@ def list_payroll_runs(
         if pay_period_id is not None:
             q = q.filter(PayrollRun.pay_period_id == str(pay_period_id))
 
-        rows = (
+        if cursor is not None:
+            # Keyset on (posted_at DESC NULLS LAST, payroll_run_id ASC).
+            after_posted, after_id = decode_cursor(cursor, types=((datetime, type(None)), str))
+            if after_posted is None:
+                q = q.filter(PayrollRun.posted_at.is_(None), PayrollRun.payroll_run_id > str(after_id))
+            else:
+                q = q.filter(
+                    or_(
+                        PayrollRun.posted_at < after_posted,
+                        and_(PayrollRun.posted_at == after_posted, PayrollRun.payroll_run_id > str(after_id)),
+                        PayrollRun.posted_at.is_(None),
+                    )
+                )
+
+        rows, has_more = page_rows(
             q.order_by(PayrollRun.posted_at.desc().nullslast(), PayrollRun.payroll_run_id.asc())
-            .limit(int(limit))
+            .limit(int(limit) + 1)
             .offset(int(offset))
-            .all()
+            .all(),
+            limit,
         )
 
         return {
             "limit": int(limit),
             "offset": int(offset),
+            "next_cursor": (
+                encode_cursor([rows[-1].posted_at, rows[-1].payroll_run_id]) if has_more else None
+            ),
             "rows": [
                 {
                     "payroll_run_id": r.payroll_run_id,
@@ -115,17 +143,88 @@ def list_payroll_runs(
         db.close()
 
 
-@router.get("/runs/{payroll_run_id}", response_model=PayrollRunDetailResponse)
+def _json(value: Any) -> str:
+    return json.dumps(value, separators=(",", ":"), ensure_ascii=False)
+
+
+_ITEM_COLUMNS = (
+    PayrollItem.id,
+    PayrollItem.company_id,
+    PayrollItem.payroll_run_id,
+    PayrollItem.employee_id,
+    PayrollItem.hours,
+    PayrollItem.rate_cents,
+    PayrollItem.gross_pay_cents,
+    PayrollItem.meta,
+    PayrollItem.created_at,
+)
+
+
+def _stream_payroll_run_detail(
+    db: Session, *, company_id: int, header: dict, gross_total: int
+) -> Iterator[str]:
+    """Render PayrollRunDetailResponse one item chunk at a time; closes db when done."""
+    try:
+        yield '{"payroll_run":' + _json(header)
+        yield ',"gross_total_cents":' + _json(int(gross_total))
+        yield ',"items":['
+
+        first = True
+        for chunk in iter_payroll_item_chunks(
+            db,
+            company_id=company_id,
+            payroll_run_id=header["payroll_run_id"],
+            columns=_ITEM_COLUMNS,
+        ):
+            parts = []
+            for i in chunk:
+                item = {
+                    "id": i.id,
+                    "company_id": i.company_id,
+                    "payroll_run_id": i.payroll_run_id,
+                    "employee_id": i.employee_id,
+                    "hours": None if i.hours is None else str(i.hours),
+                    "rate_cents": i.rate_cents,
+                    "gross_pay_cents": i.gross_pay_cents,
+                    "meta": i.meta,
+                    "created_at": i.created_at.isoformat(),
+                }
+                parts.append(_json(item) if first else "," + _json(item))
+                first = False
+            yield "".join(parts)
+
+        yield "]}"
+    finally:
+        db.close()
+
+
+@router.get(
+    "/runs/{payroll_run_id}",
+    response_class=StreamingResponse,
+    responses={200: {"model": PayrollRunDetailResponse}},
+)
 def get_payroll_run(
     payroll_run_id: str,
     request: Request,
     _role=Depends(require_role(Role.MANAGER)),
 ):
+    """
+    Items are streamed from a server-side cursor in fixed-size chunks, so the
+    response body is built incrementally (same JSON shape as
+    PayrollRunDetailResponse) and memory stays flat for very large runs.
+
+    The status line is sent before the items are read: if the cursor fails
+    mid-stream the connection is closed and the client receives a 200 with
+    truncated JSON, so clients must treat a body that does not parse as a
+    failed request.
+    """
+    company_id = int(request.state.company_id)
+
     db: Session = SessionLocal()
     try:
         pr = (
             db.query(PayrollRun)
-            .filter(PayrollRun.company_id == int(request.state.company_id))
+            .filter(PayrollRun.company_id == company_id)
             .filter(PayrollRun.payroll_run_id == str(payroll_run_id))
             .one_or_none()
         )
@@ -133,48 +232,34 @@ def get_payroll_run(
         if pr is None:
             raise HTTPException(status_code=404, detail="Not found")
 
-        items = (
-            db.query(PayrollItem)
-            .filter(PayrollItem.company_id == int(request.state.company_id))
-            .filter(PayrollItem.payroll_run_id == str(payroll_run_id))
-            .order_by(PayrollItem.id.asc())
-            .all()
-        )
-
         gross_total = (
             db.query(func.coalesce(func.sum(PayrollItem.gross_pay_cents), 0))
-            .filter(PayrollItem.company_id == int(request.state.company_id))
+            .filter(PayrollItem.company_id == company_id)
             .filter(PayrollItem.payroll_run_id == str(payroll_run_id))
             .scalar()
         )
 
-        return {
-            "payroll_run": {
-                "payroll_run_id": pr.payroll_run_id,
-                "company_id": pr.company_id,
-                "pay_period_id": pr.pay_period_id,
-                "status": pr.status,
-                "posted_at": None if pr.posted_at is None else pr.posted_at.isoformat(),
-                "created_at": None if pr.created_at is None else pr.created_at.isoformat(),
-            },
-            "gross_total_cents": int(gross_total or 0),
-            "items": [
-                {
-                    "id": i.id,
-                    "company_id": i.company_id,
-                    "payroll_run_id": i.payroll_run_id,
-                    "employee_id": i.employee_id,
-                    "hours": None if i.hours is None else str(i.hours),
-                    "rate_cents": i.rate_cents,
-                    "gross_pay_cents": i.gross_pay_cents,
-                    "meta": i.meta,
-                    "created_at": i.created_at.isoformat(),
-                }
-                for i in items
-            ],
+        header = {
+            "payroll_run_id": pr.payroll_run_id,
+            "company_id": pr.company_id,
+            "pay_period_id": pr.pay_period_id,
+            "status": pr.status,
+            "posted_at": None if pr.posted_at is None else pr.posted_at.isoformat(),
+            "created_at": None if pr.created_at is None else pr.created_at.isoformat(),
         }
-    finally:
+    except BaseException:
         db.close()
+        raise
+
+    # The generator owns db from here on and closes it when the body is done;
+    # the background task covers a client that disconnects before the first chunk.
+    return StreamingResponse(
+        _stream_payroll_run_detail(
+            db, company_id=company_id, header=header, gross_total=int(gross_total or 0)
+        ),
+        media_type="application/json",
+        background=BackgroundTask(db.close),
+    )
 
 
 @router.get("/runs/{payroll_run_id}/reconciliation", response_model=PayrollReconciliationResponse)
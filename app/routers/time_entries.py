@@ -1,16 +1,23 @@
 from __future__ import annotations
 
+import tempfile
 from datetime import datetime, timezone
 from typing import Literal, Optional
 
-from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, Response
 from pydantic import BaseModel, Field
+from sqlalchemy import select, tuple_
+from starlette.concurrency import run_in_threadpool
 
-from app.database import SessionLocal
+from app.core.authorization import Role, require_role
+from app.core.pagination import decode_cursor, encode_cursor, page_rows, reject_cursor_with_offset
+from app.core.timestamps import as_naive_utc
+from app.database import SessionLocal, async_session
 from app.deps.auth import require_auth
 from app.models.time_entry import TimeEntry
 from app.models.event_outbox import EventOutbox
 from app.services import time_engine_v10
+from app.services.time_entry_import import ImportFormat, import_time_entries, iter_import_records
 
 router = APIRouter(
     prefix="/time_entries",
@@ -36,6 +43,24 @@ class ClockOutRequest(BaseModel):
     )
 
 
+class BatchClockInRequest(BaseModel):
+    employee_ids: list[int] = Field(min_length=1, max_length=500)
+    job_id: int
+    scope_id: int
+    started_at: Optional[datetime] = Field(
+        default=None,
+        description="If omitted, server uses current UTC time.",
+    )
+
+
+class BatchClockOutRequest(BaseModel):
+    employee_ids: list[int] = Field(min_length=1, max_length=500)
+    ended_at: Optional[datetime] = Field(
+        default=None,
+        description="If omitted, server uses current UTC time.",
+    )
+
+
 class TimeEntryResponse(BaseModel):
     time_entry_id: str
     company_id: int
@@ -47,6 +72,29 @@ class TimeEntryResponse(BaseModel):
     ended_at: Optional[datetime]
 
 
+class BatchOutcomeResponse(BaseModel):
+    employee_id: int
+    result: str
+    time_entry: Optional[TimeEntryResponse] = None
+
+
+class ImportRowErrorResponse(BaseModel):
+    line: int
+    error: str
+
+
+class TimeEntryImportResponse(BaseModel):
+    rows: int
+    imported: int
+    skipped: int
+    error_count: int
+    errors: list[ImportRowErrorResponse]
+
+
+# Upload bodies larger than this are spooled to disk instead of memory.
+_IMPORT_SPOOL_BYTES = 8 * 1024 * 1024
+
+
 def _to_response(entry: TimeEntry) -> TimeEntryResponse:
     return TimeEntryResponse(
         time_entry_id=entry.time_entry_id,
@@ -61,8 +109,9 @@ def _to_response(entry: TimeEntry) -> TimeEntryResponse:
 
 
 @router.get("", response_model=list[TimeEntryResponse])
-def list_time_entries(
+async def list_time_entries(
     request: Request,
+    response: Response,
     x_company_id: int = Header(..., alias="X-Company-Id"),
     _auth: tuple[str, int] = Depends(require_auth),
     employee_id: Optional[int] = Query(default=None),
@@ -73,40 +122,90 @@ def list_time_entries(
     started_at_to: Optional[datetime] = Query(default=None),
     limit: int = Query(default=50, ge=1, le=100),
     offset: int = Query(default=0, ge=0),
+    cursor: Optional[str] = Query(default=None),
 ):
+    """
+    Newest first, ordered by (started_at, time_entry_id) descending. When more
+    rows exist the X-Next-Cursor response header carries an opaque cursor to
+    pass back as `cursor` (keyset pagination; offset is kept for compatibility).
+    """
     if int(x_company_id) != int(request.state.company_id):
         raise HTTPException(status_code=403, detail="Company mismatch")
 
-    db = SessionLocal()
-    try:
-        q = db.query(TimeEntry).filter(TimeEntry.company_id == int(x_company_id))
-
-        if employee_id is not None:
-            q = q.filter(TimeEntry.employee_id == int(employee_id))
-        if job_id is not None:
-            q = q.filter(TimeEntry.job_id == int(job_id))
-        if scope_id is not None:
-            q = q.filter(TimeEntry.scope_id == int(scope_id))
-        if status is not None:
-            q = q.filter(TimeEntry.status == status)
-        if started_at_from is not None:
-            q = q.filter(TimeEntry.started_at >= started_at_from)
-        if started_at_to is not None:
-            q = q.filter(TimeEntry.started_at <= started_at_to)
-
-        rows = (
-            q.order_by(TimeEntry.started_at.desc())
-            .offset(int(offset))
-            .limit(int(limit))
-            .all()
+    reject_cursor_with_offset(cursor, offset)
+
+    stmt = select(TimeEntry).where(TimeEntry.company_id == int(x_company_id))
+
+    if employee_id is not None:
+        stmt = stmt.where(TimeEntry.employee_id == int(employee_id))
+    if job_id is not None:
+        stmt = stmt.where(TimeEntry.job_id == int(job_id))
+    if scope_id is not None:
+        stmt = stmt.where(TimeEntry.scope_id == int(scope_id))
+    if status is not None:
+        stmt = stmt.where(TimeEntry.status == status)
+    if started_at_from is not None:
+        stmt = stmt.where(TimeEntry.started_at >= as_naive_utc(started_at_from))
+    if started_at_to is not None:
+        stmt = stmt.where(TimeEntry.started_at <= as_naive_utc(started_at_to))
+
+    if cursor is not None:
+        after_started, after_id = decode_cursor(cursor, types=(datetime, str))
+        stmt = stmt.where(
+            tuple_(TimeEntry.started_at, TimeEntry.time_entry_id) < tuple_(after_started, str(after_id))
         )
-        return [_to_response(r) for r in rows]
-    finally:
-        db.close()
+
+    stmt = (
+        stmt.order_by(TimeEntry.started_at.desc(), TimeEntry.time_entry_id.desc())
+        .offset(int(offset))
+        .limit(int(limit) + 1)
+    )
+
+    async with async_session() as db:
+        rows, has_more = page_rows(list(await db.scalars(stmt)), limit)
+
+    if has_more:
+        response.headers["X-Next-Cursor"] = encode_cursor([rows[-1].started_at, rows[-1].time_entry_id])
+    return [_to_response(r) for r in rows]
+
+
+@router.post("/import", response_model=TimeEntryImportResponse)
+async def import_time_entries_endpoint(
+    request: Request,
+    x_company_id: int = Header(..., alias="X-Company-Id"),
+    fmt: ImportFormat = Query(default="csv", alias="format"),
+    _role=Depends(require_role(Role.MANAGER)),
+):
+    """
+    Bulk import completed time entries. The request body is the raw CSV (with
+    a header row) or NDJSON file; columns are employee_id, job_id, scope_id,
+    started_at, ended_at and optionally time_entry_id. Rows are loaded in
+    chunks via COPY; the response reports per-line errors.
+    """
+    if int(x_company_id) != int(request.state.company_id):
+        raise HTTPException(status_code=403, detail="Company mismatch")
+
+    with tempfile.SpooledTemporaryFile(max_size=_IMPORT_SPOOL_BYTES) as spool:
+        async for chunk in request.stream():
+            # Past _IMPORT_SPOOL_BYTES the spool is a disk file; keep that I/O off the loop.
+            await run_in_threadpool(spool.write, chunk)
+        spool.seek(0)
+
+        result = await run_in_threadpool(
+            lambda: import_time_entries(iter_import_records(spool, fmt), company_id=int(x_company_id))
+        )
+
+    return TimeEntryImportResponse(
+        rows=result.rows,
+        imported=result.imported,
+        skipped=result.skipped,
+        error_count=result.error_count,
+        errors=[ImportRowErrorResponse(line=e.line, error=e.error) for e in result.errors],
+    )
 
 
 @router.post("/clock_in", response_model=TimeEntryResponse)
-def clock_in_endpoint(
+async def clock_in_endpoint(
     payload: ClockInRequest,
     request: Request,
     x_company_id: int = Header(..., alias="X-Company-Id"),
@@ -117,23 +216,99 @@ def clock_in_endpoint(
 
     started_at = payload.started_at or datetime.now(timezone.utc)
 
+    async with async_session() as db:
+        try:
+            entry = await time_engine_v10.clock_in_async(
+                company_id=int(x_company_id),
+                employee_id=int(payload.employee_id),
+                job_id=int(payload.job_id),
+                scope_id=int(payload.scope_id),
+                started_at=started_at,
+                db=db,
+            )
+            await db.commit()
+            return _to_response(entry)
+        except ValueError as exc:
+            await db.rollback()
+            raise HTTPException(status_code=409, detail=str(exc)) from exc
+        except Exception:
+            await db.rollback()
+            raise
+
+
+@router.post("/clock_out", response_model=TimeEntryResponse)
+async def clock_out_endpoint(
+    payload: ClockOutRequest,
+    request: Request,
+    x_company_id: int = Header(..., alias="X-Company-Id"),
+    _auth: tuple[str, int] = Depends(require_auth),
+):
+    if int(x_company_id) != int(request.state.company_id):
+        raise HTTPException(status_code=403, detail="Company mismatch")
+
+    ended_at = payload.ended_at or datetime.now(timezone.utc)
+
+    async with async_session() as db:
+        try:
+            entry = await time_engine_v10.clock_out_async(
+                company_id=int(x_company_id),
+                employee_id=int(payload.employee_id),
+                ended_at=ended_at,
+                db=db,
+            )
+            # durable outbox (same transaction as clock_out)
+            db.add(EventOutbox(**time_engine_v10.clock_out_outbox_event(int(x_company_id), entry)))
+
+            await db.commit()
+            return _to_response(entry)
+        except ValueError as exc:
+            await db.rollback()
+            raise HTTPException(status_code=409, detail=str(exc)) from exc
+        except Exception:
+            await db.rollback()
+            raise
+
+
+def _to_batch_response(outcomes: list[time_engine_v10.BatchOutcome]) -> list[BatchOutcomeResponse]:
+    return [
+        BatchOutcomeResponse(
+            employee_id=o.employee_id,
+            result=o.result,
+            time_entry=_to_response(o.entry) if o.entry is not None else None,
+        )
+        for o in outcomes
+    ]
+
+
+@router.post("/clock_in/batch", response_model=list[BatchOutcomeResponse])
+def clock_in_batch_endpoint(
+    payload: BatchClockInRequest,
+    request: Request,
+    x_company_id: int = Header(..., alias="X-Company-Id"),
+    _role=Depends(require_role(Role.MANAGER)),
+):
+    """
+    Clock a crew in to one job/scope in a single transaction. Each employee
+    gets an outcome: clocked_in, already_active or unknown_employee.
+    """
+    if int(x_company_id) != int(request.state.company_id):
+        raise HTTPException(status_code=403, detail="Company mismatch")
+
+    started_at = payload.started_at or datetime.now(timezone.utc)
+
     db = SessionLocal()
     try:
-        entry = time_engine_v10.clock_in(
+        outcomes = time_engine_v10.clock_in_batch(
             company_id=int(x_company_id),
-            employee_id=int(payload.employee_id),
+            employee_ids=payload.employee_ids,
             job_id=int(payload.job_id),
             scope_id=int(payload.scope_id),
             started_at=started_at,
             db=db,
         )
-        db.flush()
+        response = _to_batch_response(outcomes)
         db.commit()
-        db.refresh(entry)
-        return _to_response(entry)
-    except ValueError as exc:
-        db.rollback()
-        raise HTTPException(status_code=409, detail=str(exc)) from exc
+        return response
     except Exception:
         db.rollback()
         raise
@@ -141,13 +316,18 @@ def clock_in_endpoint(
         db.close()
 
 
-@router.post("/clock_out", response_model=TimeEntryResponse)
-def clock_out_endpoint(
-    payload: ClockOutRequest,
+@router.post("/clock_out/batch", response_model=list[BatchOutcomeResponse])
+def clock_out_batch_endpoint(
+    payload: BatchClockOutRequest,
     request: Request,
     x_company_id: int = Header(..., alias="X-Company-Id"),
-    _auth: tuple[str, int] = Depends(require_auth),
+    _role=Depends(require_role(Role.MANAGER)),
 ):
+    """
+    Clock a crew out in a single transaction, writing one
+    TIME_ENTRY_CLOCKED_OUT outbox row per completed entry. Each employee gets
+    an outcome: clocked_out or no_active_entry.
+    """
     if int(x_company_id) != int(request.state.company_id):
         raise HTTPException(status_code=403, detail="Company mismatch")
 
@@ -155,36 +335,15 @@ def clock_out_endpoint(
 
     db = SessionLocal()
     try:
-        entry = time_engine_v10.clock_out(
+        outcomes = time_engine_v10.clock_out_batch(
             company_id=int(x_company_id),
-            employee_id=int(payload.employee_id),
+            employee_ids=payload.employee_ids,
             ended_at=ended_at,
             db=db,
         )
-        # durable outbox (same transaction as clock_out)
-        db.add(
-            EventOutbox(
-                company_id=int(x_company_id),
-                event_type="TIME_ENTRY_CLOCKED_OUT",
-                idempotency_key=f"time_entry:{entry.time_entry_id}:clock_out",
-                payload={
-                    "time_entry_id": entry.time_entry_id,
-                    "employee_id": entry.employee_id,
-                    "job_id": entry.job_id,
-                    "scope_id": entry.scope_id,
-                    "started_at": entry.started_at.isoformat() if entry.started_at else None,
-                    "ended_at": entry.ended_at.isoformat() if entry.ended_at else None,
-                    "status": entry.status,
-                },
-            )
-        )
-
+        response = _to_batch_response(outcomes)
         db.commit()
-        db.refresh(entry)
-        return _to_response(entry)
-    except ValueError as exc:
-        db.rollback()
-        raise HTTPException(status_code=409, detail=str(exc)) from exc
+        return response
     except Exception:
         db.rollback()
         raise
@@ -193,7 +352,7 @@ def clock_out_endpoint(
 
 
 @router.get("/active", response_model=TimeEntryResponse)
-def get_active_time_entry(
+async def get_active_time_entry(
     employee_id: int,
     request: Request,
     x_company_id: int = Header(..., alias="X-Company-Id"),
@@ -202,27 +361,26 @@ def get_active_time_entry(
     if int(x_company_id) != int(request.state.company_id):
         raise HTTPException(status_code=403, detail="Company mismatch")
 
-    db = SessionLocal()
-    try:
-        entry = (
-            db.query(TimeEntry)
-            .filter(
-                TimeEntry.company_id == int(x_company_id),
-                TimeEntry.employee_id == int(employee_id),
-                TimeEntry.status == "active",
-            )
-            .order_by(TimeEntry.started_at.desc())
-            .first()
+    stmt = (
+        select(TimeEntry)
+        .where(
+            TimeEntry.company_id == int(x_company_id),
+            TimeEntry.employee_id == int(employee_id),
+            TimeEntry.status == "active",
         )
-        if entry is None:
-            raise HTTPException(status_code=404, detail="No active time entry")
-        return _to_response(entry)
-    finally:
-        db.close()
+        .order_by(TimeEntry.started_at.desc())
+        .limit(1)
+    )
+    async with async_session() as db:
+        entry = (await db.scalars(stmt)).first()
+
+    if entry is None:
+        raise HTTPException(status_code=404, detail="No active time entry")
+    return _to_response(entry)
 
 
 @router.get("/latest", response_model=TimeEntryResponse)
-def get_latest_time_entry(
+async def get_latest_time_entry(
     employee_id: int,
     request: Request,
     x_company_id: int = Header(..., alias="X-Company-Id"),
@@ -231,19 +389,18 @@ def get_latest_time_entry(
     if int(x_company_id) != int(request.state.company_id):
         raise HTTPException(status_code=403, detail="Company mismatch")
 
-    db = SessionLocal()
-    try:
-        entry = (
-            db.query(TimeEntry)
-            .filter(
-                TimeEntry.company_id == int(x_company_id),
-                TimeEntry.employee_id == int(employee_id),
-            )
-            .order_by(TimeEntry.started_at.desc())
-            .first()
+    stmt = (
+        select(TimeEntry)
+        .where(
+            TimeEntry.company_id == int(x_company_id),
+            TimeEntry.employee_id == int(employee_id),
         )
-        if entry is None:
-            raise HTTPException(status_code=404, detail="No time entries found")
-        return _to_response(entry)
-    finally:
-        db.close()
+        .order_by(TimeEntry.started_at.desc())
+        .limit(1)
+    )
+    async with async_session() as db:
+        entry = (await db.scalars(stmt)).first()
+
+    if entry is None:
+        raise HTTPException(status_code=404, detail="No time entries found")
+    return _to_response(entry)
@@ -2,6 +2,7 @@ from pathlib import Path
 
 from fastapi import APIRouter, Depends, Header, HTTPException, Request
 from fastapi.templating import Jinja2Templates
+from sqlalchemy.orm import Session
 
 from app.database import SessionLocal
 from app.deps.auth import require_auth
@@ -28,10 +29,8 @@ def _serialize_step(step):
     }
 
 
-def _load_execution_or_404(execution_id: str) -> WorkflowExecution:
-    db = SessionLocal()
-    execution = db.query(WorkflowExecution).filter_by(execution_id=execution_id).first()
-    db.close()
+def _load_execution_or_404(db: Session, execution_id: str) -> WorkflowExecution:
+    execution = db.get(WorkflowExecution, execution_id)
 
     if execution is None:
         raise HTTPException(status_code=404, detail="Execution not found")
@@ -49,21 +48,19 @@ def _require_company_access(execution: WorkflowExecution, company_id: int):
         raise HTTPException(status_code=403, detail="Forbidden for this company")
 
 
-def _build_execution_snapshot(execution_id: str) -> dict:
-    execution = _load_execution_or_404(execution_id)
-
+def _build_execution_snapshot(execution: WorkflowExecution) -> dict:
+    """Snapshot of a loaded execution, resolved against the in-memory workflow definition."""
     current_step = None
     next_step = None
 
     if execution.status != "completed" and execution.current_step_id is not None:
         try:
-            current_step_obj = workflow_service.get_current_step(execution_id)
-            current_step = _serialize_step(current_step_obj)
+            current_step = _serialize_step(workflow_service.current_step_of(execution))
         except ValueError:
             current_step = None
 
         try:
-            next_step_obj = workflow_service.get_next_step(execution_id)
+            next_step_obj = workflow_service.next_step_of(execution)
             next_step = None if next_step_obj is None else _serialize_step(next_step_obj)
         except ValueError:
             next_step = None
@@ -78,6 +75,10 @@ def _build_execution_snapshot(execution_id: str) -> dict:
     }
 
 
+def _build_execution_snapshots(executions: list[WorkflowExecution]) -> list[dict]:
+    return [_build_execution_snapshot(ex) for ex in executions]
+
+
 @router.get("/health")
 def preview_health():
     return {"ok": True}
@@ -103,26 +104,15 @@ def list_executions(
     try:
         rows = (
             db.query(WorkflowExecution)
-            .filter(WorkflowExecution.status == "in_progress")
-            .order_by(WorkflowExecution.execution_id.desc())
-            .limit(500)
+            .filter(
+                WorkflowExecution.company_id == int(company_id),
+                WorkflowExecution.employee_id == int(employee_id),
+                WorkflowExecution.status == "in_progress",
+            )
             .all()
         )
 
-        matches = []
-        for ex in rows:
-            ctx = ex.context or {}
-            try:
-                if int(ctx.get("company_id")) != int(company_id):
-                    continue
-                if int(ctx.get("employee_id")) != int(employee_id):
-                    continue
-            except (TypeError, ValueError):
-                continue
-
-            matches.append(_build_execution_snapshot(ex.execution_id))
-
-        return {"executions": matches}
+        return {"executions": _build_execution_snapshots(rows)}
     finally:
         db.close()
 
@@ -140,29 +130,19 @@ def reset_executions(
 
     db = SessionLocal()
     try:
-        rows = (
+        updated = (
             db.query(WorkflowExecution)
-            .filter(WorkflowExecution.status == "in_progress")
-            .order_by(WorkflowExecution.execution_id.desc())
-            .limit(500)
-            .all()
+            .filter(
+                WorkflowExecution.company_id == int(company_id),
+                WorkflowExecution.employee_id == int(employee_id),
+                WorkflowExecution.status == "in_progress",
+            )
+            .update(
+                {WorkflowExecution.status: "cancelled", WorkflowExecution.current_step_id: None},
+                synchronize_session=False,
+            )
         )
 
-        updated = 0
-        for ex in rows:
-            ctx = ex.context or {}
-            try:
-                if int(ctx.get("company_id")) != int(company_id):
-                    continue
-                if int(ctx.get("employee_id")) != int(employee_id):
-                    continue
-            except (TypeError, ValueError):
-                continue
-
-            ex.status = "cancelled"
-            ex.current_step_id = None
-            updated += 1
-
         if updated:
             db.commit()
 
@@ -207,23 +187,30 @@ def submit_step(
     x_company_id: int = Header(..., alias="X-Company-Id"),
     _auth: tuple[str, int] = Depends(require_auth),
 ):
-    execution = _load_execution_or_404(execution_id)
-    _require_company_access(execution, x_company_id)
-
+    db = SessionLocal()
     try:
-        current_step = workflow_service.get_current_step(execution_id)
-        workflow_service.submit_step(
-            execution_id=execution_id,
-            step_input={
-                "step_id": current_step.id,
-                "value": payload.value,
-                "notes": payload.notes,
-            },
-        )
-    except ValueError as exc:
-        raise HTTPException(status_code=400, detail=str(exc)) from exc
+        execution = _load_execution_or_404(db, execution_id)
+        _require_company_access(execution, x_company_id)
+
+        try:
+            current_step = workflow_service.current_step_of(execution)
+            workflow_service.submit_step(
+                execution_id=execution_id,
+                step_input={
+                    "step_id": current_step.id,
+                    "value": payload.value,
+                    "notes": payload.notes,
+                },
+                db=db,
+            )
+            db.commit()
+        except ValueError as exc:
+            db.rollback()
+            raise HTTPException(status_code=400, detail=str(exc)) from exc
 
-    return _build_execution_snapshot(execution_id)
+        return _build_execution_snapshot(execution)
+    finally:
+        db.close()
 
 
 @router.post("/{execution_id}/advance")
@@ -232,15 +219,21 @@ def advance_workflow(
     x_company_id: int = Header(..., alias="X-Company-Id"),
     _auth: tuple[str, int] = Depends(require_auth),
 ):
-    execution = _load_execution_or_404(execution_id)
-    _require_company_access(execution, x_company_id)
-
+    db = SessionLocal()
     try:
-        workflow_service.advance_execution(execution_id)
-    except ValueError as exc:
-        raise HTTPException(status_code=400, detail=str(exc)) from exc
+        execution = _load_execution_or_404(db, execution_id)
+        _require_company_access(execution, x_company_id)
 
-    return _build_execution_snapshot(execution_id)
+        try:
+            workflow_service.advance_execution(execution_id, db=db)
+            db.commit()
+        except ValueError as exc:
+            db.rollback()
+            raise HTTPException(status_code=400, detail=str(exc)) from exc
+
+        return _build_execution_snapshot(execution)
+    finally:
+        db.close()
 
 
 @router.post("/{execution_id}/complete")
@@ -249,15 +242,21 @@ def complete_workflow(
     x_company_id: int = Header(..., alias="X-Company-Id"),
     _auth: tuple[str, int] = Depends(require_auth),
 ):
-    execution = _load_execution_or_404(execution_id)
-    _require_company_access(execution, x_company_id)
-
+    db = SessionLocal()
     try:
-        workflow_service.complete_workflow(execution_id)
-    except ValueError as exc:
-        raise HTTPException(status_code=400, detail=str(exc)) from exc
+        execution = _load_execution_or_404(db, execution_id)
+        _require_company_access(execution, x_company_id)
 
-    return _build_execution_snapshot(execution_id)
+        try:
+            workflow_service.complete_workflow(execution_id, db=db)
+            db.commit()
+        except ValueError as exc:
+            db.rollback()
+            raise HTTPException(status_code=400, detail=str(exc)) from exc
+
+        return _build_execution_snapshot(execution)
+    finally:
+        db.close()
 
 
 @router.get("/{execution_id}")
@@ -266,7 +265,11 @@ def get_execution_status(
     x_company_id: int = Header(..., alias="X-Company-Id"),
     _auth: tuple[str, int] = Depends(require_auth),
 ):
-    execution = _load_execution_or_404(execution_id)
-    _require_company_access(execution, x_company_id)
+    db = SessionLocal()
+    try:
+        execution = _load_execution_or_404(db, execution_id)
+        _require_company_access(execution, x_company_id)
 
-    return _build_execution_snapshot(execution_id)
+        return _build_execution_snapshot(execution)
+    finally:
+        db.close()
@@ -2,19 +2,70 @@ import logging
 from datetime import datetime, timezone
 from typing import Any, Optional
 
+from sqlalchemy import func
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.orm import Session
 
 from app.models.job_cost_ledger import JobCostLedger
 from app.models.payroll_item import PayrollItem
 from app.models.payroll_run import PayrollRun
+from app.models.payroll_run_reconciliation import PayrollRunReconciliation
+from app.services.payroll_item_service import iter_payroll_item_chunks
 
 logger = logging.getLogger(__name__)
 
+# Rows per INSERT statement. Each row binds the 12 columns built in
+# post_labor_costs plus the Python-side created_at / immutable_flag defaults,
+# i.e. 14 params, so a chunk stays well under the 65535 bind limit.
+_LEDGER_INSERT_CHUNK = 1000
+
 
 def _utcnow() -> datetime:
     return datetime.now(timezone.utc)
 
 
+def _meta_int(v: Any) -> Optional[int]:
+    """A meta job_id / scope_id JSON value as an int; None when it does not convert."""
+    if v is None:
+        return None
+    try:
+        return int(v)
+    except (TypeError, ValueError, OverflowError):
+        return None
+
+
+def _upsert_reconciliation(
+    db: Session,
+    *,
+    company_id: int,
+    payroll_run_id: str,
+    ledger_added: int,
+    ledger_count_added: int,
+) -> None:
+    """
+    Maintain payroll_run_reconciliation for this run: the ledger totals are
+    incremented by the rows this posting actually inserted.
+    """
+    stmt = pg_insert(PayrollRunReconciliation).values(
+        payroll_run_id=payroll_run_id,
+        company_id=company_id,
+        ledger_total_cents=ledger_added,
+        ledger_entry_count=ledger_count_added,
+    )
+    db.execute(
+        stmt.on_conflict_do_update(
+            index_elements=[PayrollRunReconciliation.payroll_run_id],
+            set_={
+                "ledger_total_cents": PayrollRunReconciliation.ledger_total_cents
+                + stmt.excluded.ledger_total_cents,
+                "ledger_entry_count": PayrollRunReconciliation.ledger_entry_count
+                + stmt.excluded.ledger_entry_count,
+                "updated_at": func.now(),
+            },
+        )
+    )
+
+
 def post_labor_costs(company_id: int, payroll_run_id: str, db: Session) -> dict:
     """
     Create JobCostLedger rows from PayrollItem rows for a posted payroll run.
@@ -23,6 +74,10 @@ def post_labor_costs(company_id: int, payroll_run_id: str, db: Session) -> dict:
     - DO NOT commit here (outbox processor owns transaction boundaries).
     - Idempotent via unique key:
       (company_id, source_type, source_reference_id, cost_category)
+    - Items are streamed in _LEDGER_INSERT_CHUNK chunks from a server-side
+      cursor; each chunk is written with one INSERT ... ON CONFLICT DO
+      NOTHING RETURNING, so memory stays flat for very large runs.
+    - Keeps payroll_run_reconciliation up to date for the run.
     """
 
     posted = 0
@@ -39,70 +94,79 @@ def post_labor_costs(company_id: int, payroll_run_id: str, db: Session) -> dict:
 
     posting_date = pr.posted_at or _utcnow()
 
-    items = (
-        db.query(PayrollItem)
-        .filter(PayrollItem.company_id == int(company_id))
-        .filter(PayrollItem.payroll_run_id == str(payroll_run_id))
-        .order_by(PayrollItem.id.asc())
-        .all()
+    source_type = "payroll_run_labor"
+    cost_category = "labor"
+
+    ledger_added = 0
+
+    # Only the columns posting needs; job/scope ids are extracted server-side
+    # so the rest of the JSONB document is never shipped or parsed. They stay
+    # JSON-typed (not ->> text) so int() sees the same values it always did.
+    columns = (
+        PayrollItem.id,
+        PayrollItem.employee_id,
+        PayrollItem.hours,
+        PayrollItem.rate_cents,
+        PayrollItem.gross_pay_cents,
+        PayrollItem.meta["job_id"].label("job_id"),
+        PayrollItem.meta["scope_id"].label("scope_id"),
     )
 
-    for item in items:
-        meta: Any = item.meta or {}
-
-        job_id: Optional[int] = None
-        scope_id: Optional[int] = None
-
-        if isinstance(meta, dict):
-            v_job = meta.get("job_id")
-            if v_job is not None:
-                try:
-                    job_id = int(v_job)
-                except (TypeError, ValueError):
-                    job_id = None
-
-            v_scope = meta.get("scope_id")
-            if v_scope is not None:
-                try:
-                    scope_id = int(v_scope)
-                except (TypeError, ValueError):
-                    scope_id = None
-
-        if not job_id:
-            skipped += 1
-            continue
-
-        source_type = "payroll_run_labor"
-        cost_category = "labor"
-        source_reference_id = f"{payroll_run_id}:{item.id}"
-
-        existing = (
-            db.query(JobCostLedger)
-            .filter(JobCostLedger.company_id == int(company_id))
-            .filter(JobCostLedger.source_type == source_type)
-            .filter(JobCostLedger.source_reference_id == source_reference_id)
-            .filter(JobCostLedger.cost_category == cost_category)
-            .one_or_none()
-        )
-        if existing is not None:
-            skipped += 1
+    for items in iter_payroll_item_chunks(
+        db,
+        company_id=int(company_id),
+        payroll_run_id=str(payroll_run_id),
+        columns=columns,
+        chunk_size=_LEDGER_INSERT_CHUNK,
+    ):
+        rows: list[dict] = []
+
+        for item in items:
+            job_id = _meta_int(item.job_id)
+            scope_id = _meta_int(item.scope_id)
+
+            if not job_id:
+                skipped += 1
+                continue
+
+            rows.append(
+                {
+                    "company_id": int(company_id),
+                    "job_id": int(job_id),
+                    "scope_id": scope_id,
+                    "employee_id": int(item.employee_id),
+                    "source_type": source_type,
+                    "source_reference_id": f"{payroll_run_id}:{item.id}",
+                    "cost_category": cost_category,
+                    "payroll_run_id": str(payroll_run_id),
+                    "quantity": item.hours,
+                    "unit_cost_cents": item.rate_cents,
+                    "total_cost_cents": int(item.gross_pay_cents),
+                    "posting_date": posting_date,
+                }
+            )
+
+        if not rows:
             continue
 
-        ledger = JobCostLedger(
-            company_id=int(company_id),
-            job_id=int(job_id),
-            scope_id=scope_id,
-            employee_id=int(item.employee_id),
-            source_type=source_type,
-            source_reference_id=source_reference_id,
-            cost_category=cost_category,
-            quantity=item.hours,
-            unit_cost_cents=item.rate_cents,
-            total_cost_cents=int(item.gross_pay_cents),
-            posting_date=posting_date,
-        )
-        db.add(ledger)
-        db.flush()
-        posted += 1
+        # Rows already posted (replay) hit the posting key and are not
+        # returned, so posted/skipped come from RETURNING alone.
+        inserted = db.execute(
+            pg_insert(JobCostLedger)
+            .values(rows)
+            .on_conflict_do_nothing(constraint="uq_job_cost_ledger_posting_key")
+            .returning(JobCostLedger.total_cost_cents)
+        ).all()
+        posted += len(inserted)
+        skipped += len(rows) - len(inserted)
+        ledger_added += sum(int(r.total_cost_cents) for r in inserted)
+
+    _upsert_reconciliation(
+        db,
+        company_id=int(company_id),
+        payroll_run_id=str(payroll_run_id),
+        ledger_added=ledger_added,
+        ledger_count_added=posted,
+    )
 
     return {"posted": posted, "skipped": skipped, "payroll_run_id": str(payroll_run_id)}
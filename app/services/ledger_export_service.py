@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import csv
+import io
+import json
+import zlib
+from datetime import datetime
+from typing import Iterable, Iterator, Optional
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.models.job_cost_ledger import JobCostLedger
+
+# Rows per server-side cursor fetch (and per emitted body chunk).
+EXPORT_CHUNK_SIZE = 2000
+
+EXPORT_COLUMNS = (
+    "id",
+    "company_id",
+    "job_id",
+    "scope_id",
+    "employee_id",
+    "source_type",
+    "source_reference_id",
+    "cost_category",
+    "quantity",
+    "unit_cost_cents",
+    "total_cost_cents",
+    "posting_date",
+    "created_at",
+)
+
+
+def iter_ledger_export_chunks(
+    db: Session,
+    *,
+    company_id: int,
+    date_start: Optional[datetime] = None,
+    date_end: Optional[datetime] = None,
+    job_id: Optional[int] = None,
+    chunk_size: int = EXPORT_CHUNK_SIZE,
+) -> Iterator[list[dict]]:
+    """
+    Ledger rows for one company ordered by (posting_date, id), as lists of
+    plain dicts (JSON/CSV-ready). Reads through a server-side cursor so memory
+    is bounded by chunk_size regardless of how many rows match.
+
+    Semantics match job_cost_totals: posting_date >= date_start AND < date_end.
+    """
+    stmt = select(*[getattr(JobCostLedger, c) for c in EXPORT_COLUMNS]).where(
+        JobCostLedger.company_id == int(company_id)
+    )
+    if date_start is not None:
+        stmt = stmt.where(JobCostLedger.posting_date >= date_start)
+    if date_end is not None:
+        stmt = stmt.where(JobCostLedger.posting_date < date_end)
+    if job_id is not None:
+        stmt = stmt.where(JobCostLedger.job_id == int(job_id))
+
+    result = db.execute(
+        stmt.order_by(JobCostLedger.posting_date.asc(), JobCostLedger.id.asc()).execution_options(
+            yield_per=int(chunk_size)
+        )
+    )
+    try:
+        for chunk in result.partitions():
+            yield [
+                {
+                    **r._asdict(),
+                    "quantity": None if r.quantity is None else str(r.quantity),
+                    "posting_date": r.posting_date.isoformat(),
+                    "created_at": r.created_at.isoformat(),
+                }
+                for r in chunk
+            ]
+    finally:
+        result.close()
+
+
+def render_ndjson(chunks: Iterable[list[dict]]) -> Iterator[bytes]:
+    for chunk in chunks:
+        yield "".join(json.dumps(row, separators=(",", ":")) + "\n" for row in chunk).encode("utf-8")
+
+
+def render_csv(chunks: Iterable[list[dict]]) -> Iterator[bytes]:
+    buf = io.StringIO()
+    writer = csv.DictWriter(buf, fieldnames=EXPORT_COLUMNS, lineterminator="\n")
+    writer.writeheader()
+    yield buf.getvalue().encode("utf-8")
+
+    for chunk in chunks:
+        buf.seek(0)
+        buf.truncate()
+        writer.writerows(chunk)
+        yield buf.getvalue().encode("utf-8")
+
+
+def gzip_stream(parts: Iterable[bytes], *, level: int = 6) -> Iterator[bytes]:
+    """Compress a byte stream on the fly into a single gzip member."""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    for part in parts:
+        out = compressor.compress(part)
+        if out:
+            yield out
+    yield compressor.flush()
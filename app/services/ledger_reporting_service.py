@@ -1,14 +1,44 @@
 from __future__ import annotations
 
-from datetime import datetime
+from datetime import datetime, time, timedelta
 from typing import Any, Optional
 
-from sqlalchemy import func
+from sqlalchemy import func, union_all
 from sqlalchemy.orm import Session
 
+from app.core.timestamps import as_naive_utc
+from app.models.job_cost_daily_rollup import JobCostDailyRollup
 from app.models.job_cost_ledger import JobCostLedger
 
 
+def _whole_days(start: datetime, end: datetime) -> Optional[tuple[datetime, datetime]]:
+    """
+    [first midnight >= start, last midnight <= end), or None when the range
+    contains no complete day.
+    """
+    lo = datetime.combine(start.date(), time.min)
+    if lo < start:
+        lo += timedelta(days=1)
+    hi = datetime.combine(end.date(), time.min)
+    if lo >= hi:
+        return None
+    return lo, hi
+
+
+def _apply_filters(q, model, *, job_id, scope_id, employee_id, cost_category, source_type):
+    if job_id is not None:
+        q = q.filter(model.job_id == int(job_id))
+    if scope_id is not None:
+        q = q.filter(model.scope_id == int(scope_id))
+    if employee_id is not None:
+        q = q.filter(model.employee_id == int(employee_id))
+    if cost_category is not None:
+        q = q.filter(model.cost_category == str(cost_category))
+    if source_type is not None:
+        q = q.filter(model.source_type == str(source_type))
+    return q
+
+
 def job_cost_totals(
     *,
     company_id: int,
@@ -28,53 +58,90 @@ def job_cost_totals(
       posting_date >= date_start AND posting_date < date_end
     Grouping:
       job_id, scope_id, employee_id
+
+    Whole days inside the range are read from job_cost_daily_rollup; only the
+    partial-day edges (before the first / after the last midnight) touch raw
+    job_cost_ledger rows.
     """
+    start = as_naive_utc(date_start)
+    end = as_naive_utc(date_end)
+    filters = dict(
+        job_id=job_id,
+        scope_id=scope_id,
+        employee_id=employee_id,
+        cost_category=cost_category,
+        source_type=source_type,
+    )
 
-    q = (
-        db.query(
-            JobCostLedger.job_id.label("job_id"),
-            JobCostLedger.scope_id.label("scope_id"),
-            JobCostLedger.employee_id.label("employee_id"),
-            func.count(JobCostLedger.id).label("row_count"),
-            func.coalesce(func.sum(JobCostLedger.total_cost_cents), 0).label("total_cost_cents"),
+    def _raw(lo: datetime, hi: datetime):
+        q = (
+            db.query(
+                JobCostLedger.job_id.label("job_id"),
+                JobCostLedger.scope_id.label("scope_id"),
+                JobCostLedger.employee_id.label("employee_id"),
+                func.count(JobCostLedger.id).label("row_count"),
+                func.sum(JobCostLedger.total_cost_cents).label("total_cost_cents"),
+            )
+            .filter(JobCostLedger.company_id == int(company_id))
+            .filter(JobCostLedger.posting_date >= lo)
+            .filter(JobCostLedger.posting_date < hi)
         )
-        .filter(JobCostLedger.company_id == int(company_id))
-        .filter(JobCostLedger.posting_date >= date_start)
-        .filter(JobCostLedger.posting_date < date_end)
-    )
+        q = _apply_filters(q, JobCostLedger, **filters)
+        return q.group_by(JobCostLedger.job_id, JobCostLedger.scope_id, JobCostLedger.employee_id)
 
-    if job_id is not None:
-        q = q.filter(JobCostLedger.job_id == int(job_id))
-    if scope_id is not None:
-        q = q.filter(JobCostLedger.scope_id == int(scope_id))
-    if employee_id is not None:
-        q = q.filter(JobCostLedger.employee_id == int(employee_id))
-    if cost_category is not None:
-        q = q.filter(JobCostLedger.cost_category == str(cost_category))
-    if source_type is not None:
-        q = q.filter(JobCostLedger.source_type == str(source_type))
+    days = _whole_days(start, end)
+    if days is None:
+        parts = [_raw(start, end)]
+    else:
+        day_lo, day_hi = days
+        rollup = (
+            db.query(
+                JobCostDailyRollup.job_id.label("job_id"),
+                JobCostDailyRollup.scope_id.label("scope_id"),
+                JobCostDailyRollup.employee_id.label("employee_id"),
+                func.sum(JobCostDailyRollup.row_count).label("row_count"),
+                func.sum(JobCostDailyRollup.total_cost_cents).label("total_cost_cents"),
+            )
+            .filter(JobCostDailyRollup.company_id == int(company_id))
+            .filter(JobCostDailyRollup.posting_day >= day_lo.date())
+            .filter(JobCostDailyRollup.posting_day < day_hi.date())
+        )
+        rollup = _apply_filters(rollup, JobCostDailyRollup, **filters).group_by(
+            JobCostDailyRollup.job_id, JobCostDailyRollup.scope_id, JobCostDailyRollup.employee_id
+        )
+        parts = [rollup]
+        if start < day_lo:
+            parts.append(_raw(start, day_lo))
+        if day_hi < end:
+            parts.append(_raw(day_hi, end))
+
+    combined = union_all(*[p.statement for p in parts]).subquery("parts")
+    job_col = combined.c.job_id
+    scope_col = combined.c.scope_id
+    employee_col = combined.c.employee_id
 
-    rows = (
-        q.group_by(JobCostLedger.job_id, JobCostLedger.scope_id, JobCostLedger.employee_id)
+    rows = db.execute(
+        db.query(
+            job_col.label("job_id"),
+            scope_col.label("scope_id"),
+            employee_col.label("employee_id"),
+            func.sum(combined.c.row_count).label("row_count"),
+            func.coalesce(func.sum(combined.c.total_cost_cents), 0).label("total_cost_cents"),
+        )
+        .group_by(job_col, scope_col, employee_col)
         .order_by(
-            JobCostLedger.job_id.asc(),
-            JobCostLedger.scope_id.asc().nullsfirst(),
-            JobCostLedger.employee_id.asc().nullsfirst(),
+            job_col.asc(),
+            scope_col.asc().nullsfirst(),
+            employee_col.asc().nullsfirst(),
         )
-        .all()
-    )
+        .statement
+    ).all()
 
     return {
         "company_id": int(company_id),
         "date_start": date_start.isoformat(),
         "date_end": date_end.isoformat(),
-        "filters": {
-            "job_id": job_id,
-            "scope_id": scope_id,
-            "employee_id": employee_id,
-            "cost_category": cost_category,
-            "source_type": source_type,
-        },
+        "filters": filters,
         "groups": [
             {
                 "job_id": int(r.job_id),
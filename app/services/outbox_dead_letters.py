@@ -0,0 +1,177 @@
+import logging
+from dataclasses import dataclass
+from typing import Optional
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.database import SessionLocal
+from app.models.event_outbox_dead_letter import EventOutboxDeadLetter
+from app.services.outbox_processor import OUTBOX_NOTIFY_CHANNEL
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class DeadLetterReplayResult:
+    replayed: int
+    batches: int
+
+
+def _filters(
+    *,
+    event_type: Optional[str],
+    id_from: Optional[int],
+    id_to: Optional[int],
+) -> tuple[str, dict]:
+    clauses = ["company_id = :company_id"]
+    params: dict = {}
+    if event_type is not None:
+        clauses.append("event_type = :event_type")
+        params["event_type"] = str(event_type)
+    if id_from is not None:
+        clauses.append("event_outbox_id >= :id_from")
+        params["id_from"] = int(id_from)
+    if id_to is not None:
+        clauses.append("event_outbox_id <= :id_to")
+        params["id_to"] = int(id_to)
+    return " AND ".join(clauses), params
+
+
+def list_dead_letters(
+    db: Session,
+    *,
+    company_id: int,
+    event_type: Optional[str] = None,
+    id_from: Optional[int] = None,
+    id_to: Optional[int] = None,
+    limit: int = 50,
+) -> list[EventOutboxDeadLetter]:
+    q = db.query(EventOutboxDeadLetter).filter(EventOutboxDeadLetter.company_id == int(company_id))
+    if event_type is not None:
+        q = q.filter(EventOutboxDeadLetter.event_type == str(event_type))
+    if id_from is not None:
+        q = q.filter(EventOutboxDeadLetter.event_outbox_id >= int(id_from))
+    if id_to is not None:
+        q = q.filter(EventOutboxDeadLetter.event_outbox_id <= int(id_to))
+    return q.order_by(EventOutboxDeadLetter.event_outbox_id.asc()).limit(int(limit)).all()
+
+
+def replay_dead_letter_batch(
+    db: Session,
+    *,
+    company_id: int,
+    event_type: Optional[str] = None,
+    id_from: Optional[int] = None,
+    id_to: Optional[int] = None,
+    batch_size: int = 500,
+) -> list[int]:
+    """
+    Requeue up to batch_size dead-lettered events in one statement: delete
+    their dead-letter rows and reset the outbox rows (processed = false,
+    retry_count = 0), which makes them due immediately. Returns the
+    requeued event_outbox ids.
+
+    DO NOT commit here (caller owns transaction boundaries).
+    """
+    where, params = _filters(event_type=event_type, id_from=id_from, id_to=id_to)
+
+    stmt = text(
+        f"""
+        WITH picked AS (
+            SELECT id
+            FROM event_outbox_dead_letter
+            WHERE {where}
+            ORDER BY event_outbox_id
+            LIMIT :batch_size
+            FOR UPDATE SKIP LOCKED
+        ),
+        released AS (
+            DELETE FROM event_outbox_dead_letter d
+            USING picked
+            WHERE d.id = picked.id
+            RETURNING d.event_outbox_id
+        )
+        UPDATE event_outbox e
+        SET processed = false,
+            processed_at = NULL,
+            retry_count = 0
+        FROM released
+        WHERE e.id = released.event_outbox_id
+        RETURNING e.id
+        """
+    )
+
+    ids = [
+        int(r[0])
+        for r in db.execute(
+            stmt,
+            {**params, "company_id": int(company_id), "batch_size": int(batch_size)},
+        ).all()
+    ]
+
+    if ids:
+        # Rows are updated, not inserted, so trg_event_outbox_notify does not fire.
+        db.execute(
+            text("SELECT pg_notify(:channel, :payload)"),
+            {"channel": OUTBOX_NOTIFY_CHANNEL, "payload": str(int(company_id))},
+        )
+
+    return sorted(ids)
+
+
+def replay_dead_letters(
+    *,
+    company_id: int,
+    event_type: Optional[str] = None,
+    id_from: Optional[int] = None,
+    id_to: Optional[int] = None,
+    batch_size: int = 500,
+    max_batches: int = 20,
+) -> DeadLetterReplayResult:
+    """
+    Replay matching dead letters in separately committed batches so a large
+    recovery never holds locks on the whole set at once.
+    """
+    replayed = 0
+    batches = 0
+
+    for _ in range(int(max_batches)):
+        db = SessionLocal()
+        try:
+            ids = replay_dead_letter_batch(
+                db,
+                company_id=company_id,
+                event_type=event_type,
+                id_from=id_from,
+                id_to=id_to,
+                batch_size=batch_size,
+            )
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+        if not ids:
+            break
+
+        batches += 1
+        replayed += len(ids)
+        if len(ids) < int(batch_size):
+            break
+
+    if replayed:
+        logger.info(
+            "Outbox dead letters replayed",
+            extra={
+                "component": "outbox_dead_letters",
+                "company_id": int(company_id),
+                "event_type": event_type,
+                "replayed": replayed,
+                "batches": batches,
+            },
+        )
+
+    return DeadLetterReplayResult(replayed=replayed, batches=batches)
@@ -0,0 +1,76 @@
+from datetime import datetime, timezone
+from typing import Optional
+
+from sqlalchemy import false, func
+from sqlalchemy.orm import Session
+
+from app.core.metrics import REGISTRY
+from app.models.event_outbox import EventOutbox
+
+BATCH_SIZE_BUCKETS = (0, 1, 5, 10, 25, 50, 100, 250, 500, 1000)
+
+OUTBOX_CLAIM_SECONDS = REGISTRY.histogram(
+    "outbox_claim_seconds",
+    "Time spent claiming a batch of due outbox rows.",
+)
+OUTBOX_BATCH_ROWS = REGISTRY.histogram(
+    "outbox_batch_rows",
+    "Rows claimed per outbox batch.",
+    buckets=BATCH_SIZE_BUCKETS,
+)
+OUTBOX_HANDLER_SECONDS = REGISTRY.histogram(
+    "outbox_handler_seconds",
+    "Outbox handler latency by event type and result.",
+    ("event_type", "result"),
+)
+OUTBOX_RETRIES = REGISTRY.counter(
+    "outbox_retries_total",
+    "Failed handler runs that were scheduled for retry.",
+    ("event_type",),
+)
+OUTBOX_DEAD_LETTERS = REGISTRY.counter(
+    "outbox_dead_letters_total",
+    "Rows that exhausted max_retries and were given up on.",
+    ("event_type",),
+)
+OUTBOX_QUEUE_DUE = REGISTRY.gauge(
+    "outbox_queue_due_rows",
+    "Unprocessed outbox rows whose next attempt is due (sampled at scrape).",
+)
+OUTBOX_QUEUE_PENDING = REGISTRY.gauge(
+    "outbox_queue_pending_rows",
+    "Unprocessed outbox rows, due or backing off (sampled at scrape).",
+)
+OUTBOX_OLDEST_DUE_AGE = REGISTRY.gauge(
+    "outbox_oldest_due_age_seconds",
+    "Seconds the oldest due row has been waiting past its next_attempt_at (sampled at scrape).",
+)
+
+
+def refresh_outbox_queue_metrics(db: Session, *, now: Optional[datetime] = None) -> None:
+    """
+    Sample queue depth and age across all companies. Both aggregates read only
+    the ix_event_outbox_due partial index.
+    """
+    if now is None:
+        now = datetime.now(timezone.utc)
+
+    pending, due, oldest = (
+        db.query(
+            func.count(EventOutbox.id),
+            func.count(EventOutbox.id).filter(EventOutbox.next_attempt_at <= now),
+            func.min(EventOutbox.next_attempt_at),
+        )
+        .filter(EventOutbox.processed == false())
+        .one()
+    )
+
+    OUTBOX_QUEUE_PENDING.set(int(pending or 0))
+    OUTBOX_QUEUE_DUE.set(int(due or 0))
+
+    age = 0.0
+    if oldest is not None and int(due or 0) > 0:
+        if oldest.tzinfo is None:
+            oldest = oldest.replace(tzinfo=timezone.utc)
+        age = max(0.0, (now - oldest).total_seconds())
+    OUTBOX_OLDEST_DUE_AGE.set(age)
@@ -1,24 +1,48 @@
 import logging
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
-from typing import Callable, Dict, Optional
+from math import ceil
+from typing import Any, Callable, Dict, Hashable, Optional, Sequence
 
-from sqlalchemy import case, func, text
+from sqlalchemy import Boolean, Integer, case, column, false, text, update, values
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.orm import Session
+from sqlalchemy.orm.attributes import set_committed_value
 
 from app.database import SessionLocal
 from app.models.event_outbox import EventOutbox
+from app.models.event_outbox_dead_letter import EventOutboxDeadLetter
+from app.services.outbox_metrics import (
+    OUTBOX_BATCH_ROWS,
+    OUTBOX_CLAIM_SECONDS,
+    OUTBOX_DEAD_LETTERS,
+    OUTBOX_HANDLER_SECONDS,
+    OUTBOX_RETRIES,
+)
 
 logger = logging.getLogger(__name__)
 
+# Channel notified (with the company_id as payload) by trg_event_outbox_notify
+# whenever an event_outbox row is committed.
+OUTBOX_NOTIFY_CHANNEL = "event_outbox"
+
 
 @dataclass(frozen=True)
 class OutboxProcessResult:
     processed: int
     failed: int
+    # Rows claimed by the batch (due or not); claimed == batch_size means more may be waiting.
+    claimed: int = 0
 
 
 OutboxHandler = Callable[[EventOutbox, Session], None]
+OutboxOrderingKey = Callable[[EventOutbox], Hashable]
+
+# (event_outbox id, processed, retry_count) as decided for one claimed row.
+OutboxOutcome = tuple[int, bool, int]
 
 
 def _utcnow() -> datetime:
@@ -76,21 +100,203 @@ def _is_due_clause(now: datetime):
     SQL-side due filter (Postgres).
 
     Key property: apply due check BEFORE LIMIT so not-due rows don't starve due rows.
-    wait_seconds:
-      retry_count <= 0 -> 0
-      else -> least(60, 2^retry_count)
-    due_at := created_at + wait_seconds seconds
+    next_attempt_at is kept equal to created_at + _retry_wait(retry_count) by
+    trg_event_outbox_next_attempt_at, so the filter is served by the partial
+    index ix_event_outbox_due (next_attempt_at, id) WHERE processed = false.
+    """
+    return EventOutbox.next_attempt_at <= now
+
+
+def _claim_query(
+    db: Session,
+    *,
+    now: datetime,
+    batch_size: int,
+    partitions: Optional[Sequence[int]] = None,
+    partition_count: int = 1,
+    lock: bool = True,
+):
+    # "processed = false" (not "IS false") so the planner matches the partial index predicate.
+    q = (
+        db.query(EventOutbox)
+        .filter(EventOutbox.processed == false())
+        .filter(_is_due_clause(now))
+    )
+
+    if partitions is not None:
+        q = q.filter(
+            (EventOutbox.company_id % int(partition_count)).in_([int(p) for p in partitions])
+        )
+
+    q = q.order_by(EventOutbox.next_attempt_at.asc(), EventOutbox.id.asc())
+    if lock:
+        q = q.with_for_update(skip_locked=True)
+
+    return q.limit(int(batch_size))
+
+
+def _default_ordering_key(row: EventOutbox) -> Hashable:
+    """
+    Events sharing a key are handled in id order by one thread; different
+    keys may run concurrently. Falls back to the company so events without a
+    recognised subject stay serial per tenant.
+    """
+    payload: Any = row.payload or {}
+    if isinstance(payload, dict):
+        for field in ("payroll_run_id", "employee_id"):
+            v = payload.get(field)
+            if v is not None:
+                return (int(row.company_id), field, str(v))
+    return (int(row.company_id),)
+
+
+def _apply_outcomes(
+    db: Session,
+    rows: Sequence[EventOutbox],
+    outcomes: Sequence[OutboxOutcome],
+    now: datetime,
+) -> None:
     """
-    retry_count = func.coalesce(EventOutbox.retry_count, 0)
+    Persist the batch's row states with a single UPDATE ... FROM (VALUES ...)
+    RETURNING the trigger-maintained next_attempt_at.
 
-    wait_seconds = case(
-        (retry_count <= 0, 0),
-        else_=func.least(60, func.power(2, retry_count)),
+    The claimed ORM rows are synced with set_committed_value so the session
+    sees the new state without issuing a per-row UPDATE of its own.
+    """
+    if not outcomes:
+        return
+
+    outcome = values(
+        column("id", Integer),
+        column("processed", Boolean),
+        column("retry_count", Integer),
+        name="outcome",
+    ).data(list(outcomes))
+
+    next_attempt_at = dict(
+        db.execute(
+            update(EventOutbox)
+            .where(EventOutbox.id == outcome.c.id)
+            .values(
+                processed=outcome.c.processed,
+                retry_count=outcome.c.retry_count,
+                processed_at=case((outcome.c.processed, now), else_=EventOutbox.processed_at),
+            )
+            .returning(EventOutbox.id, EventOutbox.next_attempt_at)
+            .execution_options(synchronize_session=False)
+        ).all()
+    )
+
+    by_id = {row.id: row for row in rows}
+    for row_id, done, retry_count in outcomes:
+        row = by_id[row_id]
+        set_committed_value(row, "retry_count", retry_count)
+        set_committed_value(row, "next_attempt_at", next_attempt_at[row_id])
+        set_committed_value(row, "processed", done)
+        if done:
+            set_committed_value(row, "processed_at", now)
+
+
+def _record_dead_letters(db: Session, dead_letters: Sequence[dict], now: datetime) -> None:
+    """
+    Record exhausted rows in event_outbox_dead_letter (one multi-row INSERT).
+    The outbox row itself is already processed = true, so it leaves the claim
+    index; the dead letter is what distinguishes it from a success.
+    """
+    if not dead_letters:
+        return
+
+    stmt = pg_insert(EventOutboxDeadLetter).values(
+        [{**d, "dead_lettered_at": now} for d in dead_letters]
     )
+    db.execute(
+        stmt.on_conflict_do_update(
+            constraint="uq_event_outbox_dead_letter_event_outbox_id",
+            set_={
+                "retry_count": stmt.excluded.retry_count,
+                "last_error": stmt.excluded.last_error,
+                "traceback": stmt.excluded.traceback,
+                "dead_lettered_at": stmt.excluded.dead_lettered_at,
+            },
+        )
+    )
+
+
+def _process_rows(
+    db: Session,
+    rows: Sequence[EventOutbox],
+    *,
+    now: datetime,
+    max_retries: int,
+    handlers: Dict[str, OutboxHandler],
+) -> OutboxProcessResult:
+    """Run handlers for already-claimed rows and persist their outcomes. Does not commit."""
+    processed = 0
+    failed = 0
+    outcomes: list[OutboxOutcome] = []
+    dead_letters: list[dict] = []
+
+    for row in rows:
+        # Keep python-side guard as defense-in-depth (should be redundant with SQL filter).
+        if not _due(row.created_at, row.retry_count, now):
+            continue
+
+        handler = handlers.get(row.event_type)
+        retry_count = int(row.retry_count or 0)
+        started = time.perf_counter()
+
+        try:
+            if handler is None:
+                raise ValueError(f"Unknown event_type: {row.event_type}")
+
+            # Savepoint per row: a failing handler's partial writes (or a
+            # DB error that would abort the transaction) are rolled back
+            # without losing the rest of the batch.
+            with db.begin_nested():
+                handler(row, db)
+
+            outcomes.append((row.id, True, retry_count))
+            processed += 1
+            OUTBOX_HANDLER_SECONDS.observe(
+                time.perf_counter() - started, event_type=row.event_type, result="ok"
+            )
+
+        except Exception as exc:
+            OUTBOX_HANDLER_SECONDS.observe(
+                time.perf_counter() - started, event_type=row.event_type, result="error"
+            )
+            retry_count += 1
+            exhausted = retry_count >= int(max_retries)
+            outcomes.append((row.id, exhausted, retry_count))
+            failed += 1
+            if exhausted:
+                dead_letters.append(
+                    {
+                        "event_outbox_id": row.id,
+                        "company_id": row.company_id,
+                        "event_type": row.event_type,
+                        "retry_count": retry_count,
+                        "last_error": f"{type(exc).__name__}: {exc}",
+                        "traceback": traceback.format_exc(),
+                    }
+                )
+                OUTBOX_DEAD_LETTERS.inc(event_type=row.event_type)
+            else:
+                OUTBOX_RETRIES.inc(event_type=row.event_type)
+            logger.exception(
+                "Outbox row processing failed",
+                extra={
+                    "event_outbox_id": row.id,
+                    "event_type": row.event_type,
+                    "retry_count": retry_count,
+                    "max_retries": int(max_retries),
+                },
+            )
 
-    # created_at + (wait_seconds * interval '1 second')
-    due_at = EventOutbox.created_at + (wait_seconds * text("interval '1 second'"))
-    return due_at <= now
+    _apply_outcomes(db, rows, outcomes, now)
+    _record_dead_letters(db, dead_letters, now)
+
+    return OutboxProcessResult(processed=processed, failed=failed, claimed=len(rows))
 
 
 def process_outbox_batch(
@@ -100,7 +306,15 @@ def process_outbox_batch(
     batch_size: int = 50,
     max_retries: int = 10,
     handlers: Optional[Dict[str, OutboxHandler]] = None,
+    partitions: Optional[Sequence[int]] = None,
+    partition_count: int = 1,
 ) -> OutboxProcessResult:
+    """
+    Claim and process up to batch_size due rows.
+
+    partitions/partition_count restrict the claim to companies whose
+    company_id % partition_count is in partitions (partitioned worker pool).
+    """
     owns_db = db is None
     if owns_db:
         db = SessionLocal()
@@ -111,69 +325,155 @@ def process_outbox_batch(
     if handlers is None:
         handlers = _default_handlers()
 
-    processed = 0
-    failed = 0
+    try:
+        started = time.perf_counter()
+        rows = _claim_query(
+            db,
+            now=now,
+            batch_size=batch_size,
+            partitions=partitions,
+            partition_count=partition_count,
+        ).all()
+        OUTBOX_CLAIM_SECONDS.observe(time.perf_counter() - started)
+        OUTBOX_BATCH_ROWS.observe(len(rows))
+
+        result = _process_rows(db, rows, now=now, max_retries=max_retries, handlers=handlers)
+
+        if owns_db:
+            db.commit()
+
+        return result
 
+    except Exception:
+        if owns_db:
+            db.rollback()
+        raise
+    finally:
+        if owns_db:
+            db.close()
+
+
+def _process_group(
+    ids: Sequence[int],
+    *,
+    now: datetime,
+    max_retries: int,
+    handlers: Dict[str, OutboxHandler],
+) -> OutboxProcessResult:
+    db = SessionLocal()
     try:
+        # Re-claim under this session; rows taken by another worker meanwhile are skipped.
         rows = (
             db.query(EventOutbox)
-            .filter(EventOutbox.processed.is_(False))
+            .filter(EventOutbox.id.in_(list(ids)))
+            .filter(EventOutbox.processed == false())
             .filter(_is_due_clause(now))
             .order_by(EventOutbox.id.asc())
             .with_for_update(skip_locked=True)
-            .limit(int(batch_size))
             .all()
         )
 
-        for row in rows:
-            # Keep python-side guard as defense-in-depth (should be redundant with SQL filter).
-            if not _due(row.created_at, row.retry_count, now):
-                continue
+        result = _process_rows(db, rows, now=now, max_retries=max_retries, handlers=handlers)
+        db.commit()
+        return result
 
-            handler = handlers.get(row.event_type)
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
 
-            try:
-                if handler is None:
-                    raise ValueError(f"Unknown event_type: {row.event_type}")
 
-                handler(row, db)
+def process_outbox_batch_concurrent(
+    *,
+    now: Optional[datetime] = None,
+    batch_size: int = 50,
+    max_retries: int = 10,
+    handlers: Optional[Dict[str, OutboxHandler]] = None,
+    partitions: Optional[Sequence[int]] = None,
+    partition_count: int = 1,
+    max_workers: int = 4,
+    ordering_key: Optional[OutboxOrderingKey] = None,
+) -> OutboxProcessResult:
+    """
+    Process up to batch_size due rows on a bounded thread pool.
 
-                row.processed = True
-                row.processed_at = now
-                db.flush()
-                processed += 1
+    Rows are grouped by ordering_key (default: company + payroll run or
+    employee). Each group runs on one thread, in id order, in its own session
+    and transaction; independent groups run in parallel. Uses one connection
+    per active thread plus one for the initial peek.
+    """
+    if now is None:
+        now = _utcnow()
 
-            except Exception:
-                row.retry_count = int(row.retry_count or 0) + 1
+    if handlers is None:
+        handlers = _default_handlers()
 
-                if int(row.retry_count) >= int(max_retries):
-                    row.processed = True
-                    row.processed_at = now
+    if ordering_key is None:
+        ordering_key = _default_ordering_key
 
-                db.flush()
-                failed += 1
-                logger.exception(
-                    "Outbox row processing failed",
-                    extra={
-                        "event_outbox_id": row.id,
-                        "event_type": row.event_type,
-                        "retry_count": int(row.retry_count),
-                        "max_retries": int(max_retries),
-                    },
-                )
+    db = SessionLocal()
+    try:
+        started = time.perf_counter()
+        peeked = _claim_query(
+            db,
+            now=now,
+            batch_size=batch_size,
+            partitions=partitions,
+            partition_count=partition_count,
+            lock=False,
+        ).all()
+        OUTBOX_CLAIM_SECONDS.observe(time.perf_counter() - started)
+        OUTBOX_BATCH_ROWS.observe(len(peeked))
+
+        groups: Dict[Hashable, list[int]] = {}
+        for row in peeked:
+            groups.setdefault(ordering_key(row), []).append(int(row.id))
+
+        db.rollback()
+    finally:
+        db.close()
 
-        if owns_db:
-            db.commit()
+    if not groups:
+        return OutboxProcessResult(processed=0, failed=0)
 
-        return OutboxProcessResult(processed=processed, failed=failed)
+    processed = 0
+    failed = 0
+    claimed = 0
+    first_error: Optional[BaseException] = None
+
+    with ThreadPoolExecutor(
+        max_workers=max(1, min(int(max_workers), len(groups))),
+        thread_name_prefix="outbox-handler",
+    ) as pool:
+        futures = [
+            pool.submit(
+                _process_group,
+                sorted(ids),
+                now=now,
+                max_retries=max_retries,
+                handlers=handlers,
+            )
+            for ids in groups.values()
+        ]
+
+        for future in futures:
+            try:
+                r = future.result()
+            except Exception as exc:
+                # Group transaction rolled back; its rows stay due for the next tick.
+                logger.exception("Outbox handler group failed")
+                if first_error is None:
+                    first_error = exc
+                continue
+            processed += r.processed
+            failed += r.failed
+            claimed += r.claimed
 
-    except Exception:
-        if owns_db:
-            db.rollback()
-        raise
-    finally:
-        if owns_db:
-            db.close()
+    if first_error is not None:
+        raise first_error
+
+    return OutboxProcessResult(processed=processed, failed=failed, claimed=claimed)
 
 
 def try_acquire_outbox_lock(db: Session) -> bool:
@@ -183,3 +483,79 @@ def try_acquire_outbox_lock(db: Session) -> bool:
 
 def release_outbox_lock(db: Session) -> None:
     db.execute(text("select pg_advisory_unlock(4242, 4243)"))
+
+
+# Partitioned worker pool (advisory lock keys, two-int form):
+#   (4244, p)  exclusive: owner of partition p = company_id % partition_count
+#   (4245, 0)  shared: held by every live partitioned worker (membership)
+# All locks are session-level, so a worker whose connection dies drops its
+# partitions and membership at once; survivors pick them up on rebalance.
+
+
+def register_outbox_worker(db: Session) -> None:
+    db.execute(text("select pg_advisory_lock_shared(4245, 0)"))
+
+
+def unregister_outbox_worker(db: Session) -> None:
+    db.execute(text("select pg_advisory_unlock_shared(4245, 0)"))
+
+
+def count_outbox_workers(db: Session) -> int:
+    res = db.execute(
+        text(
+            """
+            select count(*)
+            from pg_locks
+            where locktype = 'advisory'
+              and database = (select oid from pg_database where datname = current_database())
+              and classid = 4245
+              and objid = 0
+              and objsubid = 2
+              and granted
+            """
+        )
+    ).scalar()
+    return int(res or 0)
+
+
+def try_acquire_outbox_partition_lock(db: Session, partition: int) -> bool:
+    res = db.execute(
+        text("select pg_try_advisory_lock(4244, :partition)"),
+        {"partition": int(partition)},
+    ).scalar()
+    return bool(res)
+
+
+def release_outbox_partition_lock(db: Session, partition: int) -> None:
+    db.execute(
+        text("select pg_advisory_unlock(4244, :partition)"),
+        {"partition": int(partition)},
+    )
+
+
+def rebalance_outbox_partitions(db: Session, *, owned: set[int], partition_count: int) -> set[int]:
+    """
+    Converge towards a fair share of ceil(partition_count / live_workers).
+
+    Workers above their share release the excess; workers below it take any
+    unowned partitions. Repeated calls from every worker settle the pool after
+    joins and deaths without any coordinator.
+    """
+    workers = max(1, count_outbox_workers(db))
+    share = ceil(int(partition_count) / workers)
+
+    owned = set(owned)
+
+    for partition in sorted(owned)[share:]:
+        release_outbox_partition_lock(db, partition)
+        owned.discard(partition)
+
+    for partition in range(int(partition_count)):
+        if len(owned) >= share:
+            break
+        if partition in owned:
+            continue
+        if try_acquire_outbox_partition_lock(db, partition):
+            owned.add(partition)
+
+    return owned
@@ -0,0 +1,127 @@
+import argparse
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.database import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+
+# One statement per batch: lock a slice of old processed rows (skipping any a
+# worker holds), delete them from the hot table and insert them into the archive.
+# Dead-lettered rows stay in the hot table until they are replayed.
+# The inner SELECT is served by ix_event_outbox_processed (processed, created_at).
+_ARCHIVE_BATCH_SQL = text(
+    """
+    WITH moved AS (
+        DELETE FROM event_outbox e
+        WHERE e.id IN (
+            SELECT id
+            FROM event_outbox
+            WHERE processed = true
+              AND created_at < :created_before
+              AND NOT EXISTS (
+                  SELECT 1 FROM event_outbox_dead_letter d
+                  WHERE d.event_outbox_id = event_outbox.id
+              )
+            ORDER BY created_at, id
+            LIMIT :batch_size
+            FOR UPDATE SKIP LOCKED
+        )
+        RETURNING e.id, e.company_id, e.event_type, e.idempotency_key, e.payload,
+                  e.retry_count, e.created_at, e.processed_at
+    )
+    INSERT INTO event_outbox_archive (
+        id, company_id, event_type, idempotency_key, payload,
+        retry_count, created_at, processed_at
+    )
+    SELECT id, company_id, event_type, idempotency_key, payload,
+           retry_count, created_at, processed_at
+    FROM moved
+    """
+)
+
+
+def archive_processed_outbox(db: Session, *, created_before: datetime, batch_size: int = 1000) -> int:
+    """
+    Move up to batch_size processed rows created before created_before into
+    event_outbox_archive. Returns the number of rows moved.
+
+    DO NOT commit here (caller owns transaction boundaries).
+    """
+    res = db.execute(
+        _ARCHIVE_BATCH_SQL,
+        {"created_before": created_before, "batch_size": int(batch_size)},
+    )
+    return int(res.rowcount or 0)
+
+
+def run_outbox_retention(
+    *,
+    retention_days: int,
+    now: Optional[datetime] = None,
+    batch_size: int = 1000,
+    max_batches: int = 100,
+) -> int:
+    """
+    Archive processed rows older than retention_days in short, separately
+    committed batches so the hot table never sees one long delete.
+    """
+    if now is None:
+        now = datetime.now(timezone.utc)
+
+    created_before = now - timedelta(days=int(retention_days))
+    total = 0
+
+    for _ in range(int(max_batches)):
+        db = SessionLocal()
+        try:
+            moved = archive_processed_outbox(db, created_before=created_before, batch_size=batch_size)
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+        total += moved
+        if moved < int(batch_size):
+            break
+
+    if total:
+        logger.info(
+            "Outbox rows archived",
+            extra={
+                "component": "outbox_retention",
+                "archived": total,
+                "created_before": created_before.isoformat(),
+            },
+        )
+
+    return total
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    from app.core.logging import configure_logging
+
+    parser = argparse.ArgumentParser(description="Archive processed event_outbox rows.")
+    parser.add_argument("--retention-days", type=int, default=30)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--max-batches", type=int, default=100)
+    args = parser.parse_args(argv)
+
+    configure_logging()
+    run_outbox_retention(
+        retention_days=args.retention_days,
+        batch_size=args.batch_size,
+        max_batches=args.max_batches,
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,7 +1,12 @@
 import asyncio
 import logging
 import os
+import select
+import signal
+import threading
+import time
 from datetime import datetime, timezone
+from typing import Optional
 
 from sqlalchemy import text
 from sqlalchemy.exc import DBAPIError, OperationalError
@@ -9,13 +14,23 @@ from sqlalchemy.orm import Session
 
 from app.database import SessionLocal
 from app.services.outbox_processor import (
+    OUTBOX_NOTIFY_CHANNEL,
     process_outbox_batch,
+    process_outbox_batch_concurrent,
+    rebalance_outbox_partitions,
+    register_outbox_worker,
     release_outbox_lock,
+    release_outbox_partition_lock,
     try_acquire_outbox_lock,
+    unregister_outbox_worker,
 )
+from app.services.outbox_retention import run_outbox_retention
 
 logger = logging.getLogger(__name__)
 
+# Upper bound on how long a blocked worker thread takes to notice a stop request.
+_STOP_CHECK_SECONDS = 0.25
+
 
 def _env_int(name: str, default: int) -> int:
     v = os.getenv(name)
@@ -37,23 +52,232 @@ def outbox_worker_enabled() -> bool:
     return v.strip() not in {"0", "false", "False", "no", "NO"}
 
 
-async def outbox_worker_loop(*, poll_seconds: float = 1.0, batch_size: int = 50) -> None:
+class AdaptiveBatchController:
+    """
+    Picks the next batch size and how long to wait before the next tick.
+
+    - Full batch: run again immediately. Double the size (up to max_size)
+      while a batch takes at most half of target_seconds.
+    - Batch slower than target_seconds, or a failed tick (lock conflict,
+      serialization failure, ...): halve the size (down to min_size).
+    - Empty tick: the wait doubles from idle_seconds up to max_idle_seconds.
+      NOTIFY still wakes the worker at once, so this only stretches the
+      fallback poll; wake() resets it.
+    """
+
+    def __init__(
+        self,
+        *,
+        batch_size: int = 50,
+        min_size: int = 10,
+        max_size: int = 500,
+        target_seconds: float = 1.0,
+        idle_seconds: float = 1.0,
+        max_idle_seconds: float = 30.0,
+    ) -> None:
+        self.min_size = max(1, int(min_size))
+        self.max_size = max(self.min_size, int(max_size))
+        self.batch_size = min(self.max_size, max(self.min_size, int(batch_size)))
+        self.target_seconds = float(target_seconds)
+        self.idle_seconds = float(idle_seconds)
+        self.max_idle_seconds = max(self.idle_seconds, float(max_idle_seconds))
+        self._idle_wait = self.idle_seconds
+
+    def _shrink(self) -> None:
+        self.batch_size = max(self.min_size, self.batch_size // 2)
+
+    def wake(self) -> None:
+        self._idle_wait = self.idle_seconds
+
+    def record_batch(self, *, claimed: int, elapsed: float) -> float:
+        """Returns the seconds to wait before the next tick (0 = loop now)."""
+        full = int(claimed) >= self.batch_size
+
+        if float(elapsed) > self.target_seconds:
+            self._shrink()
+        elif full and float(elapsed) <= self.target_seconds / 2:
+            self.batch_size = min(self.max_size, self.batch_size * 2)
+
+        if full:
+            self._idle_wait = self.idle_seconds
+            return 0.0
+
+        if int(claimed) > 0:
+            self._idle_wait = self.idle_seconds
+            return self.idle_seconds
+
+        wait = self._idle_wait
+        self._idle_wait = min(self.max_idle_seconds, self._idle_wait * 2)
+        return wait
+
+    def record_failure(self) -> float:
+        self._shrink()
+        wait = self._idle_wait
+        self._idle_wait = min(self.max_idle_seconds, self._idle_wait * 2)
+        return wait
+
+
+class OutboxListener:
+    """
+    Dedicated autocommit connection LISTENing on the outbox channel.
+
+    The connection is detached from the pool so LISTEN state never leaks into
+    request sessions. Any failure closes it; the next wait() reconnects and
+    falls back to a plain sleep until it succeeds, so polling remains the
+    safety net.
+    """
+
+    def __init__(self, engine) -> None:
+        self._engine = engine
+        self._raw = None
+        self._conn = None
+
+    def _open(self) -> None:
+        raw = self._engine.raw_connection()
+        try:
+            conn = raw.driver_connection
+            raw.detach()
+            conn.autocommit = True
+            with conn.cursor() as cur:
+                cur.execute(f"LISTEN {OUTBOX_NOTIFY_CHANNEL}")
+        except Exception:
+            raw.close()
+            raise
+        self._raw = raw
+        self._conn = conn
+
+    def open(self) -> bool:
+        if self._raw is not None:
+            return True
+        try:
+            self._open()
+            return True
+        except Exception:
+            logger.exception(
+                "Outbox listener connect failed; polling only",
+                extra={"component": "outbox_worker", "reason": "listen_connect_error"},
+            )
+            return False
+
+    def close(self) -> None:
+        raw, self._raw, self._conn = self._raw, None, None
+        if raw is not None:
+            try:
+                raw.close()
+            except Exception:
+                pass
+
+    def _drain(self) -> bool:
+        self._conn.poll()
+        notified = bool(self._conn.notifies)
+        self._conn.notifies.clear()
+        return notified
+
+    def wait_blocking(self, timeout: float, stop: Optional[threading.Event] = None) -> bool:
+        """
+        Thread-side wait(): block in select() until a NOTIFY arrives, `timeout`
+        passes or `stop` is set (checked every _STOP_CHECK_SECONDS).
+        """
+        deadline = time.monotonic() + float(timeout)
+
+        if not self.open():
+            if stop is not None:
+                stop.wait(timeout)
+            else:
+                time.sleep(timeout)
+            return False
+
+        try:
+            if self._drain():
+                return True
+
+            fd = self._conn.fileno()
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or (stop is not None and stop.is_set()):
+                    return False
+                readable, _, _ = select.select([fd], [], [], min(remaining, _STOP_CHECK_SECONDS))
+                if readable and self._drain():
+                    return True
+
+        except Exception:
+            logger.exception(
+                "Outbox listener failed; polling only",
+                extra={"component": "outbox_worker", "reason": "listen_error"},
+            )
+            self.close()
+            return False
+
+
+def run_outbox_worker(
+    stop: threading.Event,
+    *,
+    poll_seconds: float = 1.0,
+    batch_size: int = 50,
+    partition_count: int = 1,
+    rebalance_seconds: float = 5.0,
+    retention_days: int = 0,
+    retention_interval_seconds: float = 3600.0,
+    concurrency: int = 1,
+    min_batch_size: Optional[int] = None,
+    max_batch_size: Optional[int] = None,
+    target_batch_seconds: float = 1.0,
+    max_idle_seconds: Optional[float] = None,
+) -> None:
     """
-    Single-worker loop.
+    Blocking outbox worker loop; returns once `stop` is set.
+
+    Runs on a dedicated thread (outbox_worker_loop) or as its own process
+    (python -m app.services.outbox_worker), never on the event loop: every
+    tick is synchronous psycopg2 I/O.
+
+    partition_count <= 1: single worker fleet-wide (global advisory lock).
+    partition_count > 1: every worker runs; each owns a fair share of the
+    company_id % partition_count partitions and rebalances every
+    rebalance_seconds, so throughput scales with replica count.
+
+    retention_days > 0: every retention_interval_seconds, the worker owning
+    the global lock (or partition 0) archives processed rows older than that.
+
+    concurrency > 1: handlers within a batch run on that many threads, one
+    ordering key (company + payroll run / employee) per thread.
+
+    Batch size adapts between min_batch_size and max_batch_size (default:
+    batch_size, i.e. fixed) against target_batch_seconds; full batches loop
+    immediately and idle waits grow up to max_idle_seconds
+    (see AdaptiveBatchController).
 
     Goals:
       - Never crash the server on transient DB failures.
       - Safe under uvicorn --reload (two processes) via PG advisory lock.
       - Recover if Postgres restarts / connections are terminated.
+      - Wake on LISTEN/NOTIFY; poll_seconds is only the fallback interval.
     """
+    partitioned = int(partition_count) > 1
+    controller = AdaptiveBatchController(
+        batch_size=batch_size,
+        min_size=batch_size if min_batch_size is None else min_batch_size,
+        max_size=batch_size if max_batch_size is None else max_batch_size,
+        target_seconds=target_batch_seconds,
+        idle_seconds=poll_seconds,
+        max_idle_seconds=poll_seconds if max_idle_seconds is None else max_idle_seconds,
+    )
+
     logger.info(
         "Outbox worker started",
-        extra={"poll_seconds": float(poll_seconds), "batch_size": int(batch_size)},
+        extra={
+            "poll_seconds": float(poll_seconds),
+            "batch_size": int(batch_size),
+            "partition_count": int(partition_count),
+            "concurrency": int(concurrency),
+        },
     )
 
-    while True:
+    while not stop.is_set():
         lock_db: Session = SessionLocal()
+        listener: OutboxListener | None = None
         have_lock = False
+        owned: set[int] = set()
 
         try:
             # Tag the session so we can terminate ONLY worker connections in Postgres safely.
@@ -62,17 +286,59 @@ async def outbox_worker_loop(*, poll_seconds: float = 1.0, batch_size: int = 50)
             except Exception:
                 pass
 
-            have_lock = try_acquire_outbox_lock(lock_db)
+            if partitioned:
+                register_outbox_worker(lock_db)
+                have_lock = True
+            else:
+                have_lock = try_acquire_outbox_lock(lock_db)
+
             if not have_lock:
                 try:
                     lock_db.close()
                 finally:
-                    await asyncio.sleep(poll_seconds)
+                    stop.wait(poll_seconds)
                 continue
 
-            # We hold the advisory lock as long as lock_db connection stays healthy.
-            while True:
+            # LISTEN before the first tick so no commit between tick and wait is missed.
+            listener = OutboxListener(lock_db.get_bind())
+            listener.open()
+
+            # We hold the advisory lock(s) as long as lock_db connection stays healthy.
+            next_rebalance = 0.0
+            next_retention = 0.0
+            while not stop.is_set():
+                if partitioned and time.monotonic() >= next_rebalance:
+                    before = owned
+                    owned = rebalance_outbox_partitions(
+                        lock_db, owned=owned, partition_count=partition_count
+                    )
+                    next_rebalance = time.monotonic() + float(rebalance_seconds)
+                    if owned != before:
+                        logger.info(
+                            "Outbox worker partitions rebalanced",
+                            extra={"component": "outbox_worker", "partitions": sorted(owned)},
+                        )
+
+                if (
+                    int(retention_days) > 0
+                    and time.monotonic() >= next_retention
+                    and (not partitioned or 0 in owned)
+                ):
+                    next_retention = time.monotonic() + float(retention_interval_seconds)
+                    try:
+                        run_outbox_retention(retention_days=int(retention_days))
+                    except Exception:
+                        logger.exception(
+                            "Outbox retention failed",
+                            extra={"component": "outbox_worker", "reason": "retention_error"},
+                        )
+
+                if partitioned and not owned:
+                    listener.wait_blocking(poll_seconds, stop)
+                    continue
+
                 work_db: Session = SessionLocal()
+                delay = poll_seconds
                 try:
                     try:
                         work_db.execute(text("set application_name = 'frontier_outbox_worker_tick'"))
@@ -80,14 +346,30 @@ async def outbox_worker_loop(*, poll_seconds: float = 1.0, batch_size: int = 50)
                         pass
 
                     now = datetime.now(timezone.utc)
-                    process_outbox_batch(db=work_db, now=now, batch_size=batch_size)
+                    started = time.monotonic()
+                    if int(concurrency) > 1:
+                        result = process_outbox_batch_concurrent(
+                            now=now,
+                            batch_size=controller.batch_size,
+                            partitions=sorted(owned) if partitioned else None,
+                            partition_count=partition_count,
+                            max_workers=concurrency,
+                        )
+                    else:
+                        result = process_outbox_batch(
+                            db=work_db,
+                            now=now,
+                            batch_size=controller.batch_size,
+                            partitions=sorted(owned) if partitioned else None,
+                            partition_count=partition_count,
+                        )
                     work_db.commit()
-
-                except asyncio.CancelledError:
-                    raise
+                    delay = controller.record_batch(
+                        claimed=result.claimed, elapsed=time.monotonic() - started
+                    )
 
                 except (OperationalError, DBAPIError):
-                    # Postgres restarted / connection killed.
+                    # Postgres restarted / connection killed / lock conflict.
                     try:
                         work_db.rollback()
                     except Exception:
@@ -103,9 +385,13 @@ async def outbox_worker_loop(*, poll_seconds: float = 1.0, batch_size: int = 50)
 
                     logger.exception(
                         "Outbox worker tick failed",
-                        extra={"component": "outbox_worker", "reason": "dbapi_error"},
+                        extra={
+                            "component": "outbox_worker",
+                            "reason": "dbapi_error",
+                            "batch_size": controller.batch_size,
+                        },
                     )
-                    await asyncio.sleep(poll_seconds)
+                    delay = controller.record_failure()
 
                 except Exception:
                     try:
@@ -117,7 +403,7 @@ async def outbox_worker_loop(*, poll_seconds: float = 1.0, batch_size: int = 50)
                         "Outbox worker tick failed",
                         extra={"component": "outbox_worker", "reason": "unexpected"},
                     )
-                    await asyncio.sleep(poll_seconds)
+                    delay = controller.record_failure()
 
                 finally:
                     try:
@@ -125,11 +411,12 @@ async def outbox_worker_loop(*, poll_seconds: float = 1.0, batch_size: int = 50)
                     except Exception:
                         pass
 
-                await asyncio.sleep(poll_seconds)
+                if delay <= 0:
+                    # More rows are waiting; go again.
+                    continue
 
-        except asyncio.CancelledError:
-            logger.info("Outbox worker cancelled; shutting down")
-            raise
+                if listener.wait_blocking(delay, stop):
+                    controller.wake()
 
         except (OperationalError, DBAPIError):
             # lock connection died; drop pooled conns and restart outer loop.
@@ -143,7 +430,7 @@ async def outbox_worker_loop(*, poll_seconds: float = 1.0, batch_size: int = 50)
                     engine.dispose()
             except Exception:
                 pass
-            await asyncio.sleep(poll_seconds)
+            stop.wait(poll_seconds)
 
         except Exception:
             # Do NOT crash the server; log and keep trying.
@@ -151,11 +438,17 @@ async def outbox_worker_loop(*, poll_seconds: float = 1.0, batch_size: int = 50)
                 "Outbox worker crashed",
                 extra={"component": "outbox_worker", "reason": "outer_unexpected"},
             )
-            await asyncio.sleep(poll_seconds)
+            stop.wait(poll_seconds)
 
         finally:
+            if listener is not None:
+                listener.close()
             try:
-                if have_lock:
+                if have_lock and partitioned:
+                    for partition in owned:
+                        release_outbox_partition_lock(lock_db, partition)
+                    unregister_outbox_worker(lock_db)
+                elif have_lock:
                     release_outbox_lock(lock_db)
             except Exception:
                 pass
@@ -164,12 +457,90 @@ async def outbox_worker_loop(*, poll_seconds: float = 1.0, batch_size: int = 50)
             except Exception:
                 pass
 
+    logger.info("Outbox worker stopped", extra={"component": "outbox_worker"})
+
+
+async def outbox_worker_loop(*, shutdown_timeout: float = 30.0, **settings) -> None:
+    """
+    In-app supervisor: runs run_outbox_worker(**settings) on a daemon thread
+    so batch I/O never blocks the event loop, restarts it if it dies, and on
+    cancellation signals it to stop and waits up to shutdown_timeout seconds
+    for the current tick to finish.
+    """
+    stop = threading.Event()
+    thread: threading.Thread | None = None
+
+    try:
+        while True:
+            if thread is None or not thread.is_alive():
+                if thread is not None:
+                    logger.error(
+                        "Outbox worker thread exited; restarting",
+                        extra={"component": "outbox_worker", "reason": "thread_exit"},
+                    )
+                thread = threading.Thread(
+                    target=run_outbox_worker,
+                    args=(stop,),
+                    kwargs=settings,
+                    name="outbox-worker",
+                    daemon=True,
+                )
+                thread.start()
+
+            await asyncio.sleep(1.0)
+
+    except asyncio.CancelledError:
+        logger.info("Outbox worker cancelled; shutting down")
+        stop.set()
+        if thread is not None:
+            await asyncio.to_thread(thread.join, shutdown_timeout)
+        raise
+
+
+def outbox_worker_settings_from_env() -> dict:
+    poll_seconds = float(os.getenv("OUTBOX_POLL_SECONDS", "1.0"))
+    batch_size = _env_int("OUTBOX_BATCH_SIZE", 50)
+    return {
+        "poll_seconds": poll_seconds,
+        "batch_size": batch_size,
+        "partition_count": _env_int("OUTBOX_PARTITIONS", 1),
+        "rebalance_seconds": float(os.getenv("OUTBOX_REBALANCE_SECONDS", "5.0")),
+        "retention_days": _env_int("OUTBOX_RETENTION_DAYS", 30),
+        "retention_interval_seconds": float(os.getenv("OUTBOX_RETENTION_INTERVAL_SECONDS", "3600")),
+        "concurrency": _env_int("OUTBOX_CONCURRENCY", 1),
+        "min_batch_size": _env_int("OUTBOX_BATCH_SIZE_MIN", min(batch_size, 10)),
+        "max_batch_size": _env_int("OUTBOX_BATCH_SIZE_MAX", max(batch_size, 500)),
+        "target_batch_seconds": float(os.getenv("OUTBOX_TARGET_BATCH_SECONDS", "1.0")),
+        "max_idle_seconds": float(os.getenv("OUTBOX_MAX_IDLE_SECONDS", "30")),
+    }
+
 
 def start_outbox_worker_task() -> asyncio.Task | None:
     if not outbox_worker_enabled():
         logger.info("Outbox worker disabled")
         return None
 
-    poll_seconds = float(os.getenv("OUTBOX_POLL_SECONDS", "1.0"))
-    batch_size = _env_int("OUTBOX_BATCH_SIZE", 50)
-    return asyncio.create_task(outbox_worker_loop(poll_seconds=poll_seconds, batch_size=batch_size))
+    return asyncio.create_task(outbox_worker_loop(**outbox_worker_settings_from_env()))
+
+
+def main() -> int:
+    """Standalone worker process: python -m app.services.outbox_worker."""
+    from app.core.logging import configure_logging
+
+    configure_logging()
+
+    stop = threading.Event()
+
+    def _request_stop(signum, _frame) -> None:
+        logger.info("Outbox worker received signal", extra={"component": "outbox_worker", "signal": signum})
+        stop.set()
+
+    signal.signal(signal.SIGTERM, _request_stop)
+    signal.signal(signal.SIGINT, _request_stop)
+
+    run_outbox_worker(stop, **outbox_worker_settings_from_env())
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,40 @@
+from typing import Iterator, Sequence
+
+from sqlalchemy import select
+from sqlalchemy.engine import Row
+from sqlalchemy.orm import Session
+
+from app.models.payroll_item import PayrollItem
+
+# Rows fetched per round trip from the server-side cursor.
+DEFAULT_CHUNK_SIZE = 1000
+
+
+def iter_payroll_item_chunks(
+    db: Session,
+    *,
+    company_id: int,
+    payroll_run_id: str,
+    columns: Sequence,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> Iterator[list[Row]]:
+    """
+    Yield a payroll run's items in id order as lists of at most chunk_size
+    column rows (no ORM objects).
+
+    Uses a server-side cursor (yield_per => stream_results), so memory stays
+    flat however many items the run has. The cursor lives in the caller's
+    transaction; consume or close the iterator before committing.
+    """
+    result = db.execute(
+        select(*columns)
+        .where(PayrollItem.company_id == int(company_id))
+        .where(PayrollItem.payroll_run_id == str(payroll_run_id))
+        .order_by(PayrollItem.id.asc())
+        .execution_options(yield_per=int(chunk_size))
+    )
+    try:
+        for chunk in result.partitions():
+            yield list(chunk)
+    finally:
+        result.close()
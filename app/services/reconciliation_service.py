@@ -2,9 +2,33 @@ from sqlalchemy.orm import Session
 from sqlalchemy import func
 
 from app.models.payroll_item import PayrollItem
+from app.models.payroll_run_reconciliation import PayrollRunReconciliation
 from app.models.job_cost_ledger import JobCostLedger
 
 
+def _payroll_total(*, company_id: int, payroll_run_id: str, db: Session) -> int:
+    """Live SUM over payroll_items (ix_payroll_items_company_run)."""
+    total = (
+        db.query(func.coalesce(func.sum(PayrollItem.gross_pay_cents), 0))
+        .filter(PayrollItem.company_id == int(company_id))
+        .filter(PayrollItem.payroll_run_id == str(payroll_run_id))
+        .scalar()
+    )
+    return int(total or 0)
+
+
+def _ledger_total(*, company_id: int, payroll_run_id: str, db: Session) -> int:
+    """Full re-aggregation; only used for runs that have never been posted."""
+    total = (
+        db.query(func.coalesce(func.sum(JobCostLedger.total_cost_cents), 0))
+        .filter(JobCostLedger.company_id == int(company_id))
+        .filter(JobCostLedger.payroll_run_id == str(payroll_run_id))
+        .filter(JobCostLedger.source_type == "payroll_run_labor")
+        .scalar()
+    )
+    return int(total or 0)
+
+
 def reconcile_payroll_run_labor(
     *, company_id: int, payroll_run_id: str, db: Session
 ) -> dict:
@@ -14,25 +38,26 @@ def reconcile_payroll_run_labor(
     ==
     SUM(job_cost_ledger.total_cost_cents)
     for payroll_run_labor entries.
-    """
 
-    payroll_total = (
-        db.query(func.coalesce(func.sum(PayrollItem.gross_pay_cents), 0))
-        .filter(PayrollItem.company_id == int(company_id))
-        .filter(PayrollItem.payroll_run_id == str(payroll_run_id))
-        .scalar()
-    )
+    The payroll side is always summed live, since payroll items can still be
+    edited after a run is posted. The ledger side comes from
+    payroll_run_reconciliation when present: payroll_run_labor rows are
+    append-only and only written by post_labor_costs, which keeps that total
+    current in the same transaction.
+    """
 
-    ledger_total = (
-        db.query(func.coalesce(func.sum(JobCostLedger.total_cost_cents), 0))
-        .filter(JobCostLedger.company_id == int(company_id))
-        .filter(JobCostLedger.source_type == "payroll_run_labor")
-        .filter(JobCostLedger.source_reference_id.like(f"{payroll_run_id}:%"))
+    ledger_summary = (
+        db.query(PayrollRunReconciliation.ledger_total_cents)
+        .filter(PayrollRunReconciliation.payroll_run_id == str(payroll_run_id))
+        .filter(PayrollRunReconciliation.company_id == int(company_id))
         .scalar()
     )
 
-    payroll_total = int(payroll_total or 0)
-    ledger_total = int(ledger_total or 0)
+    payroll_total = _payroll_total(company_id=company_id, payroll_run_id=payroll_run_id, db=db)
+    if ledger_summary is not None:
+        ledger_total = int(ledger_summary)
+    else:
+        ledger_total = _ledger_total(company_id=company_id, payroll_run_id=payroll_run_id, db=db)
 
     if payroll_total != ledger_total:
         raise ValueError(
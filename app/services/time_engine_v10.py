@@ -1,26 +1,79 @@
+from dataclasses import dataclass
 from datetime import datetime
-from typing import Optional
+from typing import Optional, Sequence
 from uuid import uuid4
 
+from sqlalchemy import select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
+from app.core.timestamps import as_naive_utc
 from app.database import SessionLocal
+from app.models.employee import Employee
+from app.models.event_outbox import EventOutbox
 from app.models.time_entry import TimeEntry
 
+# Per-employee outcomes of the crew (batch) operations.
+CLOCKED_IN = "clocked_in"
+CLOCKED_OUT = "clocked_out"
+ALREADY_ACTIVE = "already_active"
+NO_ACTIVE_ENTRY = "no_active_entry"
+UNKNOWN_EMPLOYEE = "unknown_employee"
 
-def _get_active_entry(
-    db: Session,
+
+@dataclass(frozen=True)
+class BatchOutcome:
+    employee_id: int
+    result: str
+    entry: Optional[TimeEntry] = None
+
+
+def _active_entry_row(
     company_id: int,
     employee_id: int,
-) -> Optional[TimeEntry]:
+    job_id: int,
+    scope_id: int,
+    started_at: datetime,
+) -> dict:
+    return {
+        "time_entry_id": str(uuid4()),
+        "company_id": int(company_id),
+        "employee_id": int(employee_id),
+        "job_id": int(job_id),
+        "scope_id": int(scope_id),
+        "started_at": started_at,
+        "ended_at": None,
+        "status": "active",
+    }
+
+
+def _insert_active_entry_stmt(rows: list[dict]):
+    # A conflict on uq_time_entries_active means the employee is already
+    # clocked in; those rows are simply not returned.
     return (
-        db.query(TimeEntry)
-        .filter(
-            TimeEntry.company_id == company_id,
-            TimeEntry.employee_id == employee_id,
+        pg_insert(TimeEntry)
+        .values(rows)
+        .on_conflict_do_nothing(
+            index_elements=[TimeEntry.company_id, TimeEntry.employee_id],
+            index_where=TimeEntry.status == "active",
+        )
+        .returning(TimeEntry)
+    )
+
+
+def _complete_active_entries_stmt(company_id: int, employee_ids: list[int], ended_at: datetime):
+    return (
+        update(TimeEntry)
+        .where(
+            TimeEntry.company_id == int(company_id),
+            TimeEntry.employee_id.in_(employee_ids),
             TimeEntry.status == "active",
         )
-        .first()
+        .values(ended_at=ended_at, status="completed")
+        .returning(TimeEntry)
+        # Entries already in the session take the returned values.
+        .execution_options(synchronize_session=False, populate_existing=True)
     )
 
 
@@ -42,25 +95,13 @@ def clock_in(
         db = SessionLocal()
 
     try:
-        active_entry = _get_active_entry(db, company_id, employee_id)
-        if active_entry is not None:
+        # Single round trip: the entry comes back from INSERT ... RETURNING.
+        time_entry = db.scalars(
+            _insert_active_entry_stmt([_active_entry_row(company_id, employee_id, job_id, scope_id, started_at)])
+        ).first()
+        if time_entry is None:
             raise ValueError("Active time entry already exists for employee in company")
 
-        time_entry = TimeEntry(
-            time_entry_id=str(uuid4()),
-            company_id=company_id,
-            employee_id=employee_id,
-            job_id=job_id,
-            scope_id=scope_id,
-            started_at=started_at,
-            ended_at=None,
-            status="active",
-        )
-
-        db.add(time_entry)
-        db.flush()
-        db.refresh(time_entry)
-
         if owns_db:
             db.commit()
 
@@ -90,16 +131,11 @@ def clock_out(
         db = SessionLocal()
 
     try:
-        active_entry = _get_active_entry(db, company_id, employee_id)
+        # Single round trip: the completed entry comes back from UPDATE ... RETURNING.
+        active_entry = db.scalars(_complete_active_entries_stmt(company_id, [employee_id], ended_at)).first()
         if active_entry is None:
             raise ValueError("No active time entry found for employee in company")
 
-        active_entry.ended_at = ended_at
-        active_entry.status = "completed"
-
-        db.flush()
-        db.refresh(active_entry)
-
         if owns_db:
             db.commit()
 
@@ -111,3 +147,155 @@ def clock_out(
     finally:
         if owns_db:
             db.close()
+
+
+async def clock_in_async(
+    company_id: int,
+    employee_id: int,
+    job_id: int,
+    scope_id: int,
+    started_at: datetime,
+    *,
+    db: AsyncSession,
+) -> TimeEntry:
+    """
+    clock_in for AsyncSession callers: the same single INSERT ... RETURNING.
+
+    DO NOT commit here (caller owns transaction boundaries).
+    """
+    row = _active_entry_row(company_id, employee_id, job_id, scope_id, as_naive_utc(started_at))
+    time_entry = (await db.scalars(_insert_active_entry_stmt([row]))).first()
+    if time_entry is None:
+        raise ValueError("Active time entry already exists for employee in company")
+    return time_entry
+
+
+async def clock_out_async(
+    company_id: int,
+    employee_id: int,
+    ended_at: datetime,
+    *,
+    db: AsyncSession,
+) -> TimeEntry:
+    """
+    clock_out for AsyncSession callers: the same single UPDATE ... RETURNING.
+
+    DO NOT commit here (caller owns transaction boundaries).
+    """
+    stmt = _complete_active_entries_stmt(company_id, [int(employee_id)], as_naive_utc(ended_at))
+    active_entry = (await db.scalars(stmt)).first()
+    if active_entry is None:
+        raise ValueError("No active time entry found for employee in company")
+    return active_entry
+
+
+def clock_out_outbox_event(company_id: int, entry: TimeEntry) -> dict:
+    """Column values for the TIME_ENTRY_CLOCKED_OUT outbox row of a completed entry."""
+    return {
+        "company_id": int(company_id),
+        "event_type": "TIME_ENTRY_CLOCKED_OUT",
+        "idempotency_key": f"time_entry:{entry.time_entry_id}:clock_out",
+        "payload": {
+            "time_entry_id": entry.time_entry_id,
+            "employee_id": entry.employee_id,
+            "job_id": entry.job_id,
+            "scope_id": entry.scope_id,
+            "started_at": entry.started_at.isoformat() if entry.started_at else None,
+            "ended_at": entry.ended_at.isoformat() if entry.ended_at else None,
+            "status": entry.status,
+        },
+    }
+
+
+def _unique_ids(employee_ids: Sequence[int]) -> list[int]:
+    return list(dict.fromkeys(int(e) for e in employee_ids))
+
+
+def clock_in_batch(
+    company_id: int,
+    employee_ids: Sequence[int],
+    job_id: int,
+    scope_id: int,
+    started_at: datetime,
+    *,
+    db: Session,
+) -> list[BatchOutcome]:
+    """
+    Clock a crew in to one job/scope. One query finds the company's employees
+    among employee_ids and their active entries; one INSERT ... ON CONFLICT on
+    uq_time_entries_active creates the rest (a concurrent single clock-in
+    surfaces as already_active rather than an error). Outcomes follow the
+    order of employee_ids, duplicates collapsed.
+
+    DO NOT commit here (caller owns transaction boundaries).
+    """
+    ids = _unique_ids(employee_ids)
+
+    known = db.execute(
+        select(Employee.id, TimeEntry.time_entry_id)
+        .outerjoin(
+            TimeEntry,
+            (TimeEntry.company_id == Employee.company_id)
+            & (TimeEntry.employee_id == Employee.id)
+            & (TimeEntry.status == "active"),
+        )
+        .where(Employee.company_id == int(company_id), Employee.id.in_(ids))
+    ).all()
+    active = {int(emp_id) for emp_id, entry_id in known if entry_id is not None}
+    to_insert = [int(emp_id) for emp_id, entry_id in known if entry_id is None]
+
+    created: dict[int, TimeEntry] = {}
+    if to_insert:
+        stmt = _insert_active_entry_stmt(
+            [
+                _active_entry_row(company_id, emp_id, job_id, scope_id, started_at)
+                for emp_id in sorted(to_insert)
+            ]
+        )
+        created = {e.employee_id: e for e in db.scalars(stmt)}
+        active.update(set(to_insert) - set(created))
+
+    outcomes = []
+    for emp_id in ids:
+        if emp_id in created:
+            outcomes.append(BatchOutcome(emp_id, CLOCKED_IN, created[emp_id]))
+        elif emp_id in active:
+            outcomes.append(BatchOutcome(emp_id, ALREADY_ACTIVE))
+        else:
+            outcomes.append(BatchOutcome(emp_id, UNKNOWN_EMPLOYEE))
+    return outcomes
+
+
+def clock_out_batch(
+    company_id: int,
+    employee_ids: Sequence[int],
+    ended_at: datetime,
+    *,
+    db: Session,
+) -> list[BatchOutcome]:
+    """
+    Clock a crew out: one UPDATE ... RETURNING completes every active entry
+    among employee_ids and one INSERT writes their TIME_ENTRY_CLOCKED_OUT
+    outbox rows, so entries and events commit together. Outcomes follow the
+    order of employee_ids, duplicates collapsed.
+
+    DO NOT commit here (caller owns transaction boundaries).
+    """
+    ids = _unique_ids(employee_ids)
+
+    stmt = _complete_active_entries_stmt(company_id, ids, ended_at)
+    completed = {e.employee_id: e for e in db.scalars(stmt)}
+
+    if completed:
+        db.execute(
+            pg_insert(EventOutbox).values(
+                [clock_out_outbox_event(company_id, completed[emp_id]) for emp_id in sorted(completed)]
+            )
+        )
+
+    return [
+        BatchOutcome(emp_id, CLOCKED_OUT, completed[emp_id])
+        if emp_id in completed
+        else BatchOutcome(emp_id, NO_ACTIVE_ENTRY)
+        for emp_id in ids
+    ]
@@ -0,0 +1,440 @@
+import argparse
+import codecs
+import csv
+import io
+import json
+import logging
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import IO, Any, Callable, Iterable, Iterator, Literal, Optional
+from uuid import uuid4
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.core.timestamps import as_naive_utc
+from app.database import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+ImportFormat = Literal["csv", "ndjson"]
+
+IMPORT_CHUNK_SIZE = 5000
+MAX_REPORTED_ERRORS = 1000
+
+# Bounds of the Postgres integer columns the ids are copied into.
+_INT32_MIN = -(2**31)
+_INT32_MAX = 2**31 - 1
+
+_INVALID_UTF8 = "line is not valid UTF-8"
+
+# Serializes imports per company so the overlap checks below see every row
+# committed by a concurrent import (two-int advisory key, like the outbox locks).
+_IMPORT_LOCK_KEY = 4246
+
+_STAGING_COLUMNS = ("line_no", "time_entry_id", "employee_id", "job_id", "scope_id", "started_at", "ended_at")
+
+_CREATE_STAGING_SQL = text(
+    """
+    CREATE TEMP TABLE time_entry_import_staging (
+        line_no integer PRIMARY KEY,
+        time_entry_id varchar NOT NULL,
+        employee_id integer NOT NULL,
+        job_id integer NOT NULL,
+        scope_id integer NOT NULL,
+        started_at timestamp NOT NULL,
+        ended_at timestamp NOT NULL
+    ) ON COMMIT DROP
+    """
+)
+
+# Checks run in passes so a row rejected for its own data never causes a
+# later line to be rejected as its duplicate or overlap:
+#   1. row_checks: per-row checks against the database; the first failing
+#      check names the reason.
+#   2. unique_ids: duplicate time_entry_id among rows that passed 1.
+#   3. overlap check among rows that passed 2.
+# Rows whose time_entry_id already exists for this company are left in place
+# and take no part in the in-file passes; the insert skips them (ON CONFLICT),
+# which makes re-running an import safe. An existing active entry counts as
+# open-ended, so an import can never land inside (or after the start of) an
+# employee's current shift.
+_REJECT_SQL = text(
+    """
+    WITH row_checks AS (
+        SELECT s.line_no, s.time_entry_id, s.employee_id, s.started_at, s.ended_at,
+               CASE
+                   WHEN NOT EXISTS (
+                       SELECT 1 FROM employees e
+                       WHERE e.id = s.employee_id AND e.company_id = :company_id
+                   ) THEN 'unknown employee_id'
+                   WHEN NOT EXISTS (
+                       SELECT 1 FROM jobs j
+                       WHERE j.id = s.job_id AND j.company_id = :company_id
+                   ) THEN 'unknown job_id'
+                   WHEN NOT EXISTS (
+                       SELECT 1 FROM scopes sc
+                       WHERE sc.id = s.scope_id AND sc.company_id = :company_id AND sc.job_id = s.job_id
+                   ) THEN 'unknown scope_id for job'
+                   WHEN EXISTS (
+                       SELECT 1 FROM time_entries t
+                       WHERE t.time_entry_id = s.time_entry_id
+                   ) THEN (
+                       SELECT CASE WHEN t.company_id = :company_id THEN NULL
+                                   ELSE 'time_entry_id already in use' END
+                       FROM time_entries t
+                       WHERE t.time_entry_id = s.time_entry_id
+                   )
+                   WHEN EXISTS (
+                       SELECT 1 FROM time_entries t
+                       WHERE t.company_id = :company_id
+                         AND t.employee_id = s.employee_id
+                         AND t.started_at < s.ended_at
+                         AND COALESCE(t.ended_at, 'infinity'::timestamp) > s.started_at
+                   ) THEN 'overlaps an existing time entry'
+               END AS reason,
+               EXISTS (
+                   SELECT 1 FROM time_entries t WHERE t.time_entry_id = s.time_entry_id
+               ) AS already_imported
+        FROM time_entry_import_staging s
+    ),
+    new_rows AS (
+        SELECT * FROM row_checks WHERE reason IS NULL AND NOT already_imported
+    ),
+    unique_ids AS (
+        SELECT n.*,
+               EXISTS (
+                   SELECT 1 FROM new_rows d
+                   WHERE d.time_entry_id = n.time_entry_id AND d.line_no < n.line_no
+               ) AS duplicate
+        FROM new_rows n
+    ),
+    checked AS (
+        SELECT line_no, reason FROM row_checks WHERE reason IS NOT NULL
+        UNION ALL
+        SELECT line_no, 'duplicate time_entry_id in file' FROM unique_ids WHERE duplicate
+        UNION ALL
+        SELECT u.line_no, 'overlaps another entry in the file'
+        FROM unique_ids u
+        WHERE NOT u.duplicate
+          AND EXISTS (
+              SELECT 1 FROM unique_ids o
+              WHERE NOT o.duplicate
+                AND o.employee_id = u.employee_id
+                AND o.line_no < u.line_no
+                AND o.started_at < u.ended_at
+                AND o.ended_at > u.started_at
+          )
+    )
+    DELETE FROM time_entry_import_staging s
+    USING checked c
+    WHERE s.line_no = c.line_no
+    RETURNING s.line_no, c.reason
+    """
+)
+
+_MERGE_SQL = text(
+    """
+    INSERT INTO time_entries (
+        time_entry_id, company_id, employee_id, job_id, scope_id,
+        started_at, ended_at, status
+    )
+    SELECT time_entry_id, :company_id, employee_id, job_id, scope_id,
+           started_at, ended_at, 'completed'
+    FROM time_entry_import_staging
+    ORDER BY line_no
+    ON CONFLICT (time_entry_id) DO NOTHING
+    """
+)
+
+
+@dataclass(frozen=True)
+class ImportRowError:
+    line: int
+    error: str
+
+
+@dataclass
+class TimeEntryImportResult:
+    rows: int = 0
+    imported: int = 0
+    skipped: int = 0
+    error_count: int = 0
+    errors: list[ImportRowError] = field(default_factory=list)
+
+    def add_error(self, line: int, error: str) -> None:
+        self.error_count += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append(ImportRowError(line=int(line), error=error))
+
+
+ProgressCallback = Callable[[TimeEntryImportResult], None]
+
+
+def _parse_record(record: dict[str, Any]) -> tuple:
+    """Validate one input record; raises ValueError with a row-level message."""
+
+    def _int(name: str) -> int:
+        raw = record.get(name)
+        if raw is None or str(raw).strip() == "":
+            raise ValueError(f"{name} is required")
+        try:
+            value = int(str(raw).strip())
+        except ValueError:
+            raise ValueError(f"{name} must be an integer") from None
+        if not _INT32_MIN <= value <= _INT32_MAX:
+            raise ValueError(f"{name} is out of range")
+        return value
+
+    def _dt(name: str) -> datetime:
+        raw = record.get(name)
+        if raw is None or str(raw).strip() == "":
+            raise ValueError(f"{name} is required")
+        try:
+            return as_naive_utc(datetime.fromisoformat(str(raw).strip()))
+        except ValueError:
+            raise ValueError(f"{name} must be an ISO 8601 timestamp") from None
+        except OverflowError:
+            # e.g. 0001-01-01T00:00:00+05:00 has no UTC equivalent.
+            raise ValueError(f"{name} is out of range") from None
+
+    employee_id = _int("employee_id")
+    job_id = _int("job_id")
+    scope_id = _int("scope_id")
+    started_at = _dt("started_at")
+    ended_at = _dt("ended_at")
+    if ended_at <= started_at:
+        raise ValueError("ended_at must be after started_at")
+
+    time_entry_id = str(record.get("time_entry_id") or "").strip() or str(uuid4())
+    if "\x00" in time_entry_id:
+        raise ValueError("time_entry_id must not contain NUL characters")
+    return time_entry_id, employee_id, job_id, scope_id, started_at, ended_at
+
+
+def _decoded_lines(stream: IO[bytes], bad_lines: list[int]) -> Iterator[str]:
+    """
+    Decode the stream line by line. A line that is not valid UTF-8 is noted in
+    bad_lines and still yielded (with replacement characters) so the parser
+    stays in step and the error lands on that line's record.
+    """
+    for line_no, raw in enumerate(stream, start=1):
+        if line_no == 1 and raw.startswith(codecs.BOM_UTF8):
+            raw = raw[len(codecs.BOM_UTF8):]
+        try:
+            yield raw.decode("utf-8")
+        except UnicodeDecodeError:
+            bad_lines.append(line_no)
+            yield raw.decode("utf-8", errors="replace")
+
+
+def iter_import_records(stream: IO[bytes], fmt: ImportFormat) -> Iterator[tuple[int, Any]]:
+    """
+    Yield (line number, record) from a CSV (header row required) or NDJSON
+    byte stream. A record is a dict, or an Exception for a line that could
+    not be decoded.
+    """
+    bad_lines: list[int] = []
+    lines = _decoded_lines(stream, bad_lines)
+
+    if fmt == "csv":
+        rows = csv.DictReader(lines)
+        try:
+            rows.fieldnames
+        except csv.Error as exc:
+            yield rows.line_num, ValueError(f"invalid CSV: {exc}")
+            return
+        if bad_lines:
+            yield rows.line_num, ValueError(_INVALID_UTF8)
+            return
+        while True:
+            try:
+                row = next(rows)
+            except StopIteration:
+                return
+            except csv.Error as exc:
+                bad_lines.clear()
+                yield rows.line_num, ValueError(f"invalid CSV: {exc}")
+                continue
+            if bad_lines:
+                # Any bad line read so far belongs to this record.
+                bad_lines.clear()
+                yield rows.line_num, ValueError(_INVALID_UTF8)
+                continue
+            yield rows.line_num, row
+    else:
+        for line_no, line in enumerate(lines, start=1):
+            if bad_lines:
+                bad_lines.clear()
+                yield line_no, ValueError(_INVALID_UTF8)
+                continue
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError as exc:
+                yield line_no, ValueError(f"invalid JSON: {exc.msg}")
+                continue
+            if not isinstance(record, dict):
+                yield line_no, ValueError("expected a JSON object")
+                continue
+            yield line_no, record
+
+
+def _copy_rows(db: Session, rows: list[tuple]) -> None:
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    for line_no, (time_entry_id, employee_id, job_id, scope_id, started_at, ended_at) in rows:
+        writer.writerow(
+            (line_no, time_entry_id, employee_id, job_id, scope_id, started_at.isoformat(), ended_at.isoformat())
+        )
+    buf.seek(0)
+
+    cursor = db.connection().connection.cursor()
+    try:
+        cursor.copy_expert(
+            f"COPY time_entry_import_staging ({', '.join(_STAGING_COLUMNS)}) FROM STDIN WITH (FORMAT csv)",
+            buf,
+        )
+    finally:
+        cursor.close()
+
+
+def import_time_entry_chunk(
+    db: Session,
+    *,
+    company_id: int,
+    rows: list[tuple],
+    result: TimeEntryImportResult,
+) -> None:
+    """
+    COPY one chunk of validated (line_no, row) pairs into a temp staging
+    table, reject rows that fail the set-based checks and merge the rest into
+    time_entries as completed entries. Counters and errors go into result.
+
+    DO NOT commit here (caller owns transaction boundaries).
+    """
+    if not rows:
+        return
+
+    db.execute(
+        text("SELECT pg_advisory_xact_lock(:key, :company_id)"),
+        {"key": _IMPORT_LOCK_KEY, "company_id": int(company_id)},
+    )
+    db.execute(_CREATE_STAGING_SQL)
+    _copy_rows(db, rows)
+
+    rejected = db.execute(_REJECT_SQL, {"company_id": int(company_id)}).all()
+    for line_no, reason in sorted(rejected):
+        result.add_error(line_no, reason)
+
+    inserted = int(db.execute(_MERGE_SQL, {"company_id": int(company_id)}).rowcount or 0)
+    result.imported += inserted
+    result.skipped += len(rows) - len(rejected) - inserted
+
+
+def import_time_entries(
+    records: Iterable[tuple[int, Any]],
+    *,
+    company_id: int,
+    chunk_size: int = IMPORT_CHUNK_SIZE,
+    on_progress: Optional[ProgressCallback] = None,
+) -> TimeEntryImportResult:
+    """
+    Bulk-load completed time entries for one company.
+
+    Records are validated in Python, then loaded chunk by chunk, each chunk in
+    its own committed transaction, so a large backfill never holds one long
+    transaction and a failed run can simply be re-run: rows whose
+    time_entry_id is already present are counted as skipped. on_progress is
+    called with the running result after every chunk.
+    """
+    result = TimeEntryImportResult()
+    pending: list[tuple] = []
+
+    def _flush() -> None:
+        db = SessionLocal()
+        try:
+            import_time_entry_chunk(db, company_id=company_id, rows=pending, result=result)
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+        pending.clear()
+        if on_progress is not None:
+            on_progress(result)
+
+    for line_no, record in records:
+        result.rows += 1
+        try:
+            if isinstance(record, Exception):
+                raise record
+            pending.append((line_no, _parse_record(record)))
+        except ValueError as exc:
+            result.add_error(line_no, str(exc))
+            continue
+        if len(pending) >= int(chunk_size):
+            _flush()
+
+    if pending:
+        _flush()
+
+    logger.info(
+        "Time entries imported",
+        extra={
+            "component": "time_entry_import",
+            "company_id": int(company_id),
+            "rows": result.rows,
+            "imported": result.imported,
+            "skipped": result.skipped,
+            "errors": result.error_count,
+        },
+    )
+    return result
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    from app.core.logging import configure_logging
+
+    parser = argparse.ArgumentParser(description="Bulk import completed time entries from CSV or NDJSON.")
+    parser.add_argument("path")
+    parser.add_argument("--company-id", type=int, required=True)
+    parser.add_argument("--format", choices=("csv", "ndjson"), default=None)
+    parser.add_argument("--chunk-size", type=int, default=IMPORT_CHUNK_SIZE)
+    args = parser.parse_args(argv)
+
+    configure_logging()
+    fmt = args.format or ("ndjson" if args.path.endswith((".ndjson", ".jsonl")) else "csv")
+
+    def _progress(result: TimeEntryImportResult) -> None:
+        logger.info(
+            "Time entry import progress",
+            extra={
+                "component": "time_entry_import",
+                "rows": result.rows,
+                "imported": result.imported,
+                "skipped": result.skipped,
+                "errors": result.error_count,
+            },
+        )
+
+    with open(args.path, "rb") as fh:
+        result = import_time_entries(
+            iter_import_records(fh, fmt),
+            company_id=args.company_id,
+            chunk_size=args.chunk_size,
+            on_progress=_progress,
+        )
+
+    for err in result.errors:
+        print(f"line {err.line}: {err.error}")
+    print(
+        f"rows={result.rows} imported={result.imported} skipped={result.skipped} errors={result.error_count}"
+    )
+    return 1 if result.error_count else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,16 +1,21 @@
 import uuid
 from datetime import datetime, timezone
+from types import MappingProxyType
 from typing import Optional
 
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
 from app.database import SessionLocal
+from app.models.event_outbox import EventOutbox
 from app.models.time_entry import TimeEntry
 from app.models.workflow_execution import WorkflowExecution
 from app.services import time_engine_v10 as time_engine
 
 
 class Step:
+    __slots__ = ("id", "label", "required", "read_only")
+
     def __init__(self, id: str, label: str, required: bool = True, read_only: bool = False):
         self.id = id
         self.label = label
@@ -19,9 +24,39 @@ class Step:
 
 
 class Workflow:
+    """
+    A flow definition compiled once at import: steps are an immutable tuple
+    with a step id -> index map and precomputed next pointers, so step lookup
+    and navigation are O(1) regardless of flow length.
+    """
+
+    __slots__ = ("name", "steps", "_index", "_next")
+
     def __init__(self, name: str, steps):
+        steps = tuple(steps)
+        if not steps:
+            raise ValueError(f"Workflow {name} has no steps")
+
+        index = {}
+        for i, step in enumerate(steps):
+            if step.id in index:
+                raise ValueError(f"Duplicate step id {step.id} in workflow {name}")
+            index[step.id] = i
+
         self.name = name
         self.steps = steps
+        self._index = MappingProxyType(index)
+        self._next = MappingProxyType(
+            {step.id: (steps[i + 1] if i + 1 < len(steps) else None) for i, step in enumerate(steps)}
+        )
+
+    def step(self, step_id: Optional[str]) -> Optional[Step]:
+        i = self._index.get(step_id)
+        return None if i is None else self.steps[i]
+
+    def next_step(self, step_id: Optional[str]) -> Optional[Step]:
+        """Successor of step_id; None for the last step or an unknown id."""
+        return self._next.get(step_id)
 
 
 clock_in_flow = Workflow(
@@ -70,23 +105,17 @@ def _require_company_employee_from_context(context: dict) -> tuple[int, int]:
 
 
 def _has_active_execution(db: Session, company_id: int, employee_id: int) -> bool:
-    rows = (
-        db.query(WorkflowExecution)
-        .filter(WorkflowExecution.status == "in_progress")
-        .order_by(WorkflowExecution.execution_id.desc())
-        .limit(200)
-        .all()
+    # Served by the uq_workflow_executions_active partial index.
+    row = (
+        db.query(WorkflowExecution.execution_id)
+        .filter(
+            WorkflowExecution.company_id == int(company_id),
+            WorkflowExecution.employee_id == int(employee_id),
+            WorkflowExecution.status == "in_progress",
+        )
+        .first()
     )
-
-    for ex in rows:
-        ctx = ex.context or {}
-        try:
-            if int(ctx.get("company_id")) == int(company_id) and int(ctx.get("employee_id")) == int(employee_id):
-                return True
-        except (TypeError, ValueError):
-            continue
-
-    return False
+    return row is not None
 
 
 def _has_active_time_entry(db: Session, company_id: int, employee_id: int) -> bool:
@@ -128,13 +157,20 @@ def start_execution(flow_name: str, context: dict) -> WorkflowExecution:
             execution_id=execution_id,
             flow_name=flow_name,
             context=context,
+            company_id=company_id,
+            employee_id=employee_id,
             status="in_progress",
             current_step_id=workflow.steps[0].id,
             completed_steps=[],
         )
 
         db.add(execution)
-        db.commit()
+        try:
+            db.commit()
+        except IntegrityError as exc:
+            # A concurrent start for the same employee won the partial unique index.
+            db.rollback()
+            raise ValueError("Active workflow execution already exists for employee in company") from exc
         db.refresh(execution)
         return execution
     finally:
@@ -142,23 +178,30 @@ def start_execution(flow_name: str, context: dict) -> WorkflowExecution:
 
 
 def _get_execution(db: Session, execution_id: str) -> WorkflowExecution:
-    execution = db.query(WorkflowExecution).filter_by(execution_id=execution_id).first()
+    # Session.get answers from the identity map when the caller already loaded it.
+    execution = db.get(WorkflowExecution, execution_id)
     if execution is None:
         raise ValueError("Execution not found")
     return execution
 
 
+def current_step_of(execution: WorkflowExecution) -> Step:
+    """Current step of an already-loaded execution (no database access)."""
+    step = get_workflow(execution.flow_name).step(execution.current_step_id)
+    if step is None:
+        raise ValueError("Current step not found")
+    return step
+
+
+def next_step_of(execution: WorkflowExecution) -> Optional[Step]:
+    """Step after the current one of an already-loaded execution, or None."""
+    return get_workflow(execution.flow_name).next_step(execution.current_step_id)
+
+
 def get_current_step(execution_id: str) -> Step:
     db = _get_db()
     try:
-        execution = _get_execution(db, execution_id)
-        workflow = get_workflow(execution.flow_name)
-
-        for step in workflow.steps:
-            if step.id == execution.current_step_id:
-                return step
-
-        raise ValueError("Current step not found")
+        return current_step_of(_get_execution(db, execution_id))
     finally:
         db.close()
 
@@ -166,22 +209,19 @@ def get_current_step(execution_id: str) -> Step:
 def get_next_step(execution_id: str) -> Optional[Step]:
     db = _get_db()
     try:
-        execution = _get_execution(db, execution_id)
-        workflow = get_workflow(execution.flow_name)
-
-        for i, step in enumerate(workflow.steps):
-            if step.id == execution.current_step_id:
-                if i + 1 < len(workflow.steps):
-                    return workflow.steps[i + 1]
-                return None
-
-        return None
+        return next_step_of(_get_execution(db, execution_id))
     finally:
         db.close()
 
 
-def submit_step(execution_id: str, step_input: dict):
-    db = _get_db()
+def submit_step(execution_id: str, step_input: dict, *, db: Optional[Session] = None):
+    """
+    If db is provided, this function will NOT commit/close. Caller owns the transaction.
+    If db is None, this function manages its own session + commit.
+    """
+    owns_db = db is None
+    if owns_db:
+        db = _get_db()
     try:
         execution = _get_execution(db, execution_id)
         step_id = step_input.get("step_id")
@@ -194,12 +234,19 @@ def submit_step(execution_id: str, step_input: dict):
             completed.append(step_id)
             execution.completed_steps = completed
 
-        db.commit()
+        if owns_db:
+            db.commit()
     finally:
-        db.close()
+        if owns_db:
+            db.close()
 
 
-def _finalize_time_engine(execution: WorkflowExecution):
+def _finalize_time_engine(db: Session, execution: WorkflowExecution):
+    """
+    Apply the flow's time entry change in the caller's session, so the time
+    entry, its outbox event and the execution state commit (or roll back)
+    together.
+    """
     ctx = execution.context or {}
 
     company_id = ctx.get("company_id")
@@ -225,28 +272,33 @@ def _finalize_time_engine(execution: WorkflowExecution):
             job_id=int(job_id),
             scope_id=int(scope_id),
             started_at=now,
+            db=db,
         )
 
     if execution.flow_name == "clock_out_flow":
-        time_engine.clock_out(
+        entry = time_engine.clock_out(
             company_id=company_id,
             employee_id=employee_id,
             ended_at=now,
+            db=db,
         )
-
-
-def advance_execution(execution_id: str):
-    db = _get_db()
+        # durable outbox (same transaction as clock_out)
+        db.add(EventOutbox(**time_engine.clock_out_outbox_event(company_id, entry)))
+
+
+def advance_execution(execution_id: str, *, db: Optional[Session] = None):
+    """
+    If db is provided, this function will NOT commit/rollback/close. Caller owns the transaction.
+    If db is None, this function manages its own session + commit.
+    """
+    owns_db = db is None
+    if owns_db:
+        db = _get_db()
     try:
         execution = _get_execution(db, execution_id)
         workflow = get_workflow(execution.flow_name)
 
-        current_step = None
-        for step in workflow.steps:
-            if step.id == execution.current_step_id:
-                current_step = step
-                break
-
+        current_step = workflow.step(execution.current_step_id)
         if current_step is None:
             raise ValueError("Current step not found")
 
@@ -254,48 +306,59 @@ def advance_execution(execution_id: str):
             raise ValueError("Required step must be completed before advancing")
 
         # Determine next state without committing yet
-        next_status = execution.status
-        next_current_step_id = execution.current_step_id
-
-        for i, step in enumerate(workflow.steps):
-            if step.id == execution.current_step_id:
-                if i + 1 < len(workflow.steps):
-                    next_current_step_id = workflow.steps[i + 1].id
-                else:
-                    next_status = "completed"
-                    next_current_step_id = None
-                break
+        next_step = workflow.next_step(current_step.id)
+        if next_step is not None:
+            next_status = execution.status
+            next_current_step_id = next_step.id
+        else:
+            next_status = "completed"
+            next_current_step_id = None
 
         # If completing, run time engine FIRST (rollback behavior)
         if next_status == "completed":
-            _finalize_time_engine(execution)
+            _finalize_time_engine(db, execution)
 
-        # Persist state after time engine succeeds
+        # Persist state after time engine succeeds; flush so constraint
+        # failures surface here even when the caller commits.
         execution.status = next_status
         execution.current_step_id = next_current_step_id
-        db.commit()
+        db.flush()
+        if owns_db:
+            db.commit()
 
     except Exception as exc:
-        db.rollback()
+        if owns_db:
+            db.rollback()
         raise ValueError(str(exc)) from exc
     finally:
-        db.close()
-
-
-def complete_workflow(execution_id: str):
-    db = _get_db()
+        if owns_db:
+            db.close()
+
+
+def complete_workflow(execution_id: str, *, db: Optional[Session] = None):
+    """
+    If db is provided, this function will NOT commit/rollback/close. Caller owns the transaction.
+    If db is None, this function manages its own session + commit.
+    """
+    owns_db = db is None
+    if owns_db:
+        db = _get_db()
     try:
         execution = _get_execution(db, execution_id)
 
         # Run time engine FIRST (rollback behavior)
-        _finalize_time_engine(execution)
+        _finalize_time_engine(db, execution)
 
         execution.status = "completed"
         execution.current_step_id = None
-        db.commit()
+        db.flush()
+        if owns_db:
+            db.commit()
 
     except Exception as exc:
-        db.rollback()
+        if owns_db:
+            db.rollback()
         raise ValueError(str(exc)) from exc
     finally:
-        db.close()
+        if owns_db:
+            db.close()
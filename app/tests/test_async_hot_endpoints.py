@@ -0,0 +1,97 @@
+import asyncio
+import inspect
+
+import httpx
+from sqlalchemy import text
+from sqlalchemy.pool import NullPool
+
+from app import database
+from app.main import app
+from app.routers import costing, time_entries
+from app.services.auth_service import create_access_token
+
+
+def _headers(company_id: int) -> dict:
+    token = create_access_token(user_id="test", company_id=company_id)
+    return {"X-Company-Id": str(company_id), "Authorization": f"Bearer {token}"}
+
+
+def test_hot_endpoints_are_coroutines():
+    for endpoint in (
+        time_entries.list_time_entries,
+        time_entries.clock_in_endpoint,
+        time_entries.clock_out_endpoint,
+        time_entries.get_active_time_entry,
+        time_entries.get_latest_time_entry,
+        costing.get_job_ledger,
+    ):
+        assert inspect.iscoroutinefunction(endpoint), endpoint.__name__
+
+
+def test_concurrent_punches_share_one_loop_and_engine(employee_factory, job_factory, scope_factory):
+    crew = [employee_factory(company_id=1, name=f"crew-{i}") for i in range(60)]
+    job = job_factory(company_id=1)
+    scope = scope_factory(company_id=1, job_id=job.id)
+    headers = _headers(1)
+
+    async def _run():
+        # Stand in for the lifespan: this loop serves every request below.
+        await database.init_async_engine()
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            clock_ins = await asyncio.gather(
+                *(
+                    client.post(
+                        "/time_entries/clock_in",
+                        headers=headers,
+                        json={
+                            "employee_id": e.id,
+                            "job_id": job.id,
+                            "scope_id": scope.id,
+                            "started_at": "2026-05-04T06:30:00-05:00",
+                        },
+                    )
+                    for e in crew
+                )
+            )
+            active = await client.get("/time_entries/active", headers=headers, params={"employee_id": crew[0].id})
+            duplicate = await client.post(
+                "/time_entries/clock_in",
+                headers=headers,
+                json={"employee_id": crew[0].id, "job_id": job.id, "scope_id": scope.id},
+            )
+            clock_outs = await asyncio.gather(
+                *(
+                    client.post("/time_entries/clock_out", headers=headers, json={"employee_id": e.id})
+                    for e in crew
+                )
+            )
+            latest = await client.get("/time_entries/latest", headers=headers, params={"employee_id": crew[0].id})
+            engines = len(database._async_engines)
+            pooled = not isinstance(database.get_async_engine().pool, NullPool)
+            await database.dispose_async_engine()
+        return clock_ins, active, duplicate, clock_outs, latest, engines, pooled
+
+    clock_ins, active, duplicate, clock_outs, latest, engines, pooled = asyncio.run(_run())
+
+    assert [r.status_code for r in clock_ins] == [200] * len(crew)
+    # Aware input is stored as naive UTC.
+    assert active.json()["started_at"] == "2026-05-04T11:30:00"
+    assert duplicate.status_code == 409
+    assert [r.status_code for r in clock_outs] == [200] * len(crew)
+    assert latest.json()["status"] == "completed"
+    assert engines == 1 and pooled
+
+
+def test_loops_outside_the_lifespan_get_unpooled_engines():
+    async def _use_engine():
+        async with database.async_session() as db:
+            await db.execute(text("SELECT 1"))
+        return database.get_async_engine()
+
+    first = asyncio.run(_use_engine())
+    second = asyncio.run(_use_engine())
+
+    assert isinstance(first.pool, NullPool) and isinstance(second.pool, NullPool)
+    # The first loop is closed, so its engine was dropped for the second one.
+    assert list(database._async_engines.values()) == [second]
@@ -0,0 +1,154 @@
+from datetime import date, datetime, timezone
+
+from sqlalchemy import event
+
+from app import database
+from app.database import SessionLocal
+from app.models.employee import Employee
+from app.models.job import Job
+from app.models.job_cost_ledger import JobCostLedger
+from app.models.pay_period import PayPeriod
+from app.models.payroll_item import PayrollItem
+from app.models.payroll_run import PayrollRun
+from app.services.costing_service import post_labor_costs
+
+
+def test_labor_posting_uses_one_insert_and_counts_conflicts_as_skipped():
+    db = SessionLocal()
+    try:
+        company_id = 1
+
+        job = Job(company_id=company_id, name="Batch Job")
+        db.add(job)
+        db.flush()
+
+        db.add(
+            PayPeriod(
+                pay_period_id="pp-batch-1",
+                company_id=company_id,
+                start_date=date(2026, 2, 1),
+                end_date=date(2026, 2, 8),
+                status="POSTED",
+            )
+        )
+        db.flush()
+        db.add(
+            PayrollRun(
+                payroll_run_id="pr-batch-1",
+                company_id=company_id,
+                pay_period_id="pp-batch-1",
+                status="POSTED",
+                posted_at=datetime.now(timezone.utc),
+            )
+        )
+        db.flush()
+
+        for i in range(25):
+            employee = Employee(company_id=company_id, name=f"Batch Employee {i}")
+            db.add(employee)
+            db.flush()
+            db.add(
+                PayrollItem(
+                    company_id=company_id,
+                    payroll_run_id="pr-batch-1",
+                    employee_id=employee.id,
+                    hours=8,
+                    rate_cents=2500,
+                    gross_pay_cents=20000,
+                    # Every fifth item has no job and is skipped without an insert.
+                    meta={} if i % 5 == 0 else {"job_id": job.id},
+                )
+            )
+        db.commit()
+
+        statements = []
+
+        def _capture(_conn, _cursor, statement, _params, _context, _executemany):
+            statements.append(statement.lstrip().upper())
+
+        event.listen(database.engine, "before_cursor_execute", _capture)
+        try:
+            first = post_labor_costs(company_id, "pr-batch-1", db)
+            db.flush()
+        finally:
+            event.remove(database.engine, "before_cursor_execute", _capture)
+
+        assert first == {"posted": 20, "skipped": 5, "payroll_run_id": "pr-batch-1"}
+        assert len([s for s in statements if s.startswith("INSERT INTO JOB_COST_LEDGER")]) == 1
+        assert not [s for s in statements if s.startswith("SELECT JOB_COST_LEDGER")]
+
+        second = post_labor_costs(company_id, "pr-batch-1", db)
+        db.commit()
+
+        assert second == {"posted": 0, "skipped": 25, "payroll_run_id": "pr-batch-1"}
+        assert db.query(JobCostLedger).filter(JobCostLedger.company_id == company_id).count() == 20
+    finally:
+        db.close()
+
+
+def test_meta_ids_convert_like_json_values():
+    db = SessionLocal()
+    try:
+        job = Job(company_id=1, name="Meta Job")
+        employee = Employee(company_id=1, name="Meta Employee")
+        db.add_all([job, employee])
+        db.add(
+            PayPeriod(
+                pay_period_id="pp-meta-1",
+                company_id=1,
+                start_date=date(2026, 2, 1),
+                end_date=date(2026, 2, 8),
+                status="POSTED",
+            )
+        )
+        db.flush()
+        db.add(
+            PayrollRun(
+                payroll_run_id="pr-meta-1",
+                company_id=1,
+                pay_period_id="pp-meta-1",
+                status="POSTED",
+                posted_at=datetime.now(timezone.utc),
+            )
+        )
+        db.flush()
+
+        metas = [
+            {"job_id": job.id, "scope_id": "7"},
+            {"job_id": str(job.id)},
+            {"job_id": job.id + 0.7},
+            {"job_id": True},
+            {"job_id": f"{job.id}.7"},
+            {"job_id": [job.id]},
+        ]
+        items = []
+        for meta in metas:
+            item = PayrollItem(
+                company_id=1,
+                payroll_run_id="pr-meta-1",
+                employee_id=employee.id,
+                gross_pay_cents=1000,
+                meta=meta,
+            )
+            db.add(item)
+            items.append(item)
+        db.commit()
+
+        result = post_labor_costs(1, "pr-meta-1", db)
+        db.commit()
+
+        # int() of the JSON value: numbers truncate and true is 1, but numeric
+        # strings must be integer text and arrays never convert.
+        assert result == {"posted": 4, "skipped": 2, "payroll_run_id": "pr-meta-1"}
+        posted = {
+            r.source_reference_id: (r.job_id, r.scope_id)
+            for r in db.query(JobCostLedger).filter(JobCostLedger.payroll_run_id == "pr-meta-1")
+        }
+        assert posted == {
+            f"pr-meta-1:{items[0].id}": (job.id, 7),
+            f"pr-meta-1:{items[1].id}": (job.id, None),
+            f"pr-meta-1:{items[2].id}": (job.id, None),
+            f"pr-meta-1:{items[3].id}": (1, None),
+        }
+    finally:
+        db.close()
@@ -1,3 +1,4 @@
+import asyncio
 from datetime import datetime, timezone
 from types import SimpleNamespace
 
@@ -42,17 +43,17 @@ def test_job_ledger_paginates_rows_unit():
 
         request = SimpleNamespace(state=SimpleNamespace(company_id=company_id))
 
-        body1 = get_job_ledger(job_id=job.id, request=request, scope_id=None, limit=2, offset=0, _role=None)
+        body1 = asyncio.run(get_job_ledger(job_id=job.id, request=request, scope_id=None, limit=2, offset=0, _role=None))
         assert body1["limit"] == 2
         assert body1["offset"] == 0
         assert len(body1["rows"]) == 2
 
-        body2 = get_job_ledger(job_id=job.id, request=request, scope_id=None, limit=2, offset=2, _role=None)
+        body2 = asyncio.run(get_job_ledger(job_id=job.id, request=request, scope_id=None, limit=2, offset=2, _role=None))
         assert body2["limit"] == 2
         assert body2["offset"] == 2
         assert len(body2["rows"]) == 2
 
-        body3 = get_job_ledger(job_id=job.id, request=request, scope_id=None, limit=2, offset=4, _role=None)
+        body3 = asyncio.run(get_job_ledger(job_id=job.id, request=request, scope_id=None, limit=2, offset=4, _role=None))
         assert len(body3["rows"]) == 1
 
     finally:
@@ -0,0 +1,106 @@
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import event
+
+from app import database
+from app.database import SessionLocal
+from app.models.job_cost_daily_rollup import JobCostDailyRollup
+from app.models.job_cost_ledger import JobCostLedger
+from app.services.ledger_reporting_service import job_cost_totals
+
+
+def _entry(i: int, posting_date: datetime, *, job_id: int = 10, employee_id=100, cents: int = 100) -> JobCostLedger:
+    return JobCostLedger(
+        company_id=1,
+        job_id=job_id,
+        scope_id=None,
+        employee_id=employee_id,
+        source_type="payroll_run_labor",
+        source_reference_id=f"pr-rollup:{i}",
+        cost_category="labor",
+        total_cost_cents=cents,
+        posting_date=posting_date,
+    )
+
+
+def test_rollup_is_maintained_on_insert():
+    db = SessionLocal()
+    try:
+        day = datetime(2026, 5, 1, 9, 0)
+        db.add_all(
+            [
+                _entry(1, day, cents=100),
+                _entry(2, day + timedelta(hours=3), cents=250),
+                _entry(3, day, employee_id=None, cents=40),
+            ]
+        )
+        db.commit()
+        db.add(_entry(4, day + timedelta(hours=5), employee_id=None, cents=60))
+        db.commit()
+
+        rows = (
+            db.query(JobCostDailyRollup)
+            .order_by(JobCostDailyRollup.employee_id.asc().nullsfirst())
+            .all()
+        )
+        assert [(r.posting_day.isoformat(), r.employee_id, r.row_count, r.total_cost_cents) for r in rows] == [
+            ("2026-05-01", None, 2, 100),
+            ("2026-05-01", 100, 2, 350),
+        ]
+    finally:
+        db.close()
+
+
+def test_totals_use_rollups_for_whole_days_and_raw_rows_at_edges():
+    db = SessionLocal()
+    try:
+        base = datetime(2026, 6, 1)
+        dates = [
+            base + timedelta(hours=6),  # before range start
+            base + timedelta(hours=18),  # head edge
+            base + timedelta(days=1, hours=1),  # whole day
+            base + timedelta(days=2, hours=23),  # whole day
+            base + timedelta(days=3, hours=2),  # tail edge
+            base + timedelta(days=3, hours=12),  # after range end
+        ]
+        db.add_all(
+            [
+                _entry(i, d, job_id=10 + (i % 2), cents=10 ** i)
+                for i, d in enumerate(dates)
+            ]
+        )
+        db.commit()
+
+        start = datetime(2026, 6, 1, 12, tzinfo=timezone.utc)
+        end = datetime(2026, 6, 4, 6, tzinfo=timezone.utc)
+
+        statements = []
+
+        def _capture(_conn, _cursor, statement, _params, _context, _executemany):
+            statements.append(statement)
+
+        event.listen(database.engine, "before_cursor_execute", _capture)
+        try:
+            res = job_cost_totals(company_id=1, date_start=start, date_end=end, db=db)
+        finally:
+            event.remove(database.engine, "before_cursor_execute", _capture)
+
+        assert len(statements) == 1
+        assert "job_cost_daily_rollup" in statements[0]
+
+        # Rows 1..4: job 11 gets 1 and 3, job 10 gets 2 and 4.
+        assert [(g["job_id"], g["row_count"], g["total_cost_cents"]) for g in res["groups"]] == [
+            (10, 2, 10**2 + 10**4),
+            (11, 2, 10**1 + 10**3),
+        ]
+
+        # Sub-day range never touches the rollup and matches raw semantics.
+        narrow = job_cost_totals(
+            company_id=1,
+            date_start=datetime(2026, 6, 4, 0),
+            date_end=datetime(2026, 6, 4, 3),
+            db=db,
+        )
+        assert [(g["job_id"], g["total_cost_cents"]) for g in narrow["groups"]] == [(10, 10**4)]
+    finally:
+        db.close()
@@ -0,0 +1,181 @@
+import uuid
+from datetime import date, datetime, timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.pagination import encode_cursor
+
+from app.database import SessionLocal
+from app.main import app
+from app.models.event_outbox import EventOutbox
+from app.models.job_cost_ledger import JobCostLedger
+from app.models.pay_period import PayPeriod
+from app.models.payroll_run import PayrollRun
+from app.models.time_entry import TimeEntry
+
+client = TestClient(app)
+
+
+def _auth_headers(company_id: int) -> dict:
+    r = client.post("/auth/token", json={"user_id": "test", "company_id": company_id})
+    assert r.status_code == 200, r.text
+    return {"X-Company-Id": str(company_id), "Authorization": f"Bearer {r.json()['access_token']}"}
+
+
+def _walk(path: str, headers: dict, *, params: dict, from_header: bool = False) -> list[list]:
+    pages = []
+    cursor = None
+    while True:
+        q = dict(params)
+        if cursor is not None:
+            q["cursor"] = cursor
+        r = client.get(path, headers=headers, params=q)
+        assert r.status_code == 200, r.text
+        if from_header:
+            pages.append(r.json())
+            cursor = r.headers.get("X-Next-Cursor")
+        else:
+            pages.append(r.json()["rows"])
+            cursor = r.json()["next_cursor"]
+        if cursor is None:
+            return pages
+
+
+def test_time_entries_cursor_walks_ties_without_gaps_or_duplicates(
+    employee_factory, job_factory, scope_factory
+):
+    employee = employee_factory(company_id=1)
+    job = job_factory(company_id=1)
+    scope = scope_factory(company_id=1, job_id=job.id)
+
+    db = SessionLocal()
+    try:
+        base = datetime(2026, 7, 1, 8, 0)
+        for i in range(7):
+            # Pairs share started_at, so the time_entry_id tie-breaker matters.
+            db.add(
+                TimeEntry(
+                    time_entry_id=str(uuid.uuid4()),
+                    company_id=1,
+                    employee_id=employee.id,
+                    job_id=job.id,
+                    scope_id=scope.id,
+                    started_at=base + timedelta(hours=i // 2),
+                    ended_at=base + timedelta(hours=i // 2, minutes=30),
+                    status="completed",
+                )
+            )
+        db.commit()
+        expected = [
+            r.time_entry_id
+            for r in db.query(TimeEntry)
+            .order_by(TimeEntry.started_at.desc(), TimeEntry.time_entry_id.desc())
+            .all()
+        ]
+    finally:
+        db.close()
+
+    pages = _walk("/time_entries", _auth_headers(1), params={"limit": 3}, from_header=True)
+    assert [len(p) for p in pages] == [3, 3, 1]
+    assert [row["time_entry_id"] for p in pages for row in p] == expected
+
+
+def test_ledger_outbox_and_payroll_cursors():
+    db = SessionLocal()
+    try:
+        posting = datetime(2026, 7, 2, 12, 0)
+        for i in range(5):
+            db.add(
+                JobCostLedger(
+                    company_id=1,
+                    job_id=77,
+                    source_type="payroll_run_labor",
+                    source_reference_id=f"cursor:{i}",
+                    cost_category="labor",
+                    total_cost_cents=100,
+                    posting_date=posting + timedelta(days=i % 2),
+                )
+            )
+            db.add(
+                EventOutbox(
+                    company_id=1,
+                    event_type="TIME_ENTRY_CLOCKED_OUT",
+                    idempotency_key=f"cursor-{i}",
+                    payload={},
+                )
+            )
+
+        db.add(
+            PayPeriod(
+                pay_period_id="pp-cursor",
+                company_id=1,
+                start_date=date(2026, 7, 1),
+                end_date=date(2026, 7, 8),
+                status="OPEN",
+            )
+        )
+        db.flush()
+        for i, posted_at in enumerate([posting, posting, None, posting + timedelta(days=1), None]):
+            db.add(
+                PayrollRun(
+                    payroll_run_id=f"pr-cursor-{i}",
+                    company_id=1,
+                    pay_period_id="pp-cursor",
+                    status="DRAFT" if posted_at is None else "POSTED",
+                    posted_at=posted_at,
+                )
+            )
+        db.commit()
+    finally:
+        db.close()
+
+    headers = _auth_headers(1)
+
+    ledger = _walk("/costing/job/77/ledger", headers, params={"limit": 2})
+    ledger_rows = [r for p in ledger for r in p]
+    assert [len(p) for p in ledger] == [2, 2, 1]
+    assert [(r["posting_date"], r["id"]) for r in ledger_rows] == sorted(
+        (r["posting_date"], r["id"]) for r in ledger_rows
+    )
+
+    outbox = _walk("/outbox", headers, params={"limit": 2})
+    outbox_ids = [r["id"] for p in outbox for r in p]
+    assert len(outbox_ids) == 5 and outbox_ids == sorted(outbox_ids)
+
+    runs = _walk("/payroll/runs", headers, params={"limit": 2})
+    assert [r["payroll_run_id"] for p in runs for r in p] == [
+        "pr-cursor-3",
+        "pr-cursor-0",
+        "pr-cursor-1",
+        "pr-cursor-2",
+        "pr-cursor-4",
+    ]
+
+    bad = client.get("/outbox", headers=headers, params={"cursor": "not-a-cursor"})
+    assert bad.status_code == 400
+
+    both = client.get("/outbox", headers=headers, params={"cursor": "WzFd", "offset": 5})
+    assert both.status_code == 400
+
+
+@pytest.mark.parametrize(
+    "path, key",
+    [
+        ("/time_entries", ["x", "y"]),
+        ("/time_entries", [{"$dt": "2026-07-01T08:00:00"}, 5]),
+        ("/costing/job/77/ledger", ["x", "y"]),
+        ("/costing/job/77/ledger", [{"$dt": "2026-07-01T08:00:00"}, "1"]),
+        ("/costing/job/77/ledger", [{"$dt": "2026-07-01T08:00:00"}, True]),
+        ("/outbox", ["x"]),
+        ("/outbox", [1.5]),
+        ("/payroll/runs", ["x", "y"]),
+        ("/payroll/runs", [None, 5]),
+        ("/payroll/runs", [{"$dt": "not a date"}, "pr-1"]),
+    ],
+)
+def test_tampered_cursor_is_rejected(path, key):
+    raw = encode_cursor(key)
+    r = client.get(path, headers=_auth_headers(1), params={"cursor": raw})
+    assert r.status_code == 400, r.text
+    assert r.json()["detail"] == "Invalid cursor"
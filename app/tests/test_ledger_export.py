@@ -0,0 +1,87 @@
+import csv
+import io
+import json
+from datetime import datetime, timedelta
+
+from fastapi.testclient import TestClient
+
+from app.database import SessionLocal
+from app.main import app
+from app.models.job_cost_ledger import JobCostLedger
+from app.services.ledger_export_service import iter_ledger_export_chunks
+
+client = TestClient(app)
+
+
+def _auth_headers(company_id: int) -> dict:
+    r = client.post("/auth/token", json={"user_id": "test", "company_id": company_id})
+    assert r.status_code == 200, r.text
+    return {"X-Company-Id": str(company_id), "Authorization": f"Bearer {r.json()['access_token']}"}
+
+
+def _seed() -> None:
+    db = SessionLocal()
+    try:
+        base = datetime(2026, 8, 1, 12, 0)
+        for company_id in (1, 2):
+            for i in range(5):
+                db.add(
+                    JobCostLedger(
+                        company_id=company_id,
+                        job_id=10 + (i % 2),
+                        source_type="payroll_run_labor",
+                        source_reference_id=f"export-{company_id}:{i}",
+                        cost_category="labor",
+                        quantity="1.5",
+                        total_cost_cents=100 * (i + 1),
+                        posting_date=base + timedelta(days=i),
+                    )
+                )
+        db.commit()
+    finally:
+        db.close()
+
+
+def test_export_chunks_are_bounded():
+    _seed()
+    db = SessionLocal()
+    try:
+        chunks = list(iter_ledger_export_chunks(db, company_id=1, chunk_size=2))
+    finally:
+        db.close()
+
+    assert [len(c) for c in chunks] == [2, 2, 1]
+    assert [r["source_reference_id"] for c in chunks for r in c] == [f"export-1:{i}" for i in range(5)]
+
+
+def test_ndjson_export_filters_by_company_job_and_date():
+    _seed()
+    r = client.get(
+        "/costing/ledger/export",
+        headers=_auth_headers(1),
+        params={"job_id": 10, "date_start": "2026-08-02T00:00:00", "date_end": "2026-08-10T00:00:00"},
+    )
+    assert r.status_code == 200
+    assert r.headers["content-type"].startswith("application/x-ndjson")
+
+    rows = [json.loads(line) for line in r.text.splitlines()]
+    assert [row["source_reference_id"] for row in rows] == ["export-1:2", "export-1:4"]
+    assert rows[0]["quantity"] == "1.5"
+    assert rows[0]["posting_date"] == "2026-08-03T12:00:00"
+
+
+def test_gzip_csv_export():
+    _seed()
+    r = client.get(
+        "/costing/ledger/export",
+        headers=_auth_headers(2),
+        params={"format": "csv", "gzip": "true"},
+    )
+    assert r.status_code == 200
+    assert r.headers["content-encoding"] == "gzip"
+
+    # The client decodes Content-Encoding: gzip transparently.
+    rows = list(csv.DictReader(io.StringIO(r.text)))
+    assert len(rows) == 5
+    assert {row["company_id"] for row in rows} == {"2"}
+    assert rows[-1]["total_cost_cents"] == "500"
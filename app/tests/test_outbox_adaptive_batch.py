@@ -0,0 +1,73 @@
+from datetime import timedelta
+
+from app.database import SessionLocal
+from app.models.event_outbox import EventOutbox
+from app.services.outbox_processor import process_outbox_batch
+from app.services.outbox_worker import AdaptiveBatchController
+
+
+def test_full_fast_batches_loop_immediately_and_grow():
+    c = AdaptiveBatchController(batch_size=50, min_size=10, max_size=150, target_seconds=1.0)
+
+    assert c.record_batch(claimed=50, elapsed=0.1) == 0.0
+    assert c.batch_size == 100
+    assert c.record_batch(claimed=100, elapsed=0.1) == 0.0
+    assert c.batch_size == 150  # capped at max_size
+
+    # Full but between half and full target: keep draining, hold size.
+    assert c.record_batch(claimed=150, elapsed=0.8) == 0.0
+    assert c.batch_size == 150
+
+
+def test_slow_batches_and_failures_shrink():
+    c = AdaptiveBatchController(batch_size=80, min_size=10, max_size=500, target_seconds=1.0)
+
+    c.record_batch(claimed=80, elapsed=2.5)
+    assert c.batch_size == 40
+
+    c.record_failure()
+    c.record_failure()
+    assert c.batch_size == 10
+    c.record_failure()
+    assert c.batch_size == 10  # floored at min_size
+
+
+def test_idle_backoff_doubles_and_resets_on_wake():
+    c = AdaptiveBatchController(batch_size=50, idle_seconds=1.0, max_idle_seconds=5.0)
+
+    waits = [c.record_batch(claimed=0, elapsed=0.01) for _ in range(5)]
+    assert waits == [1.0, 2.0, 4.0, 5.0, 5.0]
+
+    c.wake()
+    assert c.record_batch(claimed=0, elapsed=0.01) == 1.0
+
+    # A partial batch means the queue is drained: regular poll interval.
+    c.record_batch(claimed=0, elapsed=0.01)
+    assert c.record_batch(claimed=3, elapsed=0.01) == 1.0
+    assert c.record_batch(claimed=0, elapsed=0.01) == 1.0
+
+
+def test_batch_result_reports_claimed_rows():
+    db = SessionLocal()
+    try:
+        for i in range(3):
+            db.add(
+                EventOutbox(
+                    company_id=1,
+                    event_type="TIME_ENTRY_CLOCKED_OUT",
+                    idempotency_key=f"adaptive-{i}",
+                    payload={},
+                )
+            )
+        db.commit()
+        now = db.query(EventOutbox).first().created_at + timedelta(seconds=1)
+
+        handlers = {"TIME_ENTRY_CLOCKED_OUT": lambda row, _db: None}
+        r1 = process_outbox_batch(db=db, now=now, batch_size=2, handlers=handlers)
+        r2 = process_outbox_batch(db=db, now=now, batch_size=2, handlers=handlers)
+        db.commit()
+
+        assert (r1.claimed, r1.processed) == (2, 2)
+        assert (r2.claimed, r2.processed) == (1, 1)
+    finally:
+        db.close()
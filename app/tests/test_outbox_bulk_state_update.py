@@ -0,0 +1,104 @@
+from datetime import timedelta
+
+from sqlalchemy import event
+
+from app import database
+from app.database import SessionLocal
+from app.models.event_outbox import EventOutbox
+from app.services.outbox_processor import process_outbox_batch
+
+
+def test_batch_outcomes_written_with_single_update():
+    db = SessionLocal()
+    try:
+        for i in range(6):
+            db.add(
+                EventOutbox(
+                    company_id=1,
+                    event_type="OK_EVENT" if i % 2 == 0 else "BAD_EVENT",
+                    idempotency_key=f"bulk-{i}",
+                    payload={},
+                )
+            )
+        db.commit()
+
+        now = db.query(EventOutbox).first().created_at + timedelta(seconds=1)
+
+        def _ok(_row, _db):
+            return None
+
+        def _bad(_row, _db):
+            raise RuntimeError("boom")
+
+        updates = []
+
+        def _capture(_conn, _cursor, statement, _params, _context, _executemany):
+            if statement.lstrip().upper().startswith("UPDATE EVENT_OUTBOX"):
+                updates.append(statement)
+
+        event.listen(database.engine, "before_cursor_execute", _capture)
+        try:
+            result = process_outbox_batch(
+                db=db,
+                now=now,
+                batch_size=10,
+                max_retries=10,
+                handlers={"OK_EVENT": _ok, "BAD_EVENT": _bad},
+            )
+            db.commit()
+        finally:
+            event.remove(database.engine, "before_cursor_execute", _capture)
+
+        assert result.processed == 3
+        assert result.failed == 3
+        assert len(updates) == 1
+
+        rows = db.query(EventOutbox).order_by(EventOutbox.id.asc()).all()
+        for row in rows:
+            db.refresh(row)
+            if row.event_type == "OK_EVENT":
+                assert row.processed is True
+                assert row.processed_at is not None
+                assert int(row.retry_count) == 0
+            else:
+                assert row.processed is False
+                assert row.processed_at is None
+                assert int(row.retry_count) == 1
+    finally:
+        db.close()
+
+
+def test_exhausted_retries_mark_processed():
+    db = SessionLocal()
+    try:
+        row = EventOutbox(
+            company_id=1,
+            event_type="BAD_EVENT",
+            idempotency_key="bulk-exhausted",
+            payload={},
+            retry_count=2,
+        )
+        db.add(row)
+        db.commit()
+
+        now = row.created_at + timedelta(seconds=60)
+
+        def _bad(_row, _db):
+            raise RuntimeError("boom")
+
+        result = process_outbox_batch(
+            db=db,
+            now=now,
+            batch_size=10,
+            max_retries=3,
+            handlers={"BAD_EVENT": _bad},
+        )
+        db.commit()
+
+        assert result.failed == 1
+        db.refresh(row)
+        assert row.processed is True
+        assert row.processed_at is not None
+        assert int(row.retry_count) == 3
+    finally:
+        db.close()
@@ -0,0 +1,74 @@
+import threading
+from datetime import timedelta
+
+from app.database import SessionLocal
+from app.models.event_outbox import EventOutbox
+from app.services.outbox_processor import process_outbox_batch_concurrent
+
+
+def _seed(payloads):
+    db = SessionLocal()
+    try:
+        for i, payload in enumerate(payloads):
+            db.add(
+                EventOutbox(
+                    company_id=1,
+                    event_type="TIME_ENTRY_CLOCKED_OUT",
+                    idempotency_key=f"concurrent-{i}",
+                    payload=payload,
+                )
+            )
+        db.commit()
+        return db.query(EventOutbox).first().created_at + timedelta(seconds=1)
+    finally:
+        db.close()
+
+
+def test_independent_keys_run_in_parallel():
+    now = _seed([{"employee_id": e} for e in (1, 2, 3)])
+
+    # Each handler blocks until all three are running at once; serial
+    # execution would break the barrier and fail every row.
+    barrier = threading.Barrier(3, timeout=5)
+
+    def _handler(row, _db):
+        barrier.wait()
+
+    result = process_outbox_batch_concurrent(
+        now=now,
+        batch_size=10,
+        handlers={"TIME_ENTRY_CLOCKED_OUT": _handler},
+        max_workers=3,
+    )
+
+    assert result.processed == 3
+    assert result.failed == 0
+
+    db = SessionLocal()
+    try:
+        assert db.query(EventOutbox).filter(EventOutbox.processed.is_(False)).count() == 0
+    finally:
+        db.close()
+
+
+def test_same_key_events_are_handled_in_id_order():
+    now = _seed([{"employee_id": 7, "seq": i} for i in range(5)] + [{"employee_id": 8, "seq": 0}])
+
+    seen = []
+    lock = threading.Lock()
+
+    def _handler(row, _db):
+        with lock:
+            seen.append((row.payload["employee_id"], int(row.id)))
+
+    result = process_outbox_batch_concurrent(
+        now=now,
+        batch_size=10,
+        handlers={"TIME_ENTRY_CLOCKED_OUT": _handler},
+        max_workers=4,
+    )
+
+    assert result.processed == 6
+    same_key = [row_id for employee_id, row_id in seen if employee_id == 7]
+    assert len(same_key) == 5
+    assert same_key == sorted(same_key)
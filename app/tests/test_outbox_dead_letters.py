@@ -0,0 +1,107 @@
+from datetime import timedelta
+
+from fastapi.testclient import TestClient
+
+from app.database import SessionLocal
+from app.main import app
+from app.models.event_outbox import EventOutbox
+from app.models.event_outbox_dead_letter import EventOutboxDeadLetter
+from app.services.outbox_processor import process_outbox_batch
+
+client = TestClient(app)
+
+
+def _auth_headers(company_id: int) -> dict:
+    resp = client.post("/auth/token", json={"user_id": "test", "company_id": company_id})
+    assert resp.status_code == 200, f"token request failed: {resp.status_code} {resp.text}"
+    return {"X-Company-Id": str(company_id), "Authorization": f"Bearer {resp.json()['access_token']}"}
+
+
+def _exhaust(company_id: int, keys: list[str], event_type: str = "TIME_ENTRY_CLOCKED_OUT") -> None:
+    db = SessionLocal()
+    try:
+        for key in keys:
+            db.add(EventOutbox(company_id=company_id, event_type=event_type, idempotency_key=key, payload={}))
+        db.commit()
+
+        created_at = db.query(EventOutbox).first().created_at
+
+        def _boom(row, _db):
+            raise RuntimeError(f"handler exploded for {row.idempotency_key}")
+
+        process_outbox_batch(
+            db=db,
+            now=created_at + timedelta(seconds=1),
+            batch_size=100,
+            max_retries=1,
+            handlers={event_type: _boom},
+        )
+        db.commit()
+    finally:
+        db.close()
+
+
+def test_exhausted_row_is_dead_lettered_with_error_and_traceback():
+    _exhaust(1, ["dl-1"])
+
+    db = SessionLocal()
+    try:
+        row = db.query(EventOutbox).one()
+        assert row.processed is True
+        assert row.retry_count == 1
+
+        dl = db.query(EventOutboxDeadLetter).one()
+        assert dl.event_outbox_id == row.id
+        assert dl.company_id == 1
+        assert dl.last_error == "RuntimeError: handler exploded for dl-1"
+        assert "Traceback" in dl.traceback
+    finally:
+        db.close()
+
+
+def test_replay_endpoint_requeues_filtered_dead_letters_for_own_company_only():
+    _exhaust(7001, ["a", "b", "c"])
+    _exhaust(7002, ["other"])
+
+    db = SessionLocal()
+    try:
+        ids = [
+            r.id
+            for r in db.query(EventOutbox)
+            .filter(EventOutbox.company_id == 7001)
+            .order_by(EventOutbox.id.asc())
+            .all()
+        ]
+    finally:
+        db.close()
+
+    headers = _auth_headers(7001)
+
+    listed = client.get("/outbox/dead_letters", headers=headers)
+    assert listed.status_code == 200
+    assert [r["event_outbox_id"] for r in listed.json()["rows"]] == ids
+
+    r = client.post(
+        "/outbox/dead_letters/replay",
+        headers=headers,
+        json={"event_type": "TIME_ENTRY_CLOCKED_OUT", "id_from": ids[0], "id_to": ids[1], "batch_size": 1},
+    )
+    assert r.status_code == 200
+    assert r.json() == {"replayed": 2, "batches": 2}
+
+    db = SessionLocal()
+    try:
+        requeued = (
+            db.query(EventOutbox)
+            .filter(EventOutbox.processed.is_(False))
+            .order_by(EventOutbox.id.asc())
+            .all()
+        )
+        assert [row.id for row in requeued] == ids[:2]
+        assert all(row.retry_count == 0 and row.processed_at is None for row in requeued)
+
+        remaining = db.query(EventOutboxDeadLetter).order_by(EventOutboxDeadLetter.event_outbox_id).all()
+        assert [(d.company_id, d.event_outbox_id) for d in remaining][0] == (7001, ids[2])
+        assert {d.company_id for d in remaining} == {7001, 7002}
+    finally:
+        db.close()
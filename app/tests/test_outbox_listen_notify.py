@@ -0,0 +1,56 @@
+import time
+
+from app import database
+from app.database import SessionLocal
+from app.models.event_outbox import EventOutbox
+from app.services.outbox_worker import OutboxListener
+
+
+def _insert_event(key: str, *, commit: bool) -> None:
+    db = SessionLocal()
+    try:
+        db.add(
+            EventOutbox(
+                company_id=1,
+                event_type="TIME_ENTRY_CLOCKED_OUT",
+                idempotency_key=key,
+                payload={},
+            )
+        )
+        db.flush()
+        if commit:
+            db.commit()
+        else:
+            db.rollback()
+    finally:
+        db.close()
+
+
+def test_listener_wakes_on_committed_outbox_insert():
+    listener = OutboxListener(database.engine)
+    try:
+        assert listener.open() is True
+
+        _insert_event("notify-commit", commit=True)
+
+        started = time.monotonic()
+        notified = listener.wait_blocking(5.0)
+        elapsed = time.monotonic() - started
+
+        assert notified is True
+        assert elapsed < 1.0
+    finally:
+        listener.close()
+
+
+def test_listener_not_woken_by_rolled_back_insert():
+    listener = OutboxListener(database.engine)
+    try:
+        assert listener.open() is True
+
+        _insert_event("notify-rollback", commit=False)
+
+        notified = listener.wait_blocking(0.2)
+        assert notified is False
+    finally:
+        listener.close()
@@ -0,0 +1,64 @@
+from datetime import timedelta
+
+from fastapi.testclient import TestClient
+
+from app.database import SessionLocal
+from app.main import app
+from app.models.event_outbox import EventOutbox
+from app.services.outbox_processor import process_outbox_batch
+
+client = TestClient(app)
+
+
+def _sample(body: str, name: str) -> float:
+    for line in body.splitlines():
+        if line.startswith(name + " "):
+            return float(line.split(" ", 1)[1])
+    raise AssertionError(f"{name} not found in /metrics output")
+
+
+def test_metrics_exposes_outbox_latency_and_queue_depth():
+    db = SessionLocal()
+    try:
+        for i in range(3):
+            db.add(
+                EventOutbox(
+                    company_id=1,
+                    event_type="TIME_ENTRY_CLOCKED_OUT",
+                    idempotency_key=f"metrics-{i}",
+                    payload={},
+                )
+            )
+        db.commit()
+
+        created_at = db.query(EventOutbox).first().created_at
+        now = created_at + timedelta(seconds=1)
+
+        def _flaky(row, _db):
+            if row.idempotency_key == "metrics-0":
+                raise RuntimeError("boom")
+
+        process_outbox_batch(
+            db=db,
+            now=now,
+            batch_size=2,
+            handlers={"TIME_ENTRY_CLOCKED_OUT": _flaky},
+        )
+        db.commit()
+    finally:
+        db.close()
+
+    r = client.get("/metrics")
+    assert r.status_code == 200
+    assert r.headers["content-type"].startswith("text/plain")
+    body = r.text
+
+    assert "# TYPE outbox_handler_seconds histogram" in body
+    assert 'outbox_handler_seconds_count{event_type="TIME_ENTRY_CLOCKED_OUT",result="error"}' in body
+    assert 'outbox_retries_total{event_type="TIME_ENTRY_CLOCKED_OUT"}' in body
+    assert "outbox_claim_seconds_count" in body
+
+    # One row untouched plus one waiting out its retry backoff.
+    assert _sample(body, "outbox_queue_pending_rows") == 2
+    assert _sample(body, "outbox_queue_due_rows") >= 1
+    assert _sample(body, "outbox_oldest_due_age_seconds") >= 0
@@ -0,0 +1,72 @@
+from datetime import timedelta
+
+from sqlalchemy import text
+
+from app.database import SessionLocal
+from app.models.event_outbox import EventOutbox
+from app.services.outbox_processor import _claim_query, process_outbox_batch
+
+
+def test_next_attempt_at_tracks_created_at_and_retry_backoff():
+    db = SessionLocal()
+    try:
+        row = EventOutbox(
+            company_id=1,
+            event_type="BAD_EVENT",
+            idempotency_key="next-attempt-1",
+            payload={},
+        )
+        db.add(row)
+        db.commit()
+        db.refresh(row)
+
+        assert row.next_attempt_at == row.created_at
+
+        def _bad(_row, _db):
+            raise RuntimeError("boom")
+
+        now = row.created_at + timedelta(seconds=1)
+        process_outbox_batch(db=db, now=now, batch_size=10, max_retries=10, handlers={"BAD_EVENT": _bad})
+        db.commit()
+
+        # Synced from RETURNING without a refresh.
+        assert int(row.retry_count) == 1
+        assert row.next_attempt_at == row.created_at + timedelta(seconds=2)
+
+        # Direct edits of created_at/retry_count are re-derived by the trigger.
+        row.retry_count = 10
+        db.commit()
+        assert row.next_attempt_at == row.created_at + timedelta(seconds=60)
+    finally:
+        db.close()
+
+
+def test_claim_query_uses_partial_due_index():
+    db = SessionLocal()
+    try:
+        # Deep pending backlog: LIMIT must stop after the batch instead of sorting it.
+        db.execute(
+            text(
+                """
+                INSERT INTO event_outbox (company_id, event_type, idempotency_key, payload, processed, processed_at)
+                SELECT 1, 'TIME_ENTRY_CLOCKED_OUT', 'plan-' || g, '{}'::jsonb, g > 4000, now()
+                FROM generate_series(1, 5000) AS g
+                """
+            )
+        )
+        db.commit()
+        db.execute(text("ANALYZE event_outbox"))
+
+        now = db.execute(text("select now()")).scalar()
+        compiled = _claim_query(db, now=now, batch_size=50).statement.compile(
+            dialect=db.get_bind().dialect
+        )
+
+        plan = "\n".join(
+            r[0]
+            for r in db.connection().exec_driver_sql("EXPLAIN " + str(compiled), compiled.params).all()
+        )
+        assert "ix_event_outbox_due" in plan
+    finally:
+        db.rollback()
+        db.close()
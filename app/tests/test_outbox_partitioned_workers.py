@@ -0,0 +1,88 @@
+from datetime import timedelta
+
+from app.database import SessionLocal
+from app.models.event_outbox import EventOutbox
+from app.services.outbox_processor import (
+    process_outbox_batch,
+    rebalance_outbox_partitions,
+    register_outbox_worker,
+)
+
+
+def test_partitioned_batch_only_claims_owned_companies():
+    db = SessionLocal()
+    try:
+        for company_id in (1, 2, 3, 4):
+            db.add(
+                EventOutbox(
+                    company_id=company_id,
+                    event_type="TIME_ENTRY_CLOCKED_OUT",
+                    idempotency_key=f"partition-{company_id}",
+                    payload={},
+                )
+            )
+        db.commit()
+
+        created_at = db.query(EventOutbox).first().created_at
+        now = created_at + timedelta(seconds=1)
+
+        seen = []
+
+        def _record(row, _db):
+            seen.append(int(row.company_id))
+
+        # partition = company_id % 2; partition 1 owns companies 1 and 3.
+        result = process_outbox_batch(
+            db=db,
+            now=now,
+            batch_size=10,
+            handlers={"TIME_ENTRY_CLOCKED_OUT": _record},
+            partitions=[1],
+            partition_count=2,
+        )
+        db.commit()
+
+        assert result.processed == 2
+        assert sorted(seen) == [1, 3]
+
+        pending = (
+            db.query(EventOutbox.company_id)
+            .filter(EventOutbox.processed.is_(False))
+            .order_by(EventOutbox.company_id.asc())
+            .all()
+        )
+        assert [c for (c,) in pending] == [2, 4]
+    finally:
+        db.close()
+
+
+def test_partitions_rebalance_on_join_and_worker_death():
+    a = SessionLocal()
+    b = SessionLocal()
+    try:
+        register_outbox_worker(a)
+        owned_a = rebalance_outbox_partitions(a, owned=set(), partition_count=4)
+        assert owned_a == {0, 1, 2, 3}
+
+        # B joins: its fair share is 2 but nothing is free until A sheds load.
+        register_outbox_worker(b)
+        owned_b = rebalance_outbox_partitions(b, owned=set(), partition_count=4)
+        assert owned_b == set()
+
+        owned_a = rebalance_outbox_partitions(a, owned=owned_a, partition_count=4)
+        assert len(owned_a) == 2
+
+        owned_b = rebalance_outbox_partitions(b, owned=owned_b, partition_count=4)
+        assert len(owned_b) == 2
+        assert owned_a.isdisjoint(owned_b)
+
+        # A dies: its connection goes away along with every advisory lock it held.
+        a.connection().invalidate()
+        a.close()
+
+        owned_b = rebalance_outbox_partitions(b, owned=owned_b, partition_count=4)
+        assert owned_b == {0, 1, 2, 3}
+    finally:
+        b.connection().invalidate()
+        b.close()
+        a.close()
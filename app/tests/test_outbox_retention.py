@@ -0,0 +1,78 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy.exc import IntegrityError
+
+from app.database import SessionLocal
+from app.models.event_outbox import EventOutbox
+from app.models.event_outbox_archive import EventOutboxArchive
+from app.services.outbox_retention import run_outbox_retention
+
+
+def _seed(db, key: str, *, processed: bool, age_days: int) -> None:
+    row = EventOutbox(
+        company_id=1,
+        event_type="TIME_ENTRY_CLOCKED_OUT",
+        idempotency_key=key,
+        payload={"key": key},
+        processed=processed,
+        processed_at=datetime.now(timezone.utc) if processed else None,
+    )
+    db.add(row)
+    db.flush()
+    row.created_at = datetime.now(timezone.utc) - timedelta(days=age_days)
+    db.flush()
+
+
+def test_retention_moves_only_old_processed_rows():
+    db = SessionLocal()
+    try:
+        _seed(db, "old-processed-1", processed=True, age_days=40)
+        _seed(db, "old-processed-2", processed=True, age_days=35)
+        _seed(db, "old-pending", processed=False, age_days=40)
+        _seed(db, "recent-processed", processed=True, age_days=1)
+        db.commit()
+    finally:
+        db.close()
+
+    archived = run_outbox_retention(retention_days=30, batch_size=1)
+    assert archived == 2
+
+    db = SessionLocal()
+    try:
+        hot = sorted(k for (k,) in db.query(EventOutbox.idempotency_key).all())
+        assert hot == ["old-pending", "recent-processed"]
+
+        cold = db.query(EventOutboxArchive).order_by(EventOutboxArchive.id.asc()).all()
+        assert [r.idempotency_key for r in cold] == ["old-processed-1", "old-processed-2"]
+        assert cold[0].payload == {"key": "old-processed-1"}
+        assert cold[0].archived_at is not None
+    finally:
+        db.close()
+
+
+def test_archived_idempotency_key_cannot_be_reinserted():
+    db = SessionLocal()
+    try:
+        _seed(db, "archived-key", processed=True, age_days=40)
+        db.commit()
+    finally:
+        db.close()
+
+    assert run_outbox_retention(retention_days=30) == 1
+
+    db = SessionLocal()
+    try:
+        db.add(
+            EventOutbox(
+                company_id=1,
+                event_type="TIME_ENTRY_CLOCKED_OUT",
+                idempotency_key="archived-key",
+                payload={},
+            )
+        )
+        with pytest.raises(IntegrityError):
+            db.flush()
+        db.rollback()
+    finally:
+        db.close()
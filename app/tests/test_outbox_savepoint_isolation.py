@@ -0,0 +1,87 @@
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import text
+
+from app.database import SessionLocal
+from app.models.event_outbox import EventOutbox
+from app.models.job_cost_ledger import JobCostLedger
+from app.services.outbox_processor import process_outbox_batch
+
+
+def _ledger_row(reference: str) -> JobCostLedger:
+    return JobCostLedger(
+        company_id=1,
+        job_id=1,
+        source_type="test",
+        source_reference_id=reference,
+        cost_category="labor",
+        total_cost_cents=100,
+        posting_date=datetime.now(timezone.utc),
+    )
+
+
+def test_failed_handler_writes_are_rolled_back_and_batch_survives():
+    db = SessionLocal()
+    try:
+        for key, event_type in (
+            ("sp-ok-1", "WRITE_OK"),
+            ("sp-partial", "WRITE_THEN_FAIL"),
+            ("sp-db-error", "DB_ERROR"),
+            ("sp-ok-2", "WRITE_OK"),
+        ):
+            db.add(
+                EventOutbox(
+                    company_id=1,
+                    event_type=event_type,
+                    idempotency_key=key,
+                    payload={"key": key},
+                )
+            )
+        db.commit()
+
+        now = db.query(EventOutbox).first().created_at + timedelta(seconds=1)
+
+        def _write_ok(row, hdb):
+            hdb.add(_ledger_row(row.payload["key"]))
+            hdb.flush()
+
+        def _write_then_fail(row, hdb):
+            hdb.add(_ledger_row(row.payload["key"]))
+            hdb.flush()
+            raise RuntimeError("failed after partial write")
+
+        def _db_error(_row, hdb):
+            # Aborts the enclosing transaction unless isolated by a savepoint.
+            hdb.execute(text("select 1 / 0"))
+
+        result = process_outbox_batch(
+            db=db,
+            now=now,
+            batch_size=10,
+            max_retries=10,
+            handlers={
+                "WRITE_OK": _write_ok,
+                "WRITE_THEN_FAIL": _write_then_fail,
+                "DB_ERROR": _db_error,
+            },
+        )
+        db.commit()
+
+        assert result.processed == 2
+        assert result.failed == 2
+
+        refs = sorted(r for (r,) in db.query(JobCostLedger.source_reference_id).all())
+        assert refs == ["sp-ok-1", "sp-ok-2"]
+
+        states = {
+            r.idempotency_key: (r.processed, int(r.retry_count))
+            for r in db.query(EventOutbox).populate_existing().all()
+        }
+        assert states == {
+            "sp-ok-1": (True, 0),
+            "sp-partial": (False, 1),
+            "sp-db-error": (False, 1),
+            "sp-ok-2": (True, 0),
+        }
+    finally:
+        db.close()
@@ -0,0 +1,88 @@
+import os
+import signal
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+
+from app.database import SessionLocal
+from app.models.event_outbox import EventOutbox
+from app.services.outbox_worker import run_outbox_worker
+
+
+def _wait_until(predicate, timeout: float = 5.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.05)
+    return False
+
+
+def _processed_count() -> int:
+    db = SessionLocal()
+    try:
+        return db.query(EventOutbox).filter(EventOutbox.processed.is_(True)).count()
+    finally:
+        db.close()
+
+
+def test_threaded_worker_drains_on_notify_and_stops_promptly():
+    stop = threading.Event()
+    thread = threading.Thread(
+        target=run_outbox_worker,
+        args=(stop,),
+        kwargs={"poll_seconds": 30.0, "retention_days": 0},
+        daemon=True,
+    )
+    thread.start()
+    try:
+        time.sleep(0.3)
+
+        db = SessionLocal()
+        try:
+            for i in range(3):
+                db.add(
+                    EventOutbox(
+                        company_id=1,
+                        event_type="TIME_ENTRY_CLOCKED_OUT",
+                        idempotency_key=f"runner-{i}",
+                        payload={},
+                    )
+                )
+            db.commit()
+        finally:
+            db.close()
+
+        # poll_seconds is 30s: only the NOTIFY can wake the thread this fast.
+        assert _wait_until(lambda: _processed_count() == 3)
+    finally:
+        stop.set()
+        thread.join(timeout=5)
+
+    assert not thread.is_alive()
+
+
+def test_standalone_worker_process_exits_cleanly_on_sigterm():
+    env = os.environ.copy()
+    env["OUTBOX_RETENTION_DAYS"] = "0"
+    env.pop("PYTEST_CURRENT_TEST", None)
+
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "app.services.outbox_worker"],
+        cwd=Path(__file__).resolve().parents[2],
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        time.sleep(1.5)
+        assert proc.poll() is None
+
+        proc.send_signal(signal.SIGTERM)
+        assert proc.wait(timeout=10) == 0
+    finally:
+        if proc.poll() is None:
+            proc.kill()
+            proc.wait()
@@ -0,0 +1,135 @@
+from datetime import date, datetime, timezone
+
+import pytest
+from sqlalchemy import event
+
+from app import database
+from app.database import SessionLocal
+from app.models.employee import Employee
+from app.models.job import Job
+from app.models.job_cost_ledger import JobCostLedger
+from app.models.pay_period import PayPeriod
+from app.models.payroll_item import PayrollItem
+from app.models.payroll_run import PayrollRun
+from app.models.payroll_run_reconciliation import PayrollRunReconciliation
+from app.services.costing_service import post_labor_costs
+from app.services.reconciliation_service import reconcile_payroll_run_labor
+
+
+def _seed(db, *, run_id: str, metas: list[dict]) -> list[PayrollItem]:
+    job = Job(company_id=1, name="Recon Job")
+    employee = Employee(company_id=1, name="Recon Employee")
+    db.add_all([job, employee])
+    db.add(
+        PayPeriod(
+            pay_period_id=f"pp-{run_id}",
+            company_id=1,
+            start_date=date(2026, 4, 1),
+            end_date=date(2026, 4, 8),
+            status="POSTED",
+        )
+    )
+    db.flush()
+    db.add(
+        PayrollRun(
+            payroll_run_id=run_id,
+            company_id=1,
+            pay_period_id=f"pp-{run_id}",
+            status="POSTED",
+            posted_at=datetime.now(timezone.utc),
+        )
+    )
+    db.flush()
+    items = []
+    for i, meta in enumerate(metas):
+        item = PayrollItem(
+            company_id=1,
+            payroll_run_id=run_id,
+            employee_id=employee.id,
+            gross_pay_cents=1000 * (i + 1),
+            meta={k: job.id for k in meta},
+        )
+        db.add(item)
+        items.append(item)
+    db.commit()
+    return items
+
+
+def test_posting_maintains_summary_and_reconciliation_skips_ledger_aggregation():
+    db = SessionLocal()
+    try:
+        items = _seed(db, run_id="pr-recon-1", metas=[{"job_id"}, {"job_id"}, {}])
+
+        post_labor_costs(1, "pr-recon-1", db)
+        db.commit()
+
+        summary = db.get(PayrollRunReconciliation, "pr-recon-1")
+        assert (summary.ledger_total_cents, summary.ledger_entry_count) == (3000, 2)
+
+        ledger = db.query(JobCostLedger).filter(JobCostLedger.company_id == 1).all()
+        assert {r.payroll_run_id for r in ledger} == {"pr-recon-1"}
+
+        statements = []
+
+        def _capture(_conn, _cursor, statement, _params, _context, _executemany):
+            statements.append(statement.upper())
+
+        event.listen(database.engine, "before_cursor_execute", _capture)
+        try:
+            with pytest.raises(ValueError, match="payroll_total=6000, ledger_total=3000"):
+                reconcile_payroll_run_labor(company_id=1, payroll_run_id="pr-recon-1", db=db)
+        finally:
+            event.remove(database.engine, "before_cursor_execute", _capture)
+
+        # Summary lookup plus one live SUM over payroll_items; the ledger is never re-aggregated.
+        assert len(statements) == 2
+        sums = [s for s in statements if "SUM(" in s]
+        assert len(sums) == 1 and "PAYROLL_ITEMS" in sums[0] and "JOB_COST_LEDGER" not in sums[0]
+
+        # Fix the missing job and re-post: only the new row is added to the ledger side.
+        items[2].meta = {"job_id": ledger[0].job_id}
+        db.commit()
+        post_labor_costs(1, "pr-recon-1", db)
+        db.commit()
+
+        db.refresh(summary)
+        assert (summary.ledger_total_cents, summary.ledger_entry_count) == (6000, 3)
+        assert reconcile_payroll_run_labor(company_id=1, payroll_run_id="pr-recon-1", db=db)["ok"] is True
+    finally:
+        db.close()
+
+
+def test_unposted_run_falls_back_to_aggregation():
+    db = SessionLocal()
+    try:
+        _seed(db, run_id="pr-recon-2", metas=[{"job_id"}])
+
+        with pytest.raises(ValueError, match="payroll_total=1000, ledger_total=0"):
+            reconcile_payroll_run_labor(company_id=1, payroll_run_id="pr-recon-2", db=db)
+
+        # Other companies never see the run's summary.
+        post_labor_costs(1, "pr-recon-2", db)
+        db.commit()
+        result = reconcile_payroll_run_labor(company_id=2, payroll_run_id="pr-recon-2", db=db)
+        assert result["payroll_total_cents"] == 0
+    finally:
+        db.close()
+
+
+def test_payroll_item_edit_after_posting_is_detected():
+    db = SessionLocal()
+    try:
+        items = _seed(db, run_id="pr-recon-3", metas=[{"job_id"}, {"job_id"}])
+
+        post_labor_costs(1, "pr-recon-3", db)
+        db.commit()
+        assert reconcile_payroll_run_labor(company_id=1, payroll_run_id="pr-recon-3", db=db)["ok"] is True
+
+        # The edit happens after posting; reconciliation must still see it.
+        items[1].gross_pay_cents = 2500
+        db.commit()
+
+        with pytest.raises(ValueError, match="payroll_total=3500, ledger_total=3000"):
+            reconcile_payroll_run_labor(company_id=1, payroll_run_id="pr-recon-3", db=db)
+    finally:
+        db.close()
@@ -0,0 +1,111 @@
+from datetime import date, datetime, timezone
+
+from fastapi.testclient import TestClient
+
+from app.database import SessionLocal
+from app.main import app
+from app.models.employee import Employee
+from app.models.pay_period import PayPeriod
+from app.models.payroll_item import PayrollItem
+from app.models.payroll_run import PayrollRun
+from app.services.payroll_item_service import iter_payroll_item_chunks
+
+client = TestClient(app)
+
+
+def _auth_headers(company_id: int) -> dict:
+    resp = client.post("/auth/token", json={"user_id": "test", "company_id": company_id})
+    assert resp.status_code == 200, f"token request failed: {resp.status_code} {resp.text}"
+    return {"X-Company-Id": str(company_id), "Authorization": f"Bearer {resp.json()['access_token']}"}
+
+
+def _seed_run(company_id: int, run_id: str, n_items: int) -> None:
+    db = SessionLocal()
+    try:
+        employee = Employee(company_id=company_id, name="Stream Employee")
+        db.add(employee)
+        db.add(
+            PayPeriod(
+                pay_period_id=f"pp-{run_id}",
+                company_id=company_id,
+                start_date=date(2026, 3, 1),
+                end_date=date(2026, 3, 8),
+                status="POSTED",
+            )
+        )
+        db.flush()
+        db.add(
+            PayrollRun(
+                payroll_run_id=run_id,
+                company_id=company_id,
+                pay_period_id=f"pp-{run_id}",
+                status="POSTED",
+                posted_at=datetime.now(timezone.utc),
+            )
+        )
+        db.flush()
+        for i in range(n_items):
+            db.add(
+                PayrollItem(
+                    company_id=company_id,
+                    payroll_run_id=run_id,
+                    employee_id=employee.id,
+                    hours="8.50",
+                    rate_cents=2000,
+                    gross_pay_cents=1000 + i,
+                    meta={"job_id": i},
+                )
+            )
+        db.commit()
+    finally:
+        db.close()
+
+
+def test_payroll_items_are_yielded_in_fixed_size_chunks():
+    _seed_run(1, "pr-stream-chunks", 5)
+
+    db = SessionLocal()
+    try:
+        chunks = list(
+            iter_payroll_item_chunks(
+                db,
+                company_id=1,
+                payroll_run_id="pr-stream-chunks",
+                columns=(PayrollItem.id, PayrollItem.gross_pay_cents),
+                chunk_size=2,
+            )
+        )
+    finally:
+        db.close()
+
+    assert [len(c) for c in chunks] == [2, 2, 1]
+    assert [r.gross_pay_cents for c in chunks for r in c] == [1000, 1001, 1002, 1003, 1004]
+
+
+def test_payroll_run_detail_streams_full_document():
+    _seed_run(9101, "pr-stream-api", 3)
+
+    r = client.get("/payroll/runs/pr-stream-api", headers=_auth_headers(9101))
+    assert r.status_code == 200
+    body = r.json()
+
+    assert body["payroll_run"]["payroll_run_id"] == "pr-stream-api"
+    assert body["gross_total_cents"] == 1000 + 1001 + 1002
+    assert [i["gross_pay_cents"] for i in body["items"]] == [1000, 1001, 1002]
+    assert body["items"][0]["hours"] == "8.50"
+    assert body["items"][2]["meta"] == {"job_id": 2}
+    assert set(body["items"][0]) == {
+        "id",
+        "company_id",
+        "payroll_run_id",
+        "employee_id",
+        "hours",
+        "rate_cents",
+        "gross_pay_cents",
+        "meta",
+        "created_at",
+    }
+
+    # Other tenants still get a 404 rather than an empty stream.
+    other = client.get("/payroll/runs/pr-stream-api", headers=_auth_headers(9102))
+    assert other.status_code == 404
@@ -0,0 +1,75 @@
+from contextlib import contextmanager
+
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+from app import database
+from app.main import app
+
+# Queries the asyncpg dialect may issue when it first sets up a connection.
+_CONNECTION_SETUP = (
+    "select pg_catalog.version()",
+    "select current_schema()",
+    "show standard_conforming_strings",
+    "show transaction isolation level",
+)
+
+
+def _auth_headers(client: TestClient, company_id: int) -> dict:
+    r = client.post("/auth/token", json={"user_id": "test", "company_id": company_id})
+    assert r.status_code == 200, r.text
+    return {"X-Company-Id": str(company_id), "Authorization": f"Bearer {r.json()['access_token']}"}
+
+
+async def _async_engine():
+    return database.get_async_engine()
+
+
+@contextmanager
+def _statements(client: TestClient):
+    # Punches run on the serving loop's async engine; record everything it
+    # sends apart from connection setup.
+    sync_engine = client.portal.call(_async_engine).sync_engine
+    seen: list[str] = []
+
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        if not statement.strip().lower().startswith(_CONNECTION_SETUP):
+            seen.append(statement.split(None, 1)[0].upper())
+
+    event.listen(sync_engine, "before_cursor_execute", _record)
+    try:
+        yield seen
+    finally:
+        event.remove(sync_engine, "before_cursor_execute", _record)
+
+
+def test_punch_round_trips_are_minimal(employee_factory, job_factory, scope_factory):
+    employee = employee_factory(company_id=1)
+    job = job_factory(company_id=1)
+    scope = scope_factory(company_id=1, job_id=job.id)
+
+    with TestClient(app) as client:
+        headers = _auth_headers(client, 1)
+
+        with _statements(client) as seen:
+            r = client.post(
+                "/time_entries/clock_in",
+                headers=headers,
+                json={"employee_id": employee.id, "job_id": job.id, "scope_id": scope.id},
+            )
+        assert r.status_code == 200, r.text
+        # INSERT ... ON CONFLICT DO NOTHING RETURNING; no pre-check, flush or refresh.
+        assert seen == ["INSERT"]
+
+        with _statements(client) as seen:
+            r = client.post("/time_entries/clock_out", headers=headers, json={"employee_id": employee.id})
+        assert r.status_code == 200, r.text
+        assert r.json()["status"] == "completed"
+        assert r.json()["ended_at"] is not None
+        # UPDATE ... RETURNING plus the outbox row.
+        assert seen == ["UPDATE", "INSERT"]
+
+        with _statements(client) as seen:
+            r = client.post("/time_entries/clock_out", headers=headers, json={"employee_id": employee.id})
+        assert r.status_code == 409
+        assert seen == ["UPDATE"]
@@ -0,0 +1,86 @@
+from fastapi.testclient import TestClient
+
+from app.database import SessionLocal
+from app.main import app
+from app.models.event_outbox import EventOutbox
+from app.models.time_entry import TimeEntry
+
+client = TestClient(app)
+
+
+def _auth_headers(company_id: int) -> dict:
+    r = client.post("/auth/token", json={"user_id": "test", "company_id": company_id})
+    assert r.status_code == 200, r.text
+    return {"X-Company-Id": str(company_id), "Authorization": f"Bearer {r.json()['access_token']}"}
+
+
+def test_batch_clock_in_and_out_report_per_employee_outcomes(employee_factory, job_factory, scope_factory):
+    crew = [employee_factory(company_id=1, name=f"crew-{i}") for i in range(3)]
+    outsider = employee_factory(company_id=2)
+    job = job_factory(company_id=1)
+    scope = scope_factory(company_id=1, job_id=job.id)
+    headers = _auth_headers(1)
+
+    r = client.post(
+        "/time_entries/clock_in",
+        headers=headers,
+        json={"employee_id": crew[0].id, "job_id": job.id, "scope_id": scope.id},
+    )
+    assert r.status_code == 200, r.text
+
+    ids = [crew[0].id, crew[1].id, crew[2].id, outsider.id, crew[1].id]
+    r = client.post(
+        "/time_entries/clock_in/batch",
+        headers=headers,
+        json={"employee_ids": ids, "job_id": job.id, "scope_id": scope.id, "started_at": "2026-03-02T07:00:00Z"},
+    )
+    assert r.status_code == 200, r.text
+    assert [(o["employee_id"], o["result"]) for o in r.json()] == [
+        (crew[0].id, "already_active"),
+        (crew[1].id, "clocked_in"),
+        (crew[2].id, "clocked_in"),
+        (outsider.id, "unknown_employee"),
+    ]
+    assert r.json()[1]["time_entry"]["status"] == "active"
+    assert r.json()[0]["time_entry"] is None
+
+    r = client.post(
+        "/time_entries/clock_out/batch",
+        headers=headers,
+        json={"employee_ids": [crew[1].id, crew[2].id, outsider.id], "ended_at": "2026-03-02T15:30:00Z"},
+    )
+    assert r.status_code == 200, r.text
+    body = r.json()
+    assert [(o["employee_id"], o["result"]) for o in body] == [
+        (crew[1].id, "clocked_out"),
+        (crew[2].id, "clocked_out"),
+        (outsider.id, "no_active_entry"),
+    ]
+    assert body[0]["time_entry"]["status"] == "completed"
+
+    db = SessionLocal()
+    try:
+        active = db.query(TimeEntry).filter(TimeEntry.company_id == 1, TimeEntry.status == "active").all()
+        assert [e.employee_id for e in active] == [crew[0].id]
+
+        events = (
+            db.query(EventOutbox)
+            .filter(EventOutbox.company_id == 1, EventOutbox.event_type == "TIME_ENTRY_CLOCKED_OUT")
+            .order_by(EventOutbox.id.asc())
+            .all()
+        )
+        assert [e.payload["employee_id"] for e in events] == [crew[1].id, crew[2].id]
+        assert {e.idempotency_key for e in events} == {
+            f"time_entry:{o['time_entry']['time_entry_id']}:clock_out" for o in body[:2]
+        }
+    finally:
+        db.close()
+
+
+def test_batch_rejects_company_mismatch_and_empty_crew():
+    headers = {**_auth_headers(1), "X-Company-Id": "2"}
+    r = client.post("/time_entries/clock_out/batch", headers=headers, json={"employee_ids": [1]})
+    assert r.status_code == 403
+
+    r = client.post("/time_entries/clock_out/batch", headers=_auth_headers(1), json={"employee_ids": []})
+    assert r.status_code == 422
@@ -0,0 +1,228 @@
+import io
+import json
+from datetime import datetime
+
+from fastapi.testclient import TestClient
+
+from app.database import SessionLocal
+from app.main import app
+from app.models.time_entry import TimeEntry
+from app.services.time_entry_import import import_time_entries, iter_import_records
+
+client = TestClient(app)
+
+
+def _auth_headers(company_id: int) -> dict:
+    r = client.post("/auth/token", json={"user_id": "test", "company_id": company_id})
+    assert r.status_code == 200, r.text
+    return {"X-Company-Id": str(company_id), "Authorization": f"Bearer {r.json()['access_token']}"}
+
+
+def _entries(company_id: int) -> list[TimeEntry]:
+    db = SessionLocal()
+    try:
+        return (
+            db.query(TimeEntry)
+            .filter(TimeEntry.company_id == company_id)
+            .order_by(TimeEntry.started_at.asc())
+            .all()
+        )
+    finally:
+        db.close()
+
+
+def test_csv_import_merges_valid_rows_and_reports_errors(employee_factory, job_factory, scope_factory):
+    emp = employee_factory(company_id=1)
+    job = job_factory(company_id=1)
+    scope = scope_factory(company_id=1, job_id=job.id)
+    other_job = job_factory(company_id=2)
+
+    body = "\n".join(
+        [
+            "time_entry_id,employee_id,job_id,scope_id,started_at,ended_at",
+            f"te-1,{emp.id},{job.id},{scope.id},2026-01-05T08:00:00,2026-01-05T12:00:00",
+            f"te-2,{emp.id},{job.id},{scope.id},2026-01-05T13:00:00+00:00,2026-01-05T17:00:00+00:00",
+            f"te-3,{emp.id},{job.id},{scope.id},2026-01-05T16:00:00,2026-01-05T18:00:00",
+            f"te-4,{emp.id},{other_job.id},{scope.id},2026-01-06T08:00:00,2026-01-06T12:00:00",
+            f"te-5,{emp.id},{job.id},{scope.id},2026-01-07T12:00:00,2026-01-07T08:00:00",
+            f"te-6,{emp.id},{job.id},{scope.id},not-a-date,2026-01-07T08:00:00",
+        ]
+    )
+
+    r = client.post(
+        "/time_entries/import",
+        headers=_auth_headers(1),
+        params={"format": "csv"},
+        content=body.encode(),
+    )
+    assert r.status_code == 200, r.text
+    data = r.json()
+
+    assert data["rows"] == 6
+    assert data["imported"] == 2
+    assert data["skipped"] == 0
+    assert data["error_count"] == 4
+    assert {(e["line"], e["error"]) for e in data["errors"]} == {
+        (4, "overlaps another entry in the file"),
+        (5, "unknown job_id"),
+        (6, "ended_at must be after started_at"),
+        (7, "started_at must be an ISO 8601 timestamp"),
+    }
+
+    rows = _entries(1)
+    assert [(e.time_entry_id, e.status) for e in rows] == [("te-1", "completed"), ("te-2", "completed")]
+    assert rows[1].started_at == datetime(2026, 1, 5, 13, 0)
+
+    # Re-running the same file is safe: known ids are skipped, not duplicated.
+    r = client.post("/time_entries/import", headers=_auth_headers(1), params={"format": "csv"}, content=body.encode())
+    assert r.status_code == 200, r.text
+    assert r.json()["imported"] == 0
+    assert r.json()["skipped"] == 2
+    assert len(_entries(1)) == 2
+
+
+def test_unloadable_rows_are_reported_per_line(employee_factory, job_factory, scope_factory):
+    emp = employee_factory(company_id=1)
+    job = job_factory(company_id=1)
+    scope = scope_factory(company_id=1, job_id=job.id)
+    good = f"{emp.id},{job.id},{scope.id}"
+
+    body = b"\n".join(
+        [
+            b"time_entry_id,employee_id,job_id,scope_id,started_at,ended_at",
+            f"te-ok-1,{good},2026-03-02T08:00:00,2026-03-02T09:00:00".encode(),
+            f"te-big,{emp.id},2147483648,{scope.id},2026-03-02T10:00:00,2026-03-02T11:00:00".encode(),
+            f"te-bytes,{good},2026-03-02T12:00:00,2026-03-02T13:00:00,\xff".encode("latin-1"),
+            f"te-early,{good},0001-01-01T00:00:00+05:00,2026-03-02T13:00:00".encode(),
+            f"te-ok-2,{good},2026-03-02T14:00:00,2026-03-02T15:00:00".encode(),
+        ]
+    )
+    r = client.post("/time_entries/import", headers=_auth_headers(1), params={"format": "csv"}, content=body)
+    assert r.status_code == 200, r.text
+    data = r.json()
+    assert data["imported"] == 2
+    assert [(e["line"], e["error"]) for e in data["errors"]] == [
+        (3, "job_id is out of range"),
+        (4, "line is not valid UTF-8"),
+        (5, "started_at is out of range"),
+    ]
+
+    ndjson = b"\n".join(
+        [
+            json.dumps({"employee_id": emp.id, "job_id": job.id, "scope_id": scope.id,
+                        "started_at": "2026-03-03T08:00:00", "ended_at": "2026-03-03T09:00:00"}).encode(),
+            b'{"employee_id": "\xff"}',
+            json.dumps({"employee_id": emp.id, "job_id": job.id, "scope_id": -2147483649,
+                        "started_at": "2026-03-03T10:00:00", "ended_at": "2026-03-03T11:00:00"}).encode(),
+        ]
+    )
+    r = client.post("/time_entries/import", headers=_auth_headers(1), params={"format": "ndjson"}, content=ndjson)
+    assert r.status_code == 200, r.text
+    assert r.json()["imported"] == 1
+    assert [(e["line"], e["error"]) for e in r.json()["errors"]] == [
+        (2, "line is not valid UTF-8"),
+        (3, "scope_id is out of range"),
+    ]
+
+
+def test_rejected_rows_do_not_shadow_later_lines(employee_factory, job_factory, scope_factory):
+    emp = employee_factory(company_id=1)
+    job = job_factory(company_id=1)
+    scope = scope_factory(company_id=1, job_id=job.id)
+    other_job = job_factory(company_id=2)
+
+    records = [
+        # Rejected for its own data, so neither its id nor its interval counts.
+        {"time_entry_id": "te-shadow", "employee_id": emp.id, "job_id": other_job.id, "scope_id": scope.id,
+         "started_at": "2026-02-02T08:00:00", "ended_at": "2026-02-02T12:00:00"},
+        {"time_entry_id": "te-shadow", "employee_id": emp.id, "job_id": job.id, "scope_id": scope.id,
+         "started_at": "2026-02-02T09:00:00", "ended_at": "2026-02-02T11:00:00"},
+        {"time_entry_id": "te-later", "employee_id": emp.id, "job_id": job.id, "scope_id": scope.id,
+         "started_at": "2026-02-02T10:00:00", "ended_at": "2026-02-02T13:00:00"},
+    ]
+    result = import_time_entries(enumerate(records, start=1), company_id=1)
+
+    assert result.imported == 1
+    assert [(e.line, e.error) for e in result.errors] == [
+        (1, "unknown job_id"),
+        (3, "overlaps another entry in the file"),
+    ]
+    assert [e.time_entry_id for e in _entries(1)] == ["te-shadow"]
+
+
+def test_ndjson_import_in_chunks_respects_active_entry(employee_factory, job_factory, scope_factory):
+    emp = employee_factory(company_id=1)
+    job = job_factory(company_id=1)
+    scope = scope_factory(company_id=1, job_id=job.id)
+
+    db = SessionLocal()
+    try:
+        db.add(
+            TimeEntry(
+                time_entry_id="active-1",
+                company_id=1,
+                employee_id=emp.id,
+                job_id=job.id,
+                scope_id=scope.id,
+                started_at=datetime(2026, 2, 1, 8, 0),
+                ended_at=None,
+                status="active",
+            )
+        )
+        db.commit()
+    finally:
+        db.close()
+
+    lines = [
+        json.dumps(
+            {
+                "employee_id": emp.id,
+                "job_id": job.id,
+                "scope_id": scope.id,
+                "started_at": f"2026-01-{day:02d}T08:00:00",
+                "ended_at": f"2026-01-{day:02d}T16:00:00",
+            }
+        )
+        for day in range(1, 8)
+    ]
+    lines.append(
+        json.dumps(
+            {
+                "employee_id": emp.id,
+                "job_id": job.id,
+                "scope_id": scope.id,
+                "started_at": "2026-02-01T09:00:00",
+                "ended_at": "2026-02-01T10:00:00",
+            }
+        )
+    )
+    lines.append("[1, 2]")
+
+    progress = []
+    result = import_time_entries(
+        iter_import_records(io.BytesIO("\n".join(lines).encode()), "ndjson"),
+        company_id=1,
+        chunk_size=3,
+        on_progress=lambda res: progress.append(res.imported),
+    )
+
+    assert result.rows == 9
+    assert result.imported == 7
+    assert [(e.line, e.error) for e in result.errors] == [
+        (9, "expected a JSON object"),
+        (8, "overlaps an existing time entry"),
+    ]
+    assert progress == [3, 6, 7]
+
+    rows = _entries(1)
+    assert len(rows) == 8
+    assert [e.status for e in rows].count("active") == 1
+
+
+def test_import_rejects_company_mismatch():
+    r = client.post(
+        "/time_entries/import",
+        headers={**_auth_headers(1), "X-Company-Id": "2"},
+        content=b"employee_id,job_id,scope_id,started_at,ended_at\n",
+    )
+    assert r.status_code == 403
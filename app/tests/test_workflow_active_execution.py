@@ -0,0 +1,93 @@
+from uuid import uuid4
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.exc import IntegrityError
+
+from app.database import SessionLocal
+from app.main import app
+from app.models.workflow_execution import WorkflowExecution
+from app.services import workflow_service
+
+client = TestClient(app)
+
+
+def _auth_headers(company_id: int) -> dict:
+    r = client.post("/auth/token", json={"user_id": "test", "company_id": company_id})
+    assert r.status_code == 200, r.text
+    return {"X-Company-Id": str(company_id), "Authorization": f"Bearer {r.json()['access_token']}"}
+
+
+def _seed_other_in_progress(company_id: int, count: int) -> None:
+    db = SessionLocal()
+    try:
+        db.add_all(
+            WorkflowExecution(
+                # Sorts after any uuid4, i.e. inside the window the old scan looked at.
+                execution_id=f"z-{i:05d}",
+                flow_name="clock_in_flow",
+                context={"company_id": company_id, "employee_id": 100000 + i},
+                company_id=company_id,
+                employee_id=100000 + i,
+                status="in_progress",
+                current_step_id="confirm_employee",
+                completed_steps=[],
+            )
+            for i in range(count)
+        )
+        db.commit()
+    finally:
+        db.close()
+
+
+def test_active_execution_is_found_beyond_old_scan_window(employee_factory, job_factory, scope_factory):
+    employee = employee_factory(company_id=1)
+    job = job_factory(company_id=1)
+    scope = scope_factory(company_id=1, job_id=job.id)
+    context = {"company_id": 1, "employee_id": employee.id, "job_id": job.id, "scope_id": scope.id}
+
+    execution = workflow_service.start_execution("clock_in_flow", context)
+    assert (execution.company_id, execution.employee_id) == (1, employee.id)
+
+    _seed_other_in_progress(company_id=1, count=600)
+
+    with pytest.raises(ValueError, match="Active workflow execution already exists"):
+        workflow_service.start_execution("clock_in_flow", context)
+
+    headers = _auth_headers(1)
+    r = client.get("/preview/executions", headers=headers, params={"company_id": 1, "employee_id": employee.id})
+    assert r.status_code == 200, r.text
+    assert [e["execution_id"] for e in r.json()["executions"]] == [execution.execution_id]
+
+    r = client.get("/preview/reset", headers=headers, params={"company_id": 1, "employee_id": employee.id})
+    assert r.status_code == 200, r.text
+    assert r.json() == {"reset": 1}
+
+    restarted = workflow_service.start_execution("clock_in_flow", context)
+    assert restarted.execution_id != execution.execution_id
+
+
+def test_partial_unique_index_allows_one_in_progress_execution():
+    def _row(status: str) -> WorkflowExecution:
+        return WorkflowExecution(
+            execution_id=str(uuid4()),
+            flow_name="clock_out_flow",
+            context={"company_id": 7, "employee_id": 70},
+            company_id=7,
+            employee_id=70,
+            status=status,
+            current_step_id=None,
+            completed_steps=[],
+        )
+
+    db = SessionLocal()
+    try:
+        db.add_all([_row("completed"), _row("cancelled"), _row("in_progress")])
+        db.commit()
+
+        db.add(_row("in_progress"))
+        with pytest.raises(IntegrityError):
+            db.commit()
+        db.rollback()
+    finally:
+        db.close()
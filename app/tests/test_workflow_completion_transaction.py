@@ -0,0 +1,135 @@
+from datetime import datetime
+from uuid import uuid4
+
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+from app import database
+from app.database import SessionLocal
+from app.main import app
+from app.models.event_outbox import EventOutbox
+from app.models.time_entry import TimeEntry
+from app.models.workflow_execution import WorkflowExecution
+
+client = TestClient(app)
+
+
+def _auth_headers(company_id: int) -> dict:
+    r = client.post("/auth/token", json={"user_id": "test", "company_id": company_id})
+    assert r.status_code == 200, r.text
+    return {"X-Company-Id": str(company_id), "Authorization": f"Bearer {r.json()['access_token']}"}
+
+
+def _insert_active(company_id: int, employee_id: int, job_id: int, scope_id: int) -> str:
+    db = SessionLocal()
+    try:
+        time_entry_id = str(uuid4())
+        db.add(
+            TimeEntry(
+                time_entry_id=time_entry_id,
+                company_id=company_id,
+                employee_id=employee_id,
+                job_id=job_id,
+                scope_id=scope_id,
+                started_at=datetime.utcnow(),
+                ended_at=None,
+                status="active",
+            )
+        )
+        db.commit()
+        return time_entry_id
+    finally:
+        db.close()
+
+
+def _start_clock_out_flow(headers: dict, company_id: int, employee_id: int, job_id: int, scope_id: int) -> str:
+    r = client.post(
+        "/preview/start",
+        headers=headers,
+        json={
+            "flow_name": "clock_out_flow",
+            "company_id": company_id,
+            "employee_id": employee_id,
+            "job_id": job_id,
+            "scope_id": scope_id,
+        },
+    )
+    assert r.status_code == 200, r.text
+    execution_id = r.json()["execution_id"]
+
+    r = client.post(f"/preview/{execution_id}/submit", headers=headers, json={"value": "ok"})
+    assert r.status_code == 200, r.text
+    r = client.post(f"/preview/{execution_id}/advance", headers=headers)
+    assert r.status_code == 200, r.text
+    r = client.post(f"/preview/{execution_id}/submit", headers=headers, json={"value": "ok"})
+    assert r.status_code == 200, r.text
+    return execution_id
+
+
+def test_clock_out_completion_uses_one_connection_and_enqueues_outbox(employee_factory, job_factory, scope_factory):
+    employee = employee_factory(company_id=1)
+    job = job_factory(company_id=1)
+    scope = scope_factory(company_id=1, job_id=job.id)
+    time_entry_id = _insert_active(1, employee.id, job.id, scope.id)
+    headers = _auth_headers(1)
+    execution_id = _start_clock_out_flow(headers, 1, employee.id, job.id, scope.id)
+
+    checkouts: list[int] = []
+
+    def _on_checkout(dbapi_conn, record, proxy):
+        checkouts.append(1)
+
+    event.listen(database.engine.pool, "checkout", _on_checkout)
+    try:
+        r = client.post(f"/preview/{execution_id}/advance", headers=headers)
+    finally:
+        event.remove(database.engine.pool, "checkout", _on_checkout)
+
+    assert r.status_code == 200, r.text
+    assert r.json()["status"] == "completed"
+    assert len(checkouts) == 1
+
+    db = SessionLocal()
+    try:
+        entry = db.get(TimeEntry, time_entry_id)
+        assert entry.status == "completed"
+        events = db.query(EventOutbox).filter(EventOutbox.company_id == 1).all()
+        assert [e.idempotency_key for e in events] == [f"time_entry:{time_entry_id}:clock_out"]
+    finally:
+        db.close()
+
+
+def test_outbox_failure_rolls_back_time_entry_and_execution(employee_factory, job_factory, scope_factory):
+    employee = employee_factory(company_id=1)
+    job = job_factory(company_id=1)
+    scope = scope_factory(company_id=1, job_id=job.id)
+    time_entry_id = _insert_active(1, employee.id, job.id, scope.id)
+    headers = _auth_headers(1)
+    execution_id = _start_clock_out_flow(headers, 1, employee.id, job.id, scope.id)
+
+    # A clashing idempotency key makes the outbox insert fail after clock_out ran.
+    db = SessionLocal()
+    try:
+        db.add(
+            EventOutbox(
+                company_id=1,
+                event_type="TIME_ENTRY_CLOCKED_OUT",
+                idempotency_key=f"time_entry:{time_entry_id}:clock_out",
+                payload={},
+            )
+        )
+        db.commit()
+    finally:
+        db.close()
+
+    r = client.post(f"/preview/{execution_id}/advance", headers=headers)
+    assert r.status_code == 400
+
+    db = SessionLocal()
+    try:
+        assert db.get(TimeEntry, time_entry_id).status == "active"
+        execution = db.get(WorkflowExecution, execution_id)
+        assert execution.status == "in_progress"
+        assert execution.current_step_id == "confirm_clock_out"
+    finally:
+        db.close()
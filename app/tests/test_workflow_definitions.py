@@ -0,0 +1,28 @@
+import pytest
+
+from app.services.workflow_service import Step, Workflow, clock_in_flow
+
+
+def test_compiled_workflow_navigation():
+    steps = [Step(f"check_{i}", f"Check {i}") for i in range(40)]
+    flow = Workflow("safety_checklist", steps)
+
+    assert isinstance(flow.steps, tuple)
+    assert flow.step("check_17") is steps[17]
+    assert flow.next_step("check_17") is steps[18]
+    assert flow.next_step("check_39") is None
+    assert flow.step("missing") is None
+    assert flow.next_step(None) is None
+
+    assert clock_in_flow.next_step("confirm_employee").id == "confirm_job"
+
+
+def test_workflow_definitions_are_immutable_and_validated():
+    with pytest.raises(ValueError, match="Duplicate step id"):
+        Workflow("bad", [Step("a", "A"), Step("a", "Again")])
+
+    with pytest.raises(TypeError):
+        clock_in_flow._index["confirm_job"] = 0
+
+    with pytest.raises(AttributeError):
+        clock_in_flow.steps[0].extra = True
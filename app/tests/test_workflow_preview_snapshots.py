@@ -0,0 +1,58 @@
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+from app import database
+from app.main import app
+from app.services import workflow_service
+
+client = TestClient(app)
+
+
+def _auth_headers(company_id: int) -> dict:
+    r = client.post("/auth/token", json={"user_id": "test", "company_id": company_id})
+    assert r.status_code == 200, r.text
+    return {"X-Company-Id": str(company_id), "Authorization": f"Bearer {r.json()['access_token']}"}
+
+
+def test_preview_endpoints_load_the_execution_once(employee_factory, job_factory, scope_factory):
+    employee = employee_factory(company_id=1)
+    job = job_factory(company_id=1)
+    scope = scope_factory(company_id=1, job_id=job.id)
+    execution = workflow_service.start_execution(
+        "clock_in_flow",
+        {"company_id": 1, "employee_id": employee.id, "job_id": job.id, "scope_id": scope.id},
+    )
+    headers = _auth_headers(1)
+
+    seen: list[str] = []
+
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        seen.append(statement.split(None, 1)[0].upper())
+
+    event.listen(database.engine, "before_cursor_execute", _record)
+    try:
+        r = client.get(f"/preview/{execution.execution_id}", headers=headers)
+        assert r.status_code == 200, r.text
+        assert r.json()["current_step"]["id"] == "confirm_employee"
+        assert r.json()["next_step"]["id"] == "confirm_job"
+        assert seen == ["SELECT"]
+
+        seen.clear()
+        r = client.post(f"/preview/{execution.execution_id}/submit", headers=headers, json={"value": "ok"})
+        assert r.status_code == 200, r.text
+        assert r.json()["completed_steps"] == ["confirm_employee"]
+        assert seen == ["SELECT", "UPDATE"]
+
+        seen.clear()
+        r = client.post(f"/preview/{execution.execution_id}/advance", headers=headers)
+        assert r.status_code == 200, r.text
+        assert r.json()["current_step"]["id"] == "confirm_job"
+        assert seen == ["SELECT", "UPDATE"]
+
+        seen.clear()
+        r = client.get("/preview/executions", headers=headers, params={"company_id": 1, "employee_id": employee.id})
+        assert r.status_code == 200, r.text
+        assert [e["current_step"]["id"] for e in r.json()["executions"]] == ["confirm_job"]
+        assert seen == ["SELECT"]
+    finally:
+        event.remove(database.engine, "before_cursor_execute", _record)